@@ -50,10 +50,55 @@ def init(
         instrument_llm_calls (bool, optional): Enable automatic LLM call tracing. Defaults to True.
         auto_start_session (bool, optional): Automatically start a session on init. Defaults to False.
         default_tags (List[str], optional): Default tags to apply to all sessions.
-        max_wait_time (int, optional): Maximum time to wait before flushing traces (ms).
+        max_wait_time (int, optional): Maximum time to wait before flushing traces (ms). The flush delay backs off
+            up to this value while exports are slow.
         max_queue_size (int, optional): Maximum number of traces to queue.
+        max_export_batch_size (int, optional): Upper bound for the adaptive export batch size.
+        min_export_batch_size (int, optional): Lower bound for the adaptive export batch size.
+        reserved_queue_size (int, optional): Queue capacity reserved for session/control spans and for error spans,
+            on top of max_queue_size.
+        log_chunk_size (int, optional): Buffered characters of captured output that trigger a log upload.
+        log_upload_interval (float, optional): Seconds after which captured output is uploaded regardless of size.
+        capture_logs (bool, optional): Capture print() output for upload. When False, print() is left untouched.
+        log_buffer_size (int, optional): Characters of captured output held in memory.
+        log_spill_max_bytes (int, optional): Bytes of older captured output that may be spilled to temp files
+            instead of being dropped. 0 disables spilling.
+        resource_cache_ttl (int, optional): Seconds host attributes detected by one process are reused by
+            later processes on the same host. 0 disables the cache.
+        sample_rate (float | str, optional): Head sampling rate for new traces, as a ratio (0.25) or a
+            rate limit ("10/s").
+        sampling_rules (dict | str, optional): Head sampling rates keyed by "agent:<id>" or "kind:<span kind>",
+            e.g. {"kind:llm": 0.1, "agent:42": "5/s"}.
+        tail_sampling (bool, optional): Hold each trace until its root span ends, then always keep error,
+            slow and flagged traces and sample the rest.
+        tail_sample_rate (float, optional): Fraction of the remaining traces kept by tail sampling.
+        tail_latency_threshold (int, optional): Root span duration in ms from which tail sampling always
+            keeps a trace.
+        content_offload (bool, optional): Upload large prompts, completions and tool definitions once per
+            content hash and store only the hash reference on spans. Defaults to False.
+        offload_min_size (int, optional): Content shorter than this many characters stays on the span.
+        offload_cache_size (int, optional): Number of uploaded content hashes remembered for deduplication.
+        conversation_deltas (bool, optional): Record only the chat messages added since the previous LLM call
+            of the same conversation. Defaults to False.
+        deferred_serialization (bool, optional): Snapshot the inputs and outputs of decorated functions and
+            serialize them in the export worker instead of during the call. Defaults to False.
+        http_pool_size (int, optional): Connections kept open per host by the HTTP transport shared by all
+            exporters and API calls. Defaults to 32.
+        http_keepalive (int, optional): Seconds before idle pooled connections get TCP keep-alive probes.
+            0 disables them. Defaults to 60.
+        circuit_failure_threshold (int, optional): Consecutive failed requests to an endpoint after which
+            the SDK stops sending to it and probes it with a jittered backoff. Defaults to 5.
+        circuit_max_backoff (float, optional): Maximum seconds between probes of an unavailable endpoint.
+            Defaults to 60.
         log_level (str|int, optional): Logging level for the SDK.
         fail_safe (bool, optional): Suppress errors and continue execution if True.
+        spool_enabled (bool, optional): Spool exported spans to disk so they survive backend outages. Defaults to False.
+        spool_dir (str, optional): Directory for the span spool. Defaults to a folder in the system temp dir.
+        spool_max_bytes (int, optional): Maximum size of the span spool on disk, in bytes.
+        spool_max_age (int, optional): Spooled spans older than this many seconds are discarded.
+        export_mode (str, optional): "inprocess" (default) or "sidecar" to encode and upload spans from a
+            separate local process.
+        sidecar_socket (str, optional): Unix socket path of the export sidecar.
         **kwargs: Additional configuration parameters.
         
     Returns:
@@ -125,6 +170,29 @@ def configure(**kwargs):
             - base_url: Base URL that auto-constructs other endpoints
             - max_wait_time: Maximum time to wait in milliseconds before flushing the queue
             - max_queue_size: Maximum size of the event queue
+            - max_export_batch_size: Upper bound for the adaptive export batch size
+            - min_export_batch_size: Lower bound for the adaptive export batch size
+            - reserved_queue_size: Queue capacity reserved for session/control and error spans
+            - log_chunk_size: Buffered characters of captured output that trigger a log upload
+            - log_upload_interval: Seconds after which captured output is uploaded regardless of size
+            - capture_logs: Capture print() output for upload
+            - log_buffer_size: Characters of captured output held in memory
+            - log_spill_max_bytes: Bytes of older captured output that may be spilled to temp files
+            - resource_cache_ttl: Seconds cached host attributes are reused
+            - sample_rate: Head sampling rate for new traces (ratio or "<n>/s")
+            - sampling_rules: Head sampling rates keyed by "agent:<id>" or "kind:<span kind>"
+            - tail_sampling: Decide per trace, once its root span ends, whether to export it
+            - tail_sample_rate: Fraction of routine traces kept by tail sampling
+            - tail_latency_threshold: Root span duration in ms from which traces are always kept
+            - content_offload: Upload large content once per hash and reference it from spans
+            - offload_min_size: Characters from which content is offloaded
+            - offload_cache_size: Uploaded content hashes remembered for deduplication
+            - conversation_deltas: Record only the chat messages added since the previous call
+            - deferred_serialization: Serialize decorator inputs and outputs in the export worker
+            - http_pool_size: Connections kept open per host by the shared HTTP transport
+            - http_keepalive: Seconds before idle connections get TCP keep-alive probes (0 disables)
+            - circuit_failure_threshold: Consecutive failures after which egress to an endpoint pauses
+            - circuit_max_backoff: Maximum seconds between probes of an unavailable endpoint
             - default_tags: Default tags for the sessions
             - instrument_llm_calls: Whether to instrument LLM calls
             - auto_start_session: Whether to start a session automatically
@@ -137,6 +205,12 @@ def configure(**kwargs):
             - logs_endpoint: Endpoint for logs data
             - agent_id: Agent identifier
             - agent_name: Agent name
+            - spool_enabled: Whether to spool exported spans to disk
+            - spool_dir: Directory for the span spool
+            - spool_max_bytes: Maximum size of the span spool in bytes
+            - spool_max_age: Maximum age of spooled spans in seconds
+            - export_mode: "inprocess" or "sidecar"
+            - sidecar_socket: Unix socket path of the export sidecar
     """
     global _client
 
@@ -148,6 +222,29 @@ def configure(**kwargs):
         "base_url",           
         "max_wait_time",
         "max_queue_size",
+        "max_export_batch_size",
+        "min_export_batch_size",
+        "reserved_queue_size",
+        "log_chunk_size",
+        "log_upload_interval",
+        "capture_logs",
+        "log_buffer_size",
+        "log_spill_max_bytes",
+        "resource_cache_ttl",
+        "sample_rate",
+        "sampling_rules",
+        "tail_sampling",
+        "tail_sample_rate",
+        "tail_latency_threshold",
+        "content_offload",
+        "offload_min_size",
+        "offload_cache_size",
+        "conversation_deltas",
+        "deferred_serialization",
+        "http_pool_size",
+        "http_keepalive",
+        "circuit_failure_threshold",
+        "circuit_max_backoff",
         "default_tags",
         "instrument_llm_calls",
         "auto_start_session",
@@ -162,6 +259,12 @@ def configure(**kwargs):
         "logs_endpoint",      
         "agent_id",          
         "agent_name",        
+        "spool_enabled",
+        "spool_dir",
+        "spool_max_bytes",
+        "spool_max_age",
+        "export_mode",
+        "sidecar_socket",
     }
 
     # Handle base_url logic if provided
@@ -206,16 +309,33 @@ def start_session(tags: Optional[List[str]] = None):
     return _start_session(tags=tags)
 
 
-def end_session(session=None, **kwargs):
+def end_session(session=None, wait: bool = True, **kwargs):
     """
     End a tracing session (optional - use with start_session()).
     
     Args:
         session: Session object returned by start_session()
+        wait: Block until spans are flushed (default). When False, only this session's
+            spans are flushed in the background and a Future is returned.
         **kwargs: Additional session metadata (end_state, end_state_reason, etc.)
     """
     from aliyah_sdk.sessions import end_session as _end_session
-    return _end_session(session, **kwargs)
+    return _end_session(session, wait=wait, **kwargs)
+
+
+async def end_session_async(session=None, **kwargs):
+    """
+    End a tracing session without blocking the event loop on the export.
+    
+    Args:
+        session: Session object returned by start_session()
+        **kwargs: Additional session metadata (end_state, end_state_reason, etc.)
+
+    Returns:
+        True if the session's spans were exported
+    """
+    from aliyah_sdk.sessions import end_session_async as _end_session_async
+    return await _end_session_async(session, **kwargs)
 
 
 # Export only the modern, non-deprecated API
@@ -225,4 +345,5 @@ __all__ = [
     "get_client",
     "start_session",
     "end_session",
+    "end_session_async",
 ]
\ No newline at end of file
@@ -4,16 +4,16 @@ API client for the Aaliyah Ops API.
 This module provides the client for the Aaliyah Ops API.
 """
 
-from typing import Dict, Type, TypeVar, cast
+from typing import Dict, Type, TypeVar, Union, cast
 
-from aliyah_sdk.client.api.base import BaseApiClient
+from aliyah_sdk.client.api.base import AsyncBaseApiClient, BaseApiClient
 from aliyah_sdk.client.api.types import AuthTokenResponse
-from aliyah_sdk.client.api.versions.v1 import V1Client
+from aliyah_sdk.client.api.versions.v1 import AsyncV1Client, V1Client
 
 # Define a type variable for client classes
-T = TypeVar("T", bound=BaseApiClient)
+T = TypeVar("T", bound=Union[BaseApiClient, AsyncBaseApiClient])
 
-__all__ = ["ApiClient", "BaseApiClient", "AuthTokenResponse"]
+__all__ = ["ApiClient", "BaseApiClient", "AsyncBaseApiClient", "AuthTokenResponse"]
 
 
 class ApiClient:
@@ -32,7 +32,7 @@ class ApiClient:
             endpoint: The base URL for the API
         """
         self.endpoint = endpoint
-        self._clients: Dict[str, BaseApiClient] = {}
+        self._clients: Dict[str, Union[BaseApiClient, AsyncBaseApiClient]] = {}
 
     @property
     def v1(self) -> V1Client:
@@ -44,6 +44,19 @@ class ApiClient:
         """
         return self._get_client("v1", V1Client)
 
+    @property
+    def v1_async(self) -> AsyncV1Client:
+        """
+        Get the async V1 API client, authenticated like the V1 client.
+
+        Returns:
+            The async V1 API client
+        """
+        client = self._get_client("v1_async", AsyncV1Client)
+        if client.auth_token is None:
+            client.set_auth_token(self.v1.auth_token)
+        return client
+
     def _get_client(self, version: str, client_class: Type[T]) -> T:
         """
         Get or create a version-specific client.
@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional, Protocol
 
 import requests
 
+from aliyah_sdk.client.http.async_http_client import AsyncHttpClient
 from aliyah_sdk.client.http.http_client import HttpClient
 
 
@@ -158,3 +159,151 @@ class BaseApiClient:
             Response from the API
         """
         return self.request("delete", path, headers=headers)
+
+
+class AsyncBaseApiClient:
+    """
+    Async counterpart of BaseApiClient, for use from asyncio code.
+
+    Requests share the pooled connections of the running event loop and are
+    limited in number by AsyncHttpClient; they do not block a thread while
+    waiting for the API. Requires httpx (`pip install aliyah-sdk[async]`).
+    """
+
+    def __init__(self, endpoint: str):
+        """
+        Initialize the async base API client.
+
+        Args:
+            endpoint: The base URL for the API
+        """
+        self.endpoint = endpoint
+        self.http_client = AsyncHttpClient
+        self.last_response: Optional[Any] = None
+
+    def prepare_headers(self, custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Prepare headers for API requests.
+
+        Args:
+            custom_headers: Additional headers to include
+
+        Returns:
+            Headers dictionary with standard headers and any custom headers
+        """
+        headers = {"Content-Type": "application/json"}
+
+        if custom_headers:
+            headers.update(custom_headers)
+
+        return headers
+
+    def _get_full_url(self, path: str) -> str:
+        """
+        Get the full URL for a path.
+
+        Args:
+            path: The API endpoint path
+
+        Returns:
+            The full URL
+        """
+        return f"{self.endpoint}{path}"
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = 30,
+    ) -> Any:
+        """
+        Make a generic HTTP request
+
+        Args:
+            method: HTTP method (e.g., 'get', 'post', 'put', 'delete')
+            path: API endpoint path
+            data: Request payload (for POST, PUT methods)
+            headers: Request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            The httpx.Response from the API
+
+        Raises:
+            Exception: If the request fails
+        """
+        url = self._get_full_url(path)
+
+        try:
+            response = await self.http_client.request(
+                method=method, url=url, data=data, headers=headers, timeout=timeout
+            )
+
+            self.last_response = response
+            return response
+        except ImportError:
+            raise
+        except Exception as e:
+            self.last_response = None
+            # httpx timeouts carry no message
+            raise Exception(f"{method.upper()} request failed: {str(e) or e.__class__.__name__}") from e
+
+    async def post(self, path: str, data: Any, headers: Dict[str, str], timeout: Optional[float] = 30) -> Any:
+        """
+        Make POST request
+
+        Args:
+            path: API endpoint path
+            data: Request payload
+            headers: Request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response from the API
+        """
+        return await self.request("post", path, data=data, headers=headers, timeout=timeout)
+
+    async def get(self, path: str, headers: Dict[str, str], timeout: Optional[float] = 30) -> Any:
+        """
+        Make GET request
+
+        Args:
+            path: API endpoint path
+            headers: Request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response from the API
+        """
+        return await self.request("get", path, headers=headers, timeout=timeout)
+
+    async def put(self, path: str, data: Any, headers: Dict[str, str], timeout: Optional[float] = 30) -> Any:
+        """
+        Make PUT request
+
+        Args:
+            path: API endpoint path
+            data: Request payload
+            headers: Request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response from the API
+        """
+        return await self.request("put", path, data=data, headers=headers, timeout=timeout)
+
+    async def delete(self, path: str, headers: Dict[str, str], timeout: Optional[float] = 30) -> Any:
+        """
+        Make DELETE request
+
+        Args:
+            path: API endpoint path
+            headers: Request headers
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response from the API
+        """
+        return await self.request("delete", path, headers=headers, timeout=timeout)
@@ -4,6 +4,6 @@ API client versions package.
 This package contains client implementations for different API versions.
 """
 
-from aliyah_sdk.client.api.versions.v1 import V1Client
+from aliyah_sdk.client.api.versions.v1 import AsyncV1Client, V1Client
 
-__all__ = ["V1Client"]
+__all__ = ["V1Client", "AsyncV1Client"]
@@ -4,16 +4,82 @@ API client for the Aaliyah Ops API.
 This module provides the client for the V1 version of the Aaliyah Ops API.
 """
 
-from typing import Optional, Union, Dict
+from typing import Any, Dict, Optional, Tuple, Union
 
 import logging
 logger = logging.getLogger(__name__)
 
-from aliyah_sdk.client.api.base import BaseApiClient
+from aliyah_sdk.client.api.base import AsyncBaseApiClient, BaseApiClient
 from aliyah_sdk.exceptions import ApiServerException
 from aliyah_sdk.client.api.types import AuthTokenResponse, UploadedObjectResponse
 
 
+def _auth_headers(auth_token: Optional[str], custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Headers authenticating a request with the API key"""
+    headers = {}
+    if auth_token:
+        # Use X-API-Key header instead of Bearer token
+        headers["X-API-Key"] = auth_token
+
+    if custom_headers:
+        headers.update(custom_headers)
+    return headers
+
+
+def _object_upload(
+    headers: Dict[str, str], body: Union[str, bytes], content_hash: Optional[str]
+) -> Tuple[str, Dict[str, str]]:
+    """Body and headers of an object upload request"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if content_hash is not None:
+        headers["Content-Hash"] = content_hash
+    return body, headers
+
+
+def _logfile_upload(
+    headers: Dict[str, str],
+    body: Union[str, bytes],
+    trace_id: int,
+    compressed: bool,
+    sequence: Optional[int],
+) -> Tuple[Union[str, bytes], Dict[str, str]]:
+    """Body and headers of a log file upload request"""
+    headers = {**headers, "Trace-Id": str(trace_id)}
+    if compressed:
+        headers["Content-Encoding"] = "gzip"
+        headers["Content-Type"] = "text/plain; charset=utf-8"
+    elif isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if sequence is not None:
+        headers["Log-Chunk-Sequence"] = str(sequence)
+    return body, headers
+
+
+def _parse_upload_response(response: Any) -> UploadedObjectResponse:
+    """
+    Parse the response of an upload request.
+
+    Raises:
+        ApiServerException: If the upload failed or the response is malformed
+    """
+    if response.status_code != 200:
+        error_msg = f"Upload failed: {response.status_code}"
+        try:
+            error_data = response.json()
+            if "error" in error_data:
+                error_msg = error_data["error"]
+        except Exception:
+            pass
+        raise ApiServerException(error_msg)
+
+    try:
+        response_data = response.json()
+        return UploadedObjectResponse(**response_data)
+    except Exception as e:
+        raise ApiServerException(f"Failed to process upload response: {str(e)}")
+
+
 class V1Client(BaseApiClient):
     """Client for the Aaliyah Ops V1 API"""
 
@@ -66,14 +132,7 @@ class V1Client(BaseApiClient):
 
     def prepare_headers(self, custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """Prepare headers for API requests using direct API key"""
-        headers = {}
-        if self.auth_token:
-            # Use X-API-Key header instead of Bearer token
-            headers["X-API-Key"] = self.auth_token
-        
-        if custom_headers:
-            headers.update(custom_headers)
-        return headers
+        return _auth_headers(self.auth_token, custom_headers)
 
     # def prepare_headers(self, custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     #     """
@@ -92,62 +151,113 @@ class V1Client(BaseApiClient):
     #         headers.update(custom_headers)
     #     return headers
 
-    def upload_object(self, body: Union[str, bytes]) -> UploadedObjectResponse:
+    def upload_object(self, body: Union[str, bytes], content_hash: Optional[str] = None) -> UploadedObjectResponse:
         """
         Upload an object to the API and return the response.
 
         Args:
             body: The object to upload, either as a string or bytes.
+            content_hash: Digest of `body` as "<algorithm>:<hex>". The object is
+                stored under this hash so spans can reference it by content.
         Returns:
             UploadedObjectResponse: The response from the API after upload.
         """
-        if isinstance(body, bytes):
-            body = body.decode("utf-8")
-
-        response = self.post("/v1/objects/upload/", body, self.prepare_headers())
+        body, headers = _object_upload(self.prepare_headers(), body, content_hash)
+        response = self.post("/v1/objects/upload/", body, headers)
+        return _parse_upload_response(response)
 
-        if response.status_code != 200:
-            error_msg = f"Upload failed: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "error" in error_data:
-                    error_msg = error_data["error"]
-            except Exception:
-                pass
-            raise ApiServerException(error_msg)
-
-        try:
-            response_data = response.json()
-            return UploadedObjectResponse(**response_data)
-        except Exception as e:
-            raise ApiServerException(f"Failed to process upload response: {str(e)}")
-
-    def upload_logfile(self, body: Union[str, bytes], trace_id: int) -> UploadedObjectResponse:
+    def upload_logfile(
+        self,
+        body: Union[str, bytes],
+        trace_id: int,
+        compressed: bool = False,
+        sequence: Optional[int] = None,
+    ) -> UploadedObjectResponse:
         """
         Upload an log file to the API and return the response.
 
         Args:
             body: The log file to upload, either as a string or bytes.
+            trace_id: The trace the logs were captured under.
+            compressed: Whether `body` is gzip-compressed bytes, sent as-is.
+            sequence: Position of this chunk among the trace's log chunks.
         Returns:
             UploadedObjectResponse: The response from the API after upload.
         """
-        if isinstance(body, bytes):
-            body = body.decode("utf-8")
+        body, headers = _logfile_upload(self.prepare_headers(), body, trace_id, compressed, sequence)
+        response = self.post("/v1/logs/upload/", body, headers)
+        return _parse_upload_response(response)
 
-        response = self.post("/v1/logs/upload/", body, {**self.prepare_headers(), "Trace-Id": str(trace_id)})
 
-        if response.status_code != 200:
-            error_msg = f"Upload failed: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "error" in error_data:
-                    error_msg = error_data["error"]
-            except Exception:
-                pass
-            raise ApiServerException(error_msg)
+class AsyncV1Client(AsyncBaseApiClient):
+    """
+    Async client for the Aaliyah Ops V1 API
 
-        try:
-            response_data = response.json()
-            return UploadedObjectResponse(**response_data)
-        except Exception as e:
-            raise ApiServerException(f"Failed to process upload response: {str(e)}")
\ No newline at end of file
+    Uploads can be awaited, or run concurrently with asyncio.gather, without
+    tying up executor threads.
+    """
+
+    auth_token: Optional[str]
+
+    def __init__(self, *args, **kwargs):
+        """Initialize AsyncV1Client with flexible arguments"""
+        super().__init__(*args, **kwargs)
+        self.auth_token = None
+
+    def set_auth_token(self, token: str):
+        """
+        Set the authentication token for API requests.
+
+        Args:
+            token: The authentication token to set
+        """
+        self.auth_token = token
+
+    def prepare_headers(self, custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Prepare headers for API requests using direct API key"""
+        return _auth_headers(self.auth_token, custom_headers)
+
+    async def upload_object(
+        self,
+        body: Union[str, bytes],
+        content_hash: Optional[str] = None,
+        timeout: Optional[float] = 30,
+    ) -> UploadedObjectResponse:
+        """
+        Upload an object to the API and return the response.
+
+        Args:
+            body: The object to upload, either as a string or bytes.
+            content_hash: Digest of `body` as "<algorithm>:<hex>". The object is
+                stored under this hash so spans can reference it by content.
+            timeout: Request timeout in seconds.
+        Returns:
+            UploadedObjectResponse: The response from the API after upload.
+        """
+        body, headers = _object_upload(self.prepare_headers(), body, content_hash)
+        response = await self.post("/v1/objects/upload/", body, headers, timeout=timeout)
+        return _parse_upload_response(response)
+
+    async def upload_logfile(
+        self,
+        body: Union[str, bytes],
+        trace_id: int,
+        compressed: bool = False,
+        sequence: Optional[int] = None,
+        timeout: Optional[float] = 30,
+    ) -> UploadedObjectResponse:
+        """
+        Upload a log file to the API and return the response.
+
+        Args:
+            body: The log file to upload, either as a string or bytes.
+            trace_id: The trace the logs were captured under.
+            compressed: Whether `body` is gzip-compressed bytes, sent as-is.
+            sequence: Position of this chunk among the trace's log chunks.
+            timeout: Request timeout in seconds.
+        Returns:
+            UploadedObjectResponse: The response from the API after upload.
+        """
+        body, headers = _logfile_upload(self.prepare_headers(), body, trace_id, compressed, sequence)
+        response = await self.post("/v1/logs/upload/", body, headers, timeout=timeout)
+        return _parse_upload_response(response)
@@ -1,4 +1,5 @@
 import atexit
+import os
 
 from aliyah_sdk.client.api import ApiClient
 from aliyah_sdk.exceptions import NoApiKeyException
@@ -32,6 +33,39 @@ def _end_active_session():
                 pass
 
 
+def _restart_active_session_after_fork():
+    """Give a forked child process its own session instead of sharing the parent's session span."""
+    global _active_session
+    inherited = _active_session
+    if inherited is None or getattr(inherited, "span", None) is None:
+        return
+
+    tags = None
+    try:
+        tags = list(inherited.span.attributes.get("tags") or []) or None
+    except Exception:
+        pass
+
+    # The inherited span belongs to the parent; ending it in the child would export it twice
+    inherited.span = None
+    inherited.token = None
+    _active_session = None
+
+    try:
+        from opentelemetry import context as context_api
+        from aliyah_sdk.sessions import start_session
+
+        # Start from an empty context so the child's session is a new root trace
+        context_api.attach(context_api.Context())
+        _active_session = start_session(tags=tags)
+    except Exception as e:
+        logger.warning(f"Failed to start session in forked process: {e}")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_active_session_after_fork)
+
+
 class Client:
     """Singleton client for AgentOps service"""
 
@@ -129,21 +163,21 @@ class Client:
 
     def shutdown(self):
         """Shutdown the client and end any active sessions"""
-        print("DEBUG Client.shutdown: Shutting down TracingCore...")
+        logger.debug("Shutting down TracingCore")
         
         # FIXED: End active session before shutting down TracingCore
         global _active_session
         if _active_session is not None:
             try:
                 from aliyah_sdk.sessions import end_session
-                print("DEBUG Client.shutdown: Ending active session...")
+                logger.debug("Ending active session during client shutdown")
                 end_session(_active_session)
                 _active_session = None
             except Exception as e:
-                print(f"DEBUG Client.shutdown: Error ending session: {e}")
+                logger.warning(f"Error ending session during client shutdown: {e}")
         
         TracingCore.get_instance().shutdown()
-        print("DEBUG Client.shutdown: Client shutdown complete.")
+        logger.debug("Client shutdown complete")
 
     @property
     def initialized(self) -> bool:
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from aliyah_sdk.logging import logger
+
+try:
+    import httpx  # type: ignore
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # type: ignore  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class AsyncHttpClient:
+    """
+    Async HTTP client with a shared connection pool and bounded concurrency.
+
+    Requires httpx (`pip install aliyah-sdk[async]`). Connections are pooled per
+    event loop, since httpx connections cannot be shared between loops, and use
+    HTTP/2 when the h2 package is installed so concurrent requests to the API
+    are multiplexed over one connection. At most `max_concurrency` requests are
+    in flight per loop; further requests wait for a free slot.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 10.0
+    max_concurrency: int = 32
+    max_redirects: int = 5
+    http2: bool = True
+
+    # (client, concurrency limit) per event loop
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Any, asyncio.Semaphore]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    @classmethod
+    def configure(
+        cls,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        http2: Optional[bool] = None,
+    ) -> None:
+        """
+        Set the pool limits of clients created from now on.
+
+        Args:
+            max_connections: Maximum number of open connections per event loop
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            max_concurrency: Maximum number of requests in flight per event loop
+            http2: Whether to use HTTP/2 when the h2 package is installed
+        """
+        if max_connections is not None:
+            cls.max_connections = max_connections
+        if max_keepalive_connections is not None:
+            cls.max_keepalive_connections = max_keepalive_connections
+        if keepalive_expiry is not None:
+            cls.keepalive_expiry = keepalive_expiry
+        if max_concurrency is not None:
+            cls.max_concurrency = max_concurrency
+        if http2 is not None:
+            cls.http2 = http2
+
+    @classmethod
+    def _get_pool(cls) -> Tuple[Any, asyncio.Semaphore]:
+        """Get or create the client and concurrency limit of the running event loop"""
+        if httpx is None:
+            raise ImportError("The async API client requires httpx: pip install aliyah-sdk[async]")
+
+        loop = asyncio.get_running_loop()
+        pool = cls._clients.get(loop)
+        if pool is None:
+            client = httpx.AsyncClient(
+                http2=cls.http2 and _HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=cls.max_connections,
+                    max_keepalive_connections=cls.max_keepalive_connections,
+                    keepalive_expiry=cls.keepalive_expiry,
+                ),
+                # Followed by request(), which keeps the method and body like HttpClient
+                follow_redirects=False,
+                headers={"Content-Type": "application/json"},
+            )
+            pool = cls._clients[loop] = (client, asyncio.Semaphore(cls.max_concurrency))
+        return pool
+
+    @classmethod
+    def get_client(cls) -> Any:
+        """Get or create the httpx.AsyncClient of the running event loop"""
+        return cls._get_pool()[0]
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the pooled connections of the running event loop"""
+        pool = cls._clients.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool[0].aclose()
+
+    @classmethod
+    def reset_clients(cls) -> None:
+        """
+        Discard the pooled clients without closing them.
+
+        Used in forked child processes, where closing the inherited connections
+        would also tear down the parent's sockets.
+        """
+        cls._clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    async def request(
+        cls,
+        method: str,
+        url: str,
+        data: Optional[Any] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[float] = 30,
+    ) -> Any:
+        """
+        Make a generic HTTP request
+
+        Redirects are followed up to `max_redirects` times, keeping the method and
+        body except on 303, like `HttpClient.request` (httpx itself would turn a
+        POST into a GET on 301 and 302).
+
+        Args:
+            method: HTTP method (e.g., 'get', 'post', 'put', 'delete')
+            url: Full URL for the request
+            data: Request payload (for POST, PUT methods); bytes are sent unencoded
+            headers: Request headers
+            timeout: Request timeout in seconds, covering connect, read, write and
+                waiting for a pooled connection
+
+        Returns:
+            The httpx.Response from the API
+
+        Raises:
+            httpx.HTTPError: If the request fails or the redirect limit is exceeded
+            ValueError: If an unsupported HTTP method is used
+        """
+        method = method.lower()
+        if method not in ("get", "post", "put", "delete"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        # Raw bytes (e.g. compressed uploads) are sent as-is, anything else as JSON
+        body: Dict[str, Any] = {}
+        if method in ("post", "put"):
+            body = {"content": bytes(data)} if isinstance(data, (bytes, bytearray)) else {"json": data}
+
+        client, limit = cls._get_pool()
+        redirect_count = 0
+        while True:
+            async with limit:
+                response = await client.request(method.upper(), url, headers=headers, timeout=timeout, **body)
+
+            if response.status_code not in (301, 302, 303, 307, 308) or "location" not in response.headers:
+                return response
+
+            redirect_count += 1
+            if redirect_count > cls.max_redirects:
+                raise httpx.TooManyRedirects(
+                    f"Exceeded maximum number of redirects ({cls.max_redirects})", request=response.request
+                )
+
+            url = str(response.url.join(response.headers["location"]))
+            # For 303 redirects, always use GET for the next request
+            if response.status_code == 303:
+                method = "get"
+                body = {}
+
+            logger.debug(f"Following redirect ({redirect_count}/{cls.max_redirects}) to: {url}")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=AsyncHttpClient.reset_clients)
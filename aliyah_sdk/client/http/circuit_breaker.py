@@ -0,0 +1,205 @@
+"""
+Circuit breaker for SDK egress.
+
+Each channel of the shared HTTP transport (traces, metrics, API calls) has a
+breaker. After `failure_threshold` consecutive failures (connection errors,
+timeouts, 408, 429 and 5xx responses) the breaker opens and requests on the
+channel fail immediately with `CircuitOpenError`, without touching the
+network. Once the open interval has passed, a single probe request is let
+through (half-open): its success closes the breaker, its failure reopens it
+for twice as long, up to `max_backoff` seconds. Open intervals are jittered so
+workers that lost the backend together do not probe it in lockstep.
+
+Requests rejected while open, and failed requests, are counted with their
+payload size, so the data an outage cost is visible in the SDK self-metrics.
+"""
+
+import random
+import threading
+import time
+from typing import Dict
+
+import requests
+
+from aliyah_sdk.logging import logger
+from aliyah_sdk.semconv import Meters
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Reported by the circuit state self-metric
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request while the circuit of its channel is open.
+
+    Not a ConnectionError, which callers (e.g. the OTLP exporters) retry at once.
+    """
+
+
+def jittered_backoff(attempt: int, base: float, maximum: float) -> float:
+    """
+    Delay before retry number `attempt` (0-based), doubling from `base` up to `maximum`.
+
+    The delay is drawn from the upper half of the interval ("equal jitter"), so
+    it never collapses to zero but retries of different workers spread out.
+    """
+    delay = min(maximum, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_failure_status(status_code: int) -> bool:
+    """Whether a response status means the backend is unavailable or overloaded"""
+    return status_code in (408, 429) or 500 <= status_code <= 599
+
+
+class CircuitBreaker:
+    """
+    Closed, open and half-open states for one egress channel.
+
+    Usage:
+        if not breaker.allow_request():
+            raise CircuitOpenError(...)
+        try:
+            response = send()
+        except requests.RequestException:
+            breaker.record_failure(size)
+            raise
+        breaker.record_result(response.status_code, size)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        """
+        Args:
+            name: Channel the breaker guards, used in logs
+            failure_threshold: Consecutive failures that open the circuit
+            base_backoff: Seconds the circuit stays open the first time
+            max_backoff: Upper bound for the open interval in seconds
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max(base_backoff, max_backoff)
+
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures = 0
+        # Consecutive times the circuit opened without a successful probe
+        self._opened = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+
+        self.rejected_requests = 0
+        self.rejected_bytes = 0
+        self.failed_requests = 0
+        self.failed_bytes = 0
+
+        # Imported here, as the sdk package imports the HTTP transport
+        from aliyah_sdk.sdk.self_metrics import register_self_metrics
+
+        register_self_metrics(
+            self,
+            gauges=(Meters.SDK_EGRESS_CIRCUIT_STATE,),
+            counters=(
+                Meters.SDK_EGRESS_REJECTED_REQUESTS,
+                Meters.SDK_EGRESS_REJECTED_BYTES,
+                Meters.SDK_EGRESS_FAILED_REQUESTS,
+                Meters.SDK_EGRESS_FAILED_BYTES,
+            ),
+        )
+
+    def _at_fork_reinit(self) -> None:
+        # The lock may have been held by another thread when the process forked
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected; unlike allow_request, never claims the probe"""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == OPEN:
+                return time.monotonic() < self._retry_at
+            return self._probe_in_flight
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed, 0 when the circuit is closed"""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(0.0, self._retry_at - time.monotonic())
+
+    def allow_request(self, size: int = 0) -> bool:
+        """
+        Claim permission to send a request of `size` bytes.
+
+        Returns:
+            False if the request must not be sent; it is counted as rejected
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self._retry_at:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected_requests += 1
+            self.rejected_bytes += size
+            return False
+
+    def count_rejected(self, size: int = 0) -> None:
+        """Count a request its sender skipped after finding the circuit open"""
+        with self._lock:
+            self.rejected_requests += 1
+            self.rejected_bytes += size
+
+    def record_result(self, status_code: int, size: int = 0) -> None:
+        """Record the response to an allowed request"""
+        if is_failure_status(status_code):
+            self.record_failure(size)
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"[aaliyah.CircuitBreaker] Backend reachable again, resuming {self.name} requests")
+            self.state = CLOSED
+            self._failures = 0
+            self._opened = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, size: int = 0) -> None:
+        with self._lock:
+            self.failed_requests += 1
+            self.failed_bytes += size
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open_locked()
+
+    def _open_locked(self) -> None:
+        delay = jittered_backoff(self._opened, self.base_backoff, self.max_backoff)
+        if self.state == CLOSED:
+            logger.warning(
+                f"[aaliyah.CircuitBreaker] Pausing {self.name} requests for {delay:.1f}s "
+                f"after {self._failures} consecutive failures"
+            )
+        else:
+            logger.debug(f"[aaliyah.CircuitBreaker] {self.name} probe failed, next attempt in {delay:.1f}s")
+        self.state = OPEN
+        self._opened += 1
+        self._retry_at = time.monotonic() + delay
+        self._probe_in_flight = False
+
+    def self_metrics(self) -> Dict[str, Dict[str, float]]:
+        # Reported per channel, as the lane of the self-metrics
+        return {
+            Meters.SDK_EGRESS_CIRCUIT_STATE: {self.name: _STATE_VALUES[self.state]},
+            Meters.SDK_EGRESS_REJECTED_REQUESTS: {self.name: self.rejected_requests},
+            Meters.SDK_EGRESS_REJECTED_BYTES: {self.name: self.rejected_bytes},
+            Meters.SDK_EGRESS_FAILED_REQUESTS: {self.name: self.failed_requests},
+            Meters.SDK_EGRESS_FAILED_BYTES: {self.name: self.failed_bytes},
+        }
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util import Retry
 
 
@@ -12,6 +13,7 @@ class BaseHTTPAdapter(HTTPAdapter):
         pool_connections: int = 15,
         pool_maxsize: int = 256,
         max_retries: Optional[Retry] = None,
+        socket_options: Optional[List[Tuple[int, int, int]]] = None,
     ):
         """
         Initialize the base HTTP adapter.
@@ -20,6 +22,7 @@ class BaseHTTPAdapter(HTTPAdapter):
             pool_connections: Number of connection pools to cache
             pool_maxsize: Maximum number of connections to save in the pool
             max_retries: Retry configuration for failed requests
+            socket_options: Options set on new sockets, added to urllib3's defaults
         """
         if max_retries is None:
             max_retries = Retry(
@@ -28,5 +31,12 @@ class BaseHTTPAdapter(HTTPAdapter):
                 status_forcelist=[500, 502, 503, 504],
             )
 
+        # Read by init_poolmanager, which the parent constructor calls
+        self.socket_options = socket_options
         super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
 
+    def init_poolmanager(self, *args, **pool_kwargs):
+        if self.socket_options:
+            pool_kwargs.setdefault("socket_options", HTTPConnection.default_socket_options + self.socket_options)
+        super().init_poolmanager(*args, **pool_kwargs)
+
@@ -1,8 +1,9 @@
+import os
 from typing import Dict, Optional
 
 import requests
 
-from aliyah_sdk.client.http.http_adapter import BaseHTTPAdapter
+from aliyah_sdk.client.http.transport import API, HttpTransport
 from aliyah_sdk.logging import logger
 
 
@@ -19,28 +20,30 @@ class HttpClient:
 
     @classmethod
     def get_session(cls) -> requests.Session:
-        """Get or create the global session with optimized connection pooling"""
+        """Get or create the global session on the shared HTTP transport"""
         if cls._session is None:
-            cls._session = requests.Session()
-
-            # Configure connection pooling
-            adapter = BaseHTTPAdapter()
-
-            # Mount adapter for both HTTP and HTTPS
-            cls._session.mount("http://", adapter)
-            cls._session.mount("https://", adapter)
-
-            # Set default headers
-            cls._session.headers.update(
-                {
+            # Connections are pooled with the trace and metric exporters
+            cls._session = HttpTransport.create_session(
+                API,
+                headers={
                     "Connection": "keep-alive",
                     "Keep-Alive": "timeout=10, max=1000",
                     "Content-Type": "application/json",
-                }
+                },
             )
 
         return cls._session
 
+    @classmethod
+    def reset_session(cls) -> None:
+        """
+        Discard the pooled session without closing it.
+
+        Used in forked child processes, where closing the inherited connections
+        would also tear down the parent's sockets.
+        """
+        cls._session = None
+
     @classmethod
     def request(
         cls,
@@ -57,7 +60,7 @@ class HttpClient:
         Args:
             method: HTTP method (e.g., 'get', 'post', 'put', 'delete')
             url: Full URL for the request
-            data: Request payload (for POST, PUT methods)
+            data: Request payload (for POST, PUT methods); bytes are sent unencoded
             headers: Request headers
             timeout: Request timeout in seconds
             max_redirects: Maximum number of redirects to follow (default: 5)
@@ -72,15 +75,17 @@ class HttpClient:
         session = cls.get_session()
         method = method.lower()
         redirect_count = 0
+        # Raw bytes (e.g. compressed uploads) are sent as-is, anything else as JSON
+        body = {"data": data} if isinstance(data, (bytes, bytearray)) else {"json": data}
 
         while redirect_count <= max_redirects:
             # Make the request with allow_redirects=False
             if method == "get":
                 response = session.get(url, headers=headers, timeout=timeout, allow_redirects=False)
             elif method == "post":
-                response = session.post(url, json=data, headers=headers, timeout=timeout, allow_redirects=False)
+                response = session.post(url, headers=headers, timeout=timeout, allow_redirects=False, **body)
             elif method == "put":
-                response = session.put(url, json=data, headers=headers, timeout=timeout, allow_redirects=False)
+                response = session.put(url, headers=headers, timeout=timeout, allow_redirects=False, **body)
             elif method == "delete":
                 response = session.delete(url, headers=headers, timeout=timeout, allow_redirects=False)
             else:
@@ -105,6 +110,7 @@ class HttpClient:
                 if response.status_code == 303:
                     method = "get"
                     data = None
+                    body = {"json": None}
 
                 logger.debug(f"Following redirect ({redirect_count}/{max_redirects}) to: {url}")
 
@@ -116,3 +122,7 @@ class HttpClient:
 
         # This should never be reached due to the max_redirects check above
         return response
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=HttpClient.reset_session)
@@ -0,0 +1,192 @@
+"""
+Shared HTTP transport for all SDK egress.
+
+Trace and metric exporters and the API client each get their own
+`requests.Session`, so their headers stay separate, but every session mounts
+the same connection adapter. Requests to the backend therefore share one pool
+of kept-alive connections per host instead of one pool per component, which
+means fewer sockets and TLS handshakes per worker.
+
+Components observe backend responses through response hooks registered here,
+optionally for a single channel (traces, metrics or API calls). Each channel
+is guarded by a circuit breaker, so while the backend is down its requests
+fail immediately instead of waiting on connections and retries.
+"""
+
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from urllib3.util import Retry
+
+from aliyah_sdk.client.http.circuit_breaker import CircuitBreaker, CircuitOpenError
+from aliyah_sdk.client.http.http_adapter import BaseHTTPAdapter
+from aliyah_sdk.config import Config
+from aliyah_sdk.logging import logger
+
+# Channels of SDK egress, for channel-specific response hooks
+TRACES = "traces"
+METRICS = "metrics"
+API = "api"
+
+ResponseHook = Callable[[Any], None]
+
+
+def _keepalive_socket_options(idle: int) -> List[Tuple[int, int, int]]:
+    """TCP keep-alive socket options probing idle connections after `idle` seconds."""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # TCP_KEEPIDLE on Linux, TCP_KEEPALIVE on macOS
+    idle_option = getattr(socket, "TCP_KEEPIDLE", None) or getattr(socket, "TCP_KEEPALIVE", None)
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4)))
+    return options
+
+
+def _body_size(request: requests.PreparedRequest) -> int:
+    body = request.body
+    if body is None:
+        return 0
+    return len(body) if isinstance(body, (bytes, bytearray, str)) else 0
+
+
+class _ChannelSession(requests.Session):
+    """Session that reports its responses to the hooks and circuit breaker of its channel"""
+
+    def __init__(self, channel: str, breaker: CircuitBreaker):
+        super().__init__()
+        self.channel = channel
+        self.breaker = breaker
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        size = _body_size(request)
+        if not self.breaker.allow_request(size):
+            raise CircuitOpenError(
+                f"{self.channel} circuit open, retrying in {self.breaker.retry_after():.1f}s", request=request
+            )
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.breaker.record_failure(size)
+            raise
+        self.breaker.record_result(response.status_code, size)
+        HttpTransport.notify_response(response, self.channel)
+        return response
+
+
+class HttpTransport:
+    """Process-wide connection adapter and response hooks shared by all SDK sessions"""
+
+    _adapter: Optional[BaseHTTPAdapter] = None
+    _breakers: Dict[str, CircuitBreaker] = {}
+    _lock = threading.Lock()
+    # (channel or None for every channel, hook)
+    _hooks: List[Tuple[Optional[str], ResponseHook]] = []
+
+    @classmethod
+    def get_adapter(cls) -> BaseHTTPAdapter:
+        """Get or create the shared adapter, sized by Config.HTTP_POOL_SIZE and Config.HTTP_KEEPALIVE"""
+        if cls._adapter is None:
+            with cls._lock:
+                if cls._adapter is None:
+                    keepalive = Config.HTTP_KEEPALIVE
+                    cls._adapter = BaseHTTPAdapter(
+                        pool_maxsize=Config.HTTP_POOL_SIZE,
+                        # One immediate retry for a pooled connection closed by the server; backoff
+                        # is left to the circuit breaker and the exporters
+                        max_retries=Retry(total=1, connect=1, read=0, status=0, other=0, backoff_factor=0),
+                        socket_options=_keepalive_socket_options(keepalive) if keepalive > 0 else None,
+                    )
+        return cls._adapter
+
+    @classmethod
+    def get_breaker(cls, channel: str) -> CircuitBreaker:
+        """Get or create the circuit breaker of a channel, configured by Config.CIRCUIT_*"""
+        breaker = cls._breakers.get(channel)
+        if breaker is None:
+            with cls._lock:
+                breaker = cls._breakers.get(channel)
+                if breaker is None:
+                    breaker = cls._breakers[channel] = CircuitBreaker(
+                        channel,
+                        failure_threshold=Config.CIRCUIT_FAILURE_THRESHOLD,
+                        max_backoff=Config.CIRCUIT_MAX_BACKOFF,
+                    )
+        return breaker
+
+    @classmethod
+    def create_session(cls, channel: str, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+        """
+        Create a session on the shared adapter.
+
+        Args:
+            channel: Channel the session's responses are reported on to hooks
+            headers: Default headers of the session
+
+        Returns:
+            A session whose connections are pooled with every other SDK session
+        """
+        session = _ChannelSession(channel, cls.get_breaker(channel))
+        adapter = cls.get_adapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    @classmethod
+    def add_response_hook(cls, hook: ResponseHook, channel: Optional[str] = None) -> None:
+        """
+        Call `hook` with every backend response.
+
+        Args:
+            hook: Called with the response; exceptions it raises are logged and ignored
+            channel: Only report responses of this channel (TRACES, METRICS or API)
+        """
+        with cls._lock:
+            cls._hooks = cls._hooks + [(channel, hook)]
+
+    @classmethod
+    def remove_response_hook(cls, hook: ResponseHook) -> None:
+        """Stop calling a hook added with add_response_hook"""
+        with cls._lock:
+            cls._hooks = [entry for entry in cls._hooks if entry[1] != hook]
+
+    @classmethod
+    def notify_response(cls, response: Any, channel: str) -> None:
+        """
+        Report a backend response to the hooks of its channel.
+
+        Called by the sessions of this transport, and by exporters that receive
+        backend responses by other means (e.g. relayed by the export sidecar).
+        """
+        for hook_channel, hook in cls._hooks:
+            if hook_channel is not None and hook_channel != channel:
+                continue
+            try:
+                hook(response)
+            except Exception as e:
+                logger.debug(f"[aaliyah.HttpTransport] Response hook failed: {e}")
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Discard the shared adapter without closing it.
+
+        Used in forked child processes, where closing the inherited connections
+        would also tear down the parent's sockets. Response hooks and circuit
+        breakers are kept; the locks of the breakers are reinitialized, as
+        another thread may have held one at fork.
+        """
+        cls._adapter = None
+        cls._lock = threading.Lock()
+        for breaker in cls._breakers.values():
+            breaker._at_fork_reinit()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=HttpTransport.reset)
@@ -3,7 +3,7 @@ import os
 import logging
 import json
 import sys
-from typing import List, Optional, Set, Union
+from typing import Dict, List, Optional, Set, Union
 
 # Check if pytest is imported globally (simplistic check)
 TESTING = "pytest" in sys.modules
@@ -62,10 +62,65 @@ class Config:
 
     # === Monitoring/Telemetry Configuration ===
     # Settings for the OpenTelemetry SDK within the agent's process
-    MAX_QUEUE_SIZE: int = int(os.getenv("ALIYAH_MAX_QUEUE_SIZE") or os.getenv("AALIYAH_MAX_QUEUE_SIZE", "512"))
+    MAX_QUEUE_SIZE: int = int(os.getenv("ALIYAH_MAX_QUEUE_SIZE") or os.getenv("AALIYAH_MAX_QUEUE_SIZE", "2048"))
+    # Export batches adapt between these bounds based on export latency and queue depth
+    MAX_EXPORT_BATCH_SIZE: int = int(os.getenv("ALIYAH_MAX_EXPORT_BATCH_SIZE") or os.getenv("AALIYAH_MAX_EXPORT_BATCH_SIZE", "512"))
+    MIN_EXPORT_BATCH_SIZE: int = int(os.getenv("ALIYAH_MIN_EXPORT_BATCH_SIZE") or os.getenv("AALIYAH_MIN_EXPORT_BATCH_SIZE", "32"))
+    # Queue capacity reserved for each priority lane (session/control spans and error spans)
+    RESERVED_QUEUE_SIZE: int = int(os.getenv("ALIYAH_RESERVED_QUEUE_SIZE") or os.getenv("AALIYAH_RESERVED_QUEUE_SIZE", "256"))
     MAX_WAIT_TIME: int = int(os.getenv("ALIYAH_MAX_WAIT_TIME") or os.getenv("AALIYAH_MAX_WAIT_TIME", "5000")) # in milliseconds
     EXPORT_FLUSH_INTERVAL: int = int(os.getenv("ALIYAH_EXPORT_FLUSH_INTERVAL") or os.getenv("AALIYAH_EXPORT_FLUSH_INTERVAL", "1000")) # in milliseconds
 
+    # === Span Spool Configuration ===
+    # When enabled, exported batches are written to a bounded on-disk spool and uploaded
+    # from a background thread, so spans survive backend outages and process restarts.
+    SPOOL_ENABLED: bool = (os.getenv("ALIYAH_SPOOL_ENABLED") or os.getenv("AALIYAH_SPOOL_ENABLED", "False")).lower() == "true"
+    SPOOL_DIR: Optional[str] = os.getenv("ALIYAH_SPOOL_DIR") or os.getenv("AALIYAH_SPOOL_DIR")  # None uses the system temp dir
+    SPOOL_MAX_BYTES: int = int(os.getenv("ALIYAH_SPOOL_MAX_BYTES") or os.getenv("AALIYAH_SPOOL_MAX_BYTES", str(256 * 1024 * 1024)))
+    SPOOL_MAX_AGE: int = int(os.getenv("ALIYAH_SPOOL_MAX_AGE") or os.getenv("AALIYAH_SPOOL_MAX_AGE", "86400")) # in seconds
+
+    # === Export Mode ===
+    # "inprocess" encodes and uploads spans from a thread in the agent process.
+    # "sidecar" hands spans to a local sidecar process that does the encoding and upload.
+    EXPORT_MODE: str = (os.getenv("ALIYAH_EXPORT_MODE") or os.getenv("AALIYAH_EXPORT_MODE", "inprocess")).lower()
+    SIDECAR_SOCKET: Optional[str] = os.getenv("ALIYAH_SIDECAR_SOCKET") or os.getenv("AALIYAH_SIDECAR_SOCKET")  # None uses a per-process temp path
+
+    # === Sampling Configuration ===
+    # Head sampling: default rate for new traces, as a ratio ("0.25") or a rate limit ("10/s"),
+    # plus rules keyed by agent id or span kind ("kind:llm=0.1,agent:42=5/s")
+    SAMPLE_RATE: str = os.getenv("ALIYAH_SAMPLE_RATE") or os.getenv("AALIYAH_SAMPLE_RATE", "1.0")
+    SAMPLING_RULES: Optional[str] = os.getenv("ALIYAH_SAMPLING_RULES") or os.getenv("AALIYAH_SAMPLING_RULES")
+    # Tail sampling: traces are held until their root span ends; errors, slow and flagged traces
+    # are always kept and the rest are kept with TAIL_SAMPLE_RATE
+    TAIL_SAMPLING: bool = (os.getenv("ALIYAH_TAIL_SAMPLING") or os.getenv("AALIYAH_TAIL_SAMPLING", "False")).lower() == "true"
+    TAIL_SAMPLE_RATE: float = float(os.getenv("ALIYAH_TAIL_SAMPLE_RATE") or os.getenv("AALIYAH_TAIL_SAMPLE_RATE", "0.1"))
+    TAIL_LATENCY_THRESHOLD: int = int(os.getenv("ALIYAH_TAIL_LATENCY_THRESHOLD") or os.getenv("AALIYAH_TAIL_LATENCY_THRESHOLD", "10000")) # in milliseconds
+
+    # Content offload: prompts, completions and tool definitions of at least OFFLOAD_MIN_SIZE characters
+    # are uploaded once per content hash and spans carry a reference; OFFLOAD_CACHE_SIZE hashes are
+    # remembered as already uploaded
+    CONTENT_OFFLOAD: bool = (os.getenv("ALIYAH_CONTENT_OFFLOAD") or os.getenv("AALIYAH_CONTENT_OFFLOAD", "False")).lower() == "true"
+    OFFLOAD_MIN_SIZE: int = int(os.getenv("ALIYAH_OFFLOAD_MIN_SIZE") or os.getenv("AALIYAH_OFFLOAD_MIN_SIZE", "1024"))
+    OFFLOAD_CACHE_SIZE: int = int(os.getenv("ALIYAH_OFFLOAD_CACHE_SIZE") or os.getenv("AALIYAH_OFFLOAD_CACHE_SIZE", "10000"))
+
+    # Record only the chat messages added since the previous call of the same conversation
+    CONVERSATION_DELTAS: bool = (os.getenv("ALIYAH_CONVERSATION_DELTAS") or os.getenv("AALIYAH_CONVERSATION_DELTAS", "False")).lower() == "true"
+
+    # Decorators snapshot inputs and outputs and the export worker serializes them, off the request path
+    DEFERRED_SERIALIZATION: bool = (os.getenv("ALIYAH_DEFERRED_SERIALIZATION") or os.getenv("AALIYAH_DEFERRED_SERIALIZATION", "False")).lower() == "true"
+
+    # All SDK egress shares one HTTP connection pool per host, keeping up to HTTP_POOL_SIZE connections
+    # open; idle connections get TCP keep-alive probes after HTTP_KEEPALIVE seconds (0 disables)
+    HTTP_POOL_SIZE: int = int(os.getenv("ALIYAH_HTTP_POOL_SIZE") or os.getenv("AALIYAH_HTTP_POOL_SIZE", "32"))
+    HTTP_KEEPALIVE: int = int(os.getenv("ALIYAH_HTTP_KEEPALIVE") or os.getenv("AALIYAH_HTTP_KEEPALIVE", "60"))
+    # Egress to an endpoint pauses after CIRCUIT_FAILURE_THRESHOLD consecutive failures, probing it again
+    # after a jittered backoff that doubles up to CIRCUIT_MAX_BACKOFF seconds
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("ALIYAH_CIRCUIT_FAILURE_THRESHOLD") or os.getenv("AALIYAH_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_MAX_BACKOFF: float = float(os.getenv("ALIYAH_CIRCUIT_MAX_BACKOFF") or os.getenv("AALIYAH_CIRCUIT_MAX_BACKOFF", "60"))
+
+    # Host attributes are cached on disk and reused by processes started within this many seconds (0 disables)
+    RESOURCE_CACHE_TTL: int = int(os.getenv("ALIYAH_RESOURCE_CACHE_TTL") or os.getenv("AALIYAH_RESOURCE_CACHE_TTL", "86400"))
+
     INSTRUMENT_LLM_CALLS: bool = (os.getenv("ALIYAH_INSTRUMENT_LLM_CALLS") or os.getenv("AALIYAH_INSTRUMENT_LLM_CALLS", "True")).lower() == "true"
 
     # === Session Configuration ===
@@ -85,6 +140,20 @@ class Config:
     LOG_LEVEL = LOG_LEVEL # <-- Assign the class attribute
     log_level = LOG_LEVEL  # Add instance-style access for compatibility
     logs_endpoint = LOGS_ENDPOINT 
+    # Captured output is uploaded in compressed chunks once this many characters are buffered,
+    # or after LOG_UPLOAD_INTERVAL seconds, whichever comes first
+    LOG_CHUNK_SIZE: int = int(os.getenv("ALIYAH_LOG_CHUNK_SIZE") or os.getenv("AALIYAH_LOG_CHUNK_SIZE", str(256 * 1024)))
+    LOG_UPLOAD_INTERVAL: float = float(os.getenv("ALIYAH_LOG_UPLOAD_INTERVAL") or os.getenv("AALIYAH_LOG_UPLOAD_INTERVAL", "30")) # in seconds
+    # Captured print/log output: whether to capture at all, how much to hold in memory (characters),
+    # and how many bytes of older output may be spilled to temp files (0 drops it instead)
+    CAPTURE_LOGS: bool = (os.getenv("ALIYAH_CAPTURE_LOGS") or os.getenv("AALIYAH_CAPTURE_LOGS", "True")).lower() == "true"
+    LOG_BUFFER_SIZE: int = int(os.getenv("ALIYAH_LOG_BUFFER_SIZE") or os.getenv("AALIYAH_LOG_BUFFER_SIZE", str(1024 * 1024)))
+    LOG_SPILL_MAX_BYTES: int = int(os.getenv("ALIYAH_LOG_SPILL_MAX_BYTES") or os.getenv("AALIYAH_LOG_SPILL_MAX_BYTES", "0"))
+    log_chunk_size = LOG_CHUNK_SIZE
+    log_upload_interval = LOG_UPLOAD_INTERVAL
+    capture_logs = CAPTURE_LOGS
+    log_buffer_size = LOG_BUFFER_SIZE
+    log_spill_max_bytes = LOG_SPILL_MAX_BYTES
 
     # === OpenTelemetry Configuration (Advanced) ===
     # Allow users to provide custom OTel components if needed
@@ -93,8 +162,32 @@ class Config:
 
     # === Instance-style access for compatibility ===
     max_queue_size = MAX_QUEUE_SIZE
+    max_export_batch_size = MAX_EXPORT_BATCH_SIZE
+    min_export_batch_size = MIN_EXPORT_BATCH_SIZE
+    reserved_queue_size = RESERVED_QUEUE_SIZE
     max_wait_time = MAX_WAIT_TIME
     export_flush_interval = EXPORT_FLUSH_INTERVAL
+    spool_enabled = SPOOL_ENABLED
+    spool_dir = SPOOL_DIR
+    spool_max_bytes = SPOOL_MAX_BYTES
+    spool_max_age = SPOOL_MAX_AGE
+    export_mode = EXPORT_MODE
+    sidecar_socket = SIDECAR_SOCKET
+    resource_cache_ttl = RESOURCE_CACHE_TTL
+    sample_rate = SAMPLE_RATE
+    sampling_rules = SAMPLING_RULES
+    tail_sampling = TAIL_SAMPLING
+    tail_sample_rate = TAIL_SAMPLE_RATE
+    tail_latency_threshold = TAIL_LATENCY_THRESHOLD
+    content_offload = CONTENT_OFFLOAD
+    offload_min_size = OFFLOAD_MIN_SIZE
+    offload_cache_size = OFFLOAD_CACHE_SIZE
+    conversation_deltas = CONVERSATION_DELTAS
+    deferred_serialization = DEFERRED_SERIALIZATION
+    http_pool_size = HTTP_POOL_SIZE
+    http_keepalive = HTTP_KEEPALIVE
+    circuit_failure_threshold = CIRCUIT_FAILURE_THRESHOLD
+    circuit_max_backoff = CIRCUIT_MAX_BACKOFF
     instrument_llm_calls = INSTRUMENT_LLM_CALLS
     auto_start_session = AUTO_START_SESSION
     auto_init = AUTO_INIT
@@ -117,6 +210,29 @@ class Config:
         max_wait_time: Optional[int] = None,
         export_flush_interval: Optional[int] = None,
         max_queue_size: Optional[int] = None,
+        max_export_batch_size: Optional[int] = None,
+        min_export_batch_size: Optional[int] = None,
+        reserved_queue_size: Optional[int] = None,
+        log_chunk_size: Optional[int] = None,
+        log_upload_interval: Optional[float] = None,
+        capture_logs: Optional[bool] = None,
+        log_buffer_size: Optional[int] = None,
+        log_spill_max_bytes: Optional[int] = None,
+        resource_cache_ttl: Optional[int] = None,
+        sample_rate: Optional[Union[float, str]] = None,
+        sampling_rules: Optional[Union[str, Dict[str, Union[float, str]]]] = None,
+        tail_sampling: Optional[bool] = None,
+        tail_sample_rate: Optional[float] = None,
+        tail_latency_threshold: Optional[int] = None,
+        content_offload: Optional[bool] = None,
+        offload_min_size: Optional[int] = None,
+        offload_cache_size: Optional[int] = None,
+        conversation_deltas: Optional[bool] = None,
+        deferred_serialization: Optional[bool] = None,
+        http_pool_size: Optional[int] = None,
+        http_keepalive: Optional[int] = None,
+        circuit_failure_threshold: Optional[int] = None,
+        circuit_max_backoff: Optional[float] = None,
         default_tags: Optional[List[str]] = None,
         instrument_llm_calls: Optional[bool] = None,
         auto_start_session: Optional[bool] = None,
@@ -133,6 +249,12 @@ class Config:
         logs_endpoint: Optional[str] = None,
         agent_id: Optional[int] = None,
         agent_name: Optional[str] = None,
+        spool_enabled: Optional[bool] = None,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: Optional[int] = None,
+        spool_max_age: Optional[int] = None,
+        export_mode: Optional[str] = None,
+        sidecar_socket: Optional[str] = None,
         **kwargs
     ):
         """Configure settings from kwargs, overriding environment variables and defaults"""
@@ -183,6 +305,132 @@ class Config:
             cls.MAX_QUEUE_SIZE = max_queue_size
             cls.max_queue_size = max_queue_size
 
+        if max_export_batch_size is not None:
+            cls.MAX_EXPORT_BATCH_SIZE = max_export_batch_size
+            cls.max_export_batch_size = max_export_batch_size
+
+        if min_export_batch_size is not None:
+            cls.MIN_EXPORT_BATCH_SIZE = min_export_batch_size
+            cls.min_export_batch_size = min_export_batch_size
+
+        if reserved_queue_size is not None:
+            cls.RESERVED_QUEUE_SIZE = reserved_queue_size
+            cls.reserved_queue_size = reserved_queue_size
+
+        if log_chunk_size is not None:
+            cls.LOG_CHUNK_SIZE = log_chunk_size
+            cls.log_chunk_size = log_chunk_size
+
+        if log_upload_interval is not None:
+            cls.LOG_UPLOAD_INTERVAL = log_upload_interval
+            cls.log_upload_interval = log_upload_interval
+
+        if capture_logs is not None:
+            cls.CAPTURE_LOGS = capture_logs
+            cls.capture_logs = capture_logs
+
+        if log_buffer_size is not None:
+            cls.LOG_BUFFER_SIZE = log_buffer_size
+            cls.log_buffer_size = log_buffer_size
+
+        if log_spill_max_bytes is not None:
+            cls.LOG_SPILL_MAX_BYTES = log_spill_max_bytes
+            cls.log_spill_max_bytes = log_spill_max_bytes
+
+        if resource_cache_ttl is not None:
+            cls.RESOURCE_CACHE_TTL = resource_cache_ttl
+            cls.resource_cache_ttl = resource_cache_ttl
+
+        if sample_rate is not None or sampling_rules is not None:
+            from aliyah_sdk.sdk.sampling import SamplingRule, parse_sampling_rules
+
+            # Raises ValueError for malformed rates, so mistakes surface at init
+            if sample_rate is not None:
+                SamplingRule(sample_rate)
+            parse_sampling_rules(sampling_rules)
+
+        if sample_rate is not None:
+            cls.SAMPLE_RATE = sample_rate
+            cls.sample_rate = sample_rate
+
+        if sampling_rules is not None:
+            cls.SAMPLING_RULES = sampling_rules
+            cls.sampling_rules = sampling_rules
+
+        if tail_sampling is not None:
+            cls.TAIL_SAMPLING = tail_sampling
+            cls.tail_sampling = tail_sampling
+
+        if tail_sample_rate is not None:
+            cls.TAIL_SAMPLE_RATE = tail_sample_rate
+            cls.tail_sample_rate = tail_sample_rate
+
+        if tail_latency_threshold is not None:
+            cls.TAIL_LATENCY_THRESHOLD = tail_latency_threshold
+            cls.tail_latency_threshold = tail_latency_threshold
+
+        if content_offload is not None:
+            cls.CONTENT_OFFLOAD = content_offload
+            cls.content_offload = content_offload
+
+        if offload_min_size is not None:
+            cls.OFFLOAD_MIN_SIZE = offload_min_size
+            cls.offload_min_size = offload_min_size
+
+        if offload_cache_size is not None:
+            cls.OFFLOAD_CACHE_SIZE = offload_cache_size
+            cls.offload_cache_size = offload_cache_size
+
+        if conversation_deltas is not None:
+            cls.CONVERSATION_DELTAS = conversation_deltas
+            cls.conversation_deltas = conversation_deltas
+
+        if deferred_serialization is not None:
+            cls.DEFERRED_SERIALIZATION = deferred_serialization
+            cls.deferred_serialization = deferred_serialization
+
+        if http_pool_size is not None:
+            cls.HTTP_POOL_SIZE = http_pool_size
+            cls.http_pool_size = http_pool_size
+
+        if http_keepalive is not None:
+            cls.HTTP_KEEPALIVE = http_keepalive
+            cls.http_keepalive = http_keepalive
+
+        if circuit_failure_threshold is not None:
+            cls.CIRCUIT_FAILURE_THRESHOLD = circuit_failure_threshold
+            cls.circuit_failure_threshold = circuit_failure_threshold
+
+        if circuit_max_backoff is not None:
+            cls.CIRCUIT_MAX_BACKOFF = circuit_max_backoff
+            cls.circuit_max_backoff = circuit_max_backoff
+
+        if spool_enabled is not None:
+            cls.SPOOL_ENABLED = spool_enabled
+            cls.spool_enabled = spool_enabled
+
+        if spool_dir is not None:
+            cls.SPOOL_DIR = spool_dir
+            cls.spool_dir = spool_dir
+
+        if spool_max_bytes is not None:
+            cls.SPOOL_MAX_BYTES = spool_max_bytes
+            cls.spool_max_bytes = spool_max_bytes
+
+        if spool_max_age is not None:
+            cls.SPOOL_MAX_AGE = spool_max_age
+            cls.spool_max_age = spool_max_age
+
+        if export_mode is not None:
+            if export_mode.lower() not in ("inprocess", "sidecar"):
+                raise ValueError(f"Invalid export_mode: {export_mode!r} (expected 'inprocess' or 'sidecar')")
+            cls.EXPORT_MODE = export_mode.lower()
+            cls.export_mode = export_mode.lower()
+
+        if sidecar_socket is not None:
+            cls.SIDECAR_SOCKET = sidecar_socket
+            cls.sidecar_socket = sidecar_socket
+
         if default_tags is not None:
             cls.DEFAULT_TAGS = set(default_tags)
             cls.default_tags = set(default_tags)
@@ -242,7 +490,16 @@ class Config:
             'auto_init', 'skip_auto_end_session', 'env_data_opt_out', 'log_level',
             'fail_safe', 'prefetch_jwt_token', 'exporter', 'processor',
             'exporter_endpoint', 'metrics_endpoint', 'logs_endpoint',
-            'agent_id', 'agent_name'  # 🔥 ADD THESE
+            'agent_id', 'agent_name',  # 🔥 ADD THESE
+            'spool_enabled', 'spool_dir', 'spool_max_bytes', 'spool_max_age',
+            'export_mode', 'sidecar_socket',
+            'max_export_batch_size', 'min_export_batch_size', 'reserved_queue_size',
+            'log_chunk_size', 'log_upload_interval', 'capture_logs', 'log_buffer_size', 'log_spill_max_bytes',
+            'resource_cache_ttl', 'sample_rate', 'sampling_rules', 'tail_sampling', 'tail_sample_rate',
+            'tail_latency_threshold', 'content_offload', 'offload_min_size', 'offload_cache_size',
+            'conversation_deltas',
+            'deferred_serialization',
+            'http_pool_size', 'http_keepalive', 'circuit_failure_threshold', 'circuit_max_backoff',
         }
         if unknown_kwargs:
             try:
@@ -262,6 +519,35 @@ class Config:
             "max_wait_time": cls.MAX_WAIT_TIME,
             "export_flush_interval": cls.EXPORT_FLUSH_INTERVAL,
             "max_queue_size": cls.MAX_QUEUE_SIZE,
+            "max_export_batch_size": cls.MAX_EXPORT_BATCH_SIZE,
+            "min_export_batch_size": cls.MIN_EXPORT_BATCH_SIZE,
+            "reserved_queue_size": cls.RESERVED_QUEUE_SIZE,
+            "log_chunk_size": cls.LOG_CHUNK_SIZE,
+            "log_upload_interval": cls.LOG_UPLOAD_INTERVAL,
+            "capture_logs": cls.CAPTURE_LOGS,
+            "log_buffer_size": cls.LOG_BUFFER_SIZE,
+            "log_spill_max_bytes": cls.LOG_SPILL_MAX_BYTES,
+            "resource_cache_ttl": cls.RESOURCE_CACHE_TTL,
+            "sample_rate": cls.SAMPLE_RATE,
+            "sampling_rules": cls.SAMPLING_RULES,
+            "tail_sampling": cls.TAIL_SAMPLING,
+            "tail_sample_rate": cls.TAIL_SAMPLE_RATE,
+            "tail_latency_threshold": cls.TAIL_LATENCY_THRESHOLD,
+            "content_offload": cls.CONTENT_OFFLOAD,
+            "offload_min_size": cls.OFFLOAD_MIN_SIZE,
+            "offload_cache_size": cls.OFFLOAD_CACHE_SIZE,
+            "conversation_deltas": cls.CONVERSATION_DELTAS,
+            "deferred_serialization": cls.DEFERRED_SERIALIZATION,
+            "http_pool_size": cls.HTTP_POOL_SIZE,
+            "http_keepalive": cls.HTTP_KEEPALIVE,
+            "circuit_failure_threshold": cls.CIRCUIT_FAILURE_THRESHOLD,
+            "circuit_max_backoff": cls.CIRCUIT_MAX_BACKOFF,
+            "spool_enabled": cls.SPOOL_ENABLED,
+            "spool_dir": cls.SPOOL_DIR,
+            "spool_max_bytes": cls.SPOOL_MAX_BYTES,
+            "spool_max_age": cls.SPOOL_MAX_AGE,
+            "export_mode": cls.EXPORT_MODE,
+            "sidecar_socket": cls.SIDECAR_SOCKET,
             "default_tags": list(cls.DEFAULT_TAGS),
             "instrument_llm_calls": cls.INSTRUMENT_LLM_CALLS,
             "auto_start_session": cls.AUTO_START_SESSION,
@@ -3,6 +3,7 @@ from .serialization import (
     AaliyahJSONEncoder,
     serialize_uuid,
     safe_serialize,
+    bounded_serialize,
     is_jsonable,
     filter_unjsonable,
 )
@@ -28,6 +29,7 @@ __all__ = [
     "AaliyahJSONEncoder",
     "serialize_uuid",
     "safe_serialize",
+    "bounded_serialize",
     "is_jsonable",
     "filter_unjsonable",
     "get_host_env",
@@ -1,70 +1,187 @@
-"""Serialization helpers for AgentOps"""
+"""Serialization helpers for AgentOps
 
+All JSON encoding in the SDK goes through one engine. Non-JSON types are
+converted by a per-type converter that is resolved once and cached, Pydantic v2
+models are dumped by pydantic-core, and orjson is used when it is installed
+(`pip install aliyah-sdk[fast-json]`); otherwise the stdlib C encoder is used.
+"""
+
+import dataclasses
 import json
-from datetime import datetime
+import math
+from datetime import date, datetime, time
 from decimal import Decimal
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, Dict, Optional
 from uuid import UUID
 
 from aliyah_sdk.logging import logger
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# Types the encoders handle natively; anything else goes through a converter
+_JSON_NATIVE_TYPES = (str, int, float, bool, type(None))
+
+# Converter per type, resolved on first use
+_converters: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _resolve_converter(cls: type) -> Callable[[Any], Any]:
+    """Pick the conversion of a non-JSON type into JSON-compatible data."""
+    if issubclass(cls, UUID):
+        return str
+    if issubclass(cls, (datetime, date, time)):
+        return cls.isoformat
+    if issubclass(cls, Decimal):
+        return str
+    if issubclass(cls, Enum):
+        return lambda obj: obj.value
+    if issubclass(cls, (set, frozenset)):
+        return list
+    if issubclass(cls, tuple):  # Named tuples, which orjson does not encode natively
+        return list
+    if issubclass(cls, (bytes, bytearray, memoryview)):
+        return lambda obj: summarize_value(obj) or str(obj)
+    # Before the to_json check: DataFrame.to_json and Series.to_json encode the whole object
+    if (cls.__module__ or "").split(".")[0] in ("numpy", "pandas"):
+        return lambda obj: summarize_value(obj) or str(obj)
+    if hasattr(cls, "model_dump_json"):  # Pydantic v2
+        return _dump_pydantic_model
+    if hasattr(cls, "to_json"):
+        return lambda obj: obj.to_json()
+    if hasattr(cls, "dict") and callable(cls.dict):  # Pydantic v1
+        return lambda obj: obj.dict()
+    if dataclasses.is_dataclass(cls):
+        return lambda obj: {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    if hasattr(cls, "parse"):  # Raw API response
+        return lambda obj: model_to_dict(obj)
+    return str
+
+
+def _dump_pydantic_model(obj: Any) -> Any:
+    try:
+        # Converted by pydantic-core straight to JSON-compatible types
+        return obj.model_dump(mode="json")
+    except Exception:
+        return obj.model_dump()
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Convert a single non-JSON object into JSON-compatible data (one level deep)."""
+    cls = type(obj)
+    converter = _converters.get(cls)
+    if converter is None:
+        converter = _converters[cls] = _resolve_converter(cls)
+    return converter(obj)
+
+
+# Same output as orjson: compact separators, unescaped non-ASCII characters, and
+# no NaN or Infinity tokens (see _replace_non_finite)
+_json_encoder = json.JSONEncoder(default=to_jsonable, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+
+
+def _replace_non_finite(obj: Any, _stack: Optional[set] = None) -> Any:
+    """Convert an object into JSON-compatible data with NaN and infinite floats as None, like orjson.
+
+    Only used once the stdlib encoder rejected a non-finite float, so the common
+    path never pays for the copy.
+
+    Raises:
+        ValueError: On circular references
+    """
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, _JSON_NATIVE_TYPES):
+        return obj
+    if _stack is None:
+        _stack = set()
+    if id(obj) in _stack:
+        raise ValueError("Circular reference detected")
+    _stack.add(id(obj))
+    try:
+        if isinstance(obj, dict):
+            return {
+                (None if isinstance(key, float) and not math.isfinite(key) else key): _replace_non_finite(value, _stack)
+                for key, value in obj.items()
+            }
+        if isinstance(obj, (list, tuple)):
+            return [_replace_non_finite(item, _stack) for item in obj]
+        return _replace_non_finite(to_jsonable(obj), _stack)
+    finally:
+        _stack.discard(id(obj))
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    try:
+        return _json_encoder.encode(obj)
+    except ValueError as e:
+        if "out of range float" not in str(e).lower():
+            raise
+    return _json_encoder.encode(_replace_non_finite(obj))
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as JSON in a single pass.
+
+    Raises:
+        TypeError, ValueError: If the object cannot be encoded (e.g. circular references)
+    """
+    if hasattr(type(obj), "model_dump_json"):
+        try:
+            return obj.model_dump_json()
+        except Exception:
+            # Fields pydantic cannot serialize; convert what it can and encode the rest below
+            obj = obj.model_dump()
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=to_jsonable, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            # Unsupported by orjson (e.g. integers above 64 bits, deep nesting); the stdlib encoder decides
+            pass
+    return _stdlib_dumps(obj)
+
 
 def is_jsonable(x):
+    if isinstance(x, _JSON_NATIVE_TYPES):
+        return True
     try:
         json.dumps(x)
         return True
-    except (TypeError, OverflowError):
+    except (TypeError, OverflowError, ValueError):
         return False
 
 
 def filter_unjsonable(d: dict) -> dict:
-    def filter_dict(obj):
+    """Replace values that are not JSON-serializable with "" (UUIDs become strings), in one pass."""
+
+    def filter_value(obj):
+        if isinstance(obj, _JSON_NATIVE_TYPES):
+            return obj
         if isinstance(obj, dict):
-            return {
-                k: (
-                    filter_dict(v)
-                    if isinstance(v, (dict, list)) or is_jsonable(v)
-                    else str(v)
-                    if isinstance(v, UUID)
-                    else ""
-                )
-                for k, v in obj.items()
-            }
-        elif isinstance(obj, list):
-            return [
-                (
-                    filter_dict(x)
-                    if isinstance(x, (dict, list)) or is_jsonable(x)
-                    else str(x)
-                    if isinstance(x, UUID)
-                    else ""
-                )
-                for x in obj
-            ]
-        else:
-            return obj if is_jsonable(obj) or isinstance(obj, UUID) else ""
+            return {k: filter_value(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [filter_value(x) for x in obj]
+        if isinstance(obj, UUID):
+            return str(obj)
+        if isinstance(obj, tuple) and is_jsonable(obj):
+            return obj
+        return ""
 
-    return filter_dict(d)
+    return filter_value(d)
 
 
 class AaliyahJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder for Aaliyah types"""
 
     def default(self, obj: Any) -> Any:
-        if isinstance(obj, UUID):
-            return str(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, Decimal):
-            return str(obj)
-        if isinstance(obj, set):
-            return list(obj)
-        if hasattr(obj, "to_json"):
-            return obj.to_json()
-        if isinstance(obj, Enum):
-            return obj.value
-        return str(obj)
+        return to_jsonable(obj)
 
 
 def serialize_uuid(obj: UUID) -> str:
@@ -111,9 +228,8 @@ def safe_serialize(obj: Any) -> Any:
 
     This function handles complex objects by:
     1. Returning strings untouched (even if they contain JSON)
-    2. Converting models to dictionaries
-    3. Using custom JSON encoder to handle special types
-    4. Falling back to string representation only when necessary
+    2. Encoding everything else in one pass with `dumps`, models included
+    3. Falling back to string representation only when necessary
 
     Args:
         obj: The object to serialize
@@ -126,12 +242,261 @@ def safe_serialize(obj: Any) -> Any:
     if isinstance(obj, str):
         return obj
 
-    # Convert any model objects to dictionaries
-    if hasattr(obj, "model_dump") or hasattr(obj, "dict") or hasattr(obj, "parse"):
-        obj = model_to_dict(obj)
-
     try:
-        return json.dumps(obj, cls=AaliyahJSONEncoder)
+        return dumps(obj)
     except (TypeError, ValueError) as e:
         logger.warning(f"Failed to serialize object: {e}")
         return str(obj)
+
+# Content larger than this is not recorded in full on spans
+MAX_CONTENT_SIZE = 1_000_000
+
+# Containers and byte strings up to this size are never summarised
+_SUMMARY_PREVIEW_ITEMS = 5
+_SMALL_BYTES = 256
+# Objects with at most this many nodes are checked for size and encoded with `dumps`
+_FAST_PATH_NODES = 256
+# Leaf types whose encoding is always short
+_SMALL_LEAF_TYPES = (int, float, bool, UUID, datetime, date, time, Decimal, Enum)
+
+
+class _BudgetExceeded(Exception):
+    """Raised by the bounded encoder once the byte budget is used up."""
+
+    def __init__(self):
+        super().__init__()
+        # Estimated size of the content that was not encoded
+        self.remaining = 0
+
+
+def summarize_value(obj: Any) -> Any:
+    """Return a small JSON-compatible summary for objects that should never be encoded in full.
+
+    Covers large byte strings and numpy/pandas objects, whose full encoding would
+    cost O(size). Returns None for anything else.
+    """
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        if len(obj) <= _SMALL_BYTES:
+            return None
+        return f"<{type(obj).__name__}: {len(obj)} bytes>"
+
+    module = type(obj).__module__ or ""
+    name = type(obj).__name__
+    if module.startswith("pandas") and name in ("DataFrame", "Series"):
+        try:
+            summary = {"type": name, "shape": list(obj.shape)}
+            if name == "DataFrame":
+                summary["columns"] = [str(column) for column in obj.columns[:50]]
+            summary["memory_bytes"] = int(obj.memory_usage(index=True, deep=False).sum())
+            summary["head"] = obj.head(_SUMMARY_PREVIEW_ITEMS).to_json(orient="records" if name == "DataFrame" else "values")
+            return summary
+        except Exception:
+            return f"<{name} shape={getattr(obj, 'shape', '?')}>"
+    if module == "numpy" and name == "ndarray":
+        try:
+            return {
+                "type": "ndarray",
+                "shape": list(obj.shape),
+                "dtype": str(obj.dtype),
+                "nbytes": int(obj.nbytes),
+                "head": obj.flat[:_SUMMARY_PREVIEW_ITEMS].tolist(),
+            }
+        except Exception:
+            return f"<ndarray shape={getattr(obj, 'shape', '?')}>"
+    return None
+
+
+def _is_small(obj: Any, max_bytes: int) -> bool:
+    """Cheaply check whether an object is certainly below the budget, visiting a bounded number of nodes."""
+    stack = [obj]
+    nodes = 0
+    size = 0
+    while stack:
+        item = stack.pop()
+        nodes += 1
+        if nodes > _FAST_PATH_NODES:
+            return False
+        if isinstance(item, str):
+            # Escaping can grow a string up to six times
+            size += 6 * len(item) + 2
+        elif isinstance(item, _SMALL_LEAF_TYPES) or item is None:
+            size += 64
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif (hasattr(type(item), "model_dump_json") or dataclasses.is_dataclass(item)) and hasattr(item, "__dict__"):
+            # Fields of Pydantic models and dataclasses live in __dict__
+            stack.extend(item.__dict__.values())
+        else:
+            # Bytes, frames and arbitrary objects go through the bounded encoder
+            return False
+        if size > max_bytes:
+            return False
+    return True
+
+
+def _encode_float(value: float) -> str:
+    # NaN and Infinity are not valid JSON; encoded as null like orjson does
+    if not math.isfinite(value):
+        return "null"
+    return float.__repr__(value)
+
+
+def _encode_key(key: Any) -> str:
+    """Convert a dict key the way json.dumps does; other types fall back to str()."""
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return _encode_float(key)
+    return str(key)
+
+
+class _BoundedEncoder:
+    """
+    JSON encoder that stops as soon as its output reaches a byte budget.
+
+    Produces the same compact formatting as `dumps` while the budget lasts, converting
+    non-JSON types with the same per-type converters as `dumps`. Work is
+    proportional to the budget, not to the size of the object.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.parts: list = []
+        self.size = 0
+        self._stack: set = set()
+
+    def write(self, text: str) -> None:
+        if self.size + len(text) > self.max_bytes:
+            # Keep what fits, so the preview uses the whole budget
+            fits = self.max_bytes - self.size
+            if fits > 0:
+                self.parts.append(text[:fits])
+                self.size += fits
+            error = _BudgetExceeded()
+            error.remaining = len(text) - max(fits, 0)
+            raise error
+        self.parts.append(text)
+        self.size += len(text)
+
+    def encode(self, obj: Any) -> None:
+        if isinstance(obj, str):
+            # Only escape what can still fit
+            room = self.max_bytes - self.size
+            if len(obj) > room:
+                self.write(json.encoder.encode_basestring(obj[: max(room, 0)]))
+                error = _BudgetExceeded()
+                error.remaining = len(obj) - room
+                raise error
+            self.write(json.encoder.encode_basestring(obj))
+        elif obj is None:
+            self.write("null")
+        elif obj is True:
+            self.write("true")
+        elif obj is False:
+            self.write("false")
+        elif isinstance(obj, int):
+            self.write(int.__repr__(obj))
+        elif isinstance(obj, float):
+            self.write(_encode_float(obj))
+        elif isinstance(obj, dict):
+            self._encode_container(obj, "{", "}", obj.items(), len(obj), is_dict=True)
+        elif isinstance(obj, (list, tuple)):
+            self._encode_container(obj, "[", "]", obj, len(obj))
+        else:
+            self.encode(to_jsonable(obj))
+
+    def _encode_container(self, obj, opener: str, closer: str, items, length: int, is_dict: bool = False) -> None:
+        marker = id(obj)
+        if marker in self._stack:
+            self.write('"[Circular]"')
+            return
+        self._stack.add(marker)
+
+        start = self.size
+        self.write(opener)
+        for index, item in enumerate(items):
+            try:
+                if index:
+                    self.write(",")
+                if is_dict:
+                    key, value = item
+                    self.encode(key if isinstance(key, str) else _encode_key(key))
+                    self.write(":")
+                    self.encode(value)
+                else:
+                    self.encode(item)
+            except _BudgetExceeded as error:
+                # Extrapolate the size of the items that were not encoded
+                average = (self.size - start) / (index + 1)
+                error.remaining += int(average * (length - index - 1))
+                raise
+        self.write(closer)
+        self._stack.discard(marker)
+
+
+def bounded_serialize(obj: Any, max_bytes: int = MAX_CONTENT_SIZE) -> str:
+    """Serialize an object to JSON, giving up once the output reaches `max_bytes`.
+
+    Strings are returned untouched and other objects are encoded like
+    `safe_serialize`, as long as they fit. Oversized content is not encoded in
+    full: the result is a JSON object with a truncation marker, the estimated
+    original size, and a preview made of the first part of the encoded text.
+    Large byte strings and numpy/pandas objects are always summarised.
+
+    Args:
+        obj: The object to serialize
+        max_bytes: Upper bound for the size of the result
+
+    Returns:
+        A string of at most about `max_bytes` characters
+    """
+    # Room for the truncation envelope around the preview
+    preview_bytes = max(0, max_bytes - 256)
+
+    if isinstance(obj, str):
+        if len(obj) <= max_bytes:
+            return obj
+        preview, original_size = obj[:preview_bytes], len(obj)
+    else:
+        # Small payloads take the single-pass encoder
+        if _is_small(obj, max_bytes):
+            try:
+                return dumps(obj)
+            except (TypeError, ValueError):
+                pass
+
+        encoder = _BoundedEncoder(preview_bytes)
+        try:
+            encoder.encode(obj)
+            return "".join(encoder.parts)
+        except _BudgetExceeded as error:
+            preview = "".join(encoder.parts)
+            original_size = encoder.size + error.remaining
+        except Exception as e:
+            logger.warning(f"Failed to serialize object: {e}")
+            return str(obj)[:max_bytes]
+
+    payload = {
+        "aaliyah.truncated": True,
+        "type": type(obj).__name__,
+        "original_size": original_size,
+        "preview": preview,
+    }
+    if hasattr(obj, "__len__"):
+        try:
+            payload["length"] = len(obj)
+        except Exception:
+            pass
+    encoded = _json_encoder.encode(payload)
+    if len(encoded) > max_bytes:
+        # Escaping grew the preview; cut it to fit
+        payload["preview"] = preview[: max(0, len(preview) - (len(encoded) - max_bytes))]
+        encoded = _json_encoder.encode(payload)
+    return encoded
@@ -5,6 +5,7 @@ import importlib
 
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor  # type: ignore
 
+from aliyah_sdk.instrumentation.import_hook import clear_import_hooks, is_available, when_imported
 from aliyah_sdk.logging import logger
 from aliyah_sdk.sdk.core import TracingCore
 
@@ -39,12 +40,8 @@ class InstrumentorLoader:
 
     @property
     def should_activate(self) -> bool:
-        """Is the provider import available in the environment?"""
-        try:
-            importlib.import_module(self.provider_import_name)
-            return True
-        except ImportError:
-            return False
+        """Is the provider import available in the environment? Does not import the provider."""
+        return is_available(self.provider_import_name)
 
     def get_instance(self) -> BaseInstrumentor:
         """Return a new instance of the instrumentor."""
@@ -106,10 +103,19 @@ def instrument_one(loader: InstrumentorLoader) -> Optional[BaseInstrumentor]:
     return instrumentor
 
 
+def _activate(loader: InstrumentorLoader) -> None:
+    instrumentor = instrument_one(loader)
+    if instrumentor is not None:
+        _active_instrumentors.append(instrumentor)
+
+
 def instrument_all():
     """
     Instrument all available instrumentors.
     This function is called when `instrument_llm_calls` is enabled.
+
+    Each instrumentor is applied when its provider is first imported by the
+    application, so providers that are installed but unused are never loaded.
     """
     global _active_instrumentors
 
@@ -118,14 +124,14 @@ def instrument_all():
         return
 
     for loader in available_instrumentors:
-        if loader.class_name in _active_instrumentors:
-            # already instrumented
-            logger.debug(f"Instrumentor {loader.class_name} has already been instrumented.")
-            return None
+        if not loader.should_activate:
+            # this package is not in the environment; skip
+            logger.debug(
+                f"Package {loader.provider_import_name} not found; skipping instrumentation of {loader.class_name}"
+            )
+            continue
 
-        instrumentor = instrument_one(loader)
-        if instrumentor is not None:
-            _active_instrumentors.append(instrumentor)
+        when_imported(loader.provider_import_name, lambda _module, loader=loader: _activate(loader))
 
 
 def uninstrument_all():
@@ -134,6 +140,8 @@ def uninstrument_all():
     This can be called to disable instrumentation.
     """
     global _active_instrumentors
+    # Providers not imported yet should stay uninstrumented
+    clear_import_hooks()
     for instrumentor in _active_instrumentors:
         instrumentor.uninstrument()
         logger.debug(f"Uninstrumented {instrumentor.__class__.__name__}")
@@ -3,6 +3,8 @@
 import json
 from typing import Dict, Any, Optional, Tuple
 
+from opentelemetry.trace import Span
+
 try:
     from anthropic.types import Message, Completion
 except ImportError:
@@ -16,6 +18,8 @@ from aliyah_sdk.semconv import (
     MessageAttributes,
 )
 from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.instrumentation.common.conversation import get_conversation_delta
+from aliyah_sdk.sdk.offload import offload_content
 from aliyah_sdk.instrumentation.anthropic.attributes.common import (
     get_common_instrumentation_attributes,
     extract_request_attributes,
@@ -136,7 +140,7 @@ def _process_content(content, role, index):
     if isinstance(content, str):
         # String content is easy
         attributes[MessageAttributes.PROMPT_ROLE.format(i=index)] = role
-        attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = content
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = offload_content(content)
         attributes[MessageAttributes.PROMPT_TYPE.format(i=index)] = "text"
     elif isinstance(content, list):
         # For list content, create a simplified representation
@@ -152,14 +156,14 @@ def _process_content(content, role, index):
                     content_str += item.text + " "
 
         attributes[MessageAttributes.PROMPT_ROLE.format(i=index)] = role
-        attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = content_str.strip()
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = offload_content(content_str.strip())
         attributes[MessageAttributes.PROMPT_TYPE.format(i=index)] = "text"
     else:
         # Other types - try to convert to string
         try:
             simple_content = str(content)
             attributes[MessageAttributes.PROMPT_ROLE.format(i=index)] = role
-            attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = simple_content
+            attributes[MessageAttributes.PROMPT_CONTENT.format(i=index)] = offload_content(simple_content)
             attributes[MessageAttributes.PROMPT_TYPE.format(i=index)] = "text"
         except:
             # Ultimate fallback
@@ -203,7 +207,7 @@ def _create_simplified_message(msg):
             return {"role": role, "content": "(complex content)"}
 
 
-def get_message_request_attributes(kwargs: Dict[str, Any]) -> AttributeMap:
+def get_message_request_attributes(kwargs: Dict[str, Any], span: Optional[Span] = None) -> AttributeMap:
     """Extract attributes from message request parameters.
 
     This function processes the request parameters for the Messages API call and extracts
@@ -212,12 +216,14 @@ def get_message_request_attributes(kwargs: Dict[str, Any]) -> AttributeMap:
 
     It extracts:
     - System prompt (if present)
-    - User and assistant messages
+    - User and assistant messages (with conversation deltas enabled, only those
+      added since an earlier span of the same conversation)
     - Tool definitions (if present)
     - Model parameters (temperature, max_tokens, etc.)
 
     Args:
         kwargs: Request keyword arguments
+        span: The span the attributes are recorded on, if it is not the current span
 
     Returns:
         Dictionary of extracted attributes
@@ -228,12 +234,16 @@ def get_message_request_attributes(kwargs: Dict[str, Any]) -> AttributeMap:
     system = kwargs.get("system", "")
     if system:
         attributes[MessageAttributes.PROMPT_ROLE.format(i=0)] = "system"
-        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = system
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = offload_content(system)
         attributes[MessageAttributes.PROMPT_TYPE.format(i=0)] = "text"
 
-    # Extract messages
+    # Extract messages, skipping those an earlier span of the conversation already recorded
     messages = kwargs.get("messages", [])
-    for index, msg in enumerate(messages):
+    delta = get_conversation_delta(messages, span)
+    if delta:
+        attributes.update(delta.attributes())
+        messages = messages[delta.offset :]
+    for index, msg in enumerate(messages, delta.offset if delta else 0):
         role = msg.get("role", "user")
         content = msg.get("content", "")
 
@@ -272,7 +282,7 @@ def get_completion_request_attributes(kwargs: Dict[str, Any]) -> AttributeMap:
     if prompt:
         # Use structured prompt attributes
         attributes[MessageAttributes.PROMPT_ROLE.format(i=0)] = "user"
-        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = prompt
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = offload_content(prompt)
         attributes[MessageAttributes.PROMPT_TYPE.format(i=0)] = "text"
 
     return attributes
@@ -353,7 +363,7 @@ def get_message_response_attributes(response: "Message") -> AttributeMap: # type
                     extracted_content.append({"type": "text", "text": text_content})
                     # Use structured completion attributes
                     attributes[MessageAttributes.COMPLETION_TYPE.format(i=i)] = "text"
-                    attributes[MessageAttributes.COMPLETION_CONTENT.format(i=i)] = text_content
+                    attributes[MessageAttributes.COMPLETION_CONTENT.format(i=i)] = offload_content(text_content)
 
                 elif hasattr(block, "type") and block.type == "tool_use":
                     # Add as tool call
@@ -6,6 +6,7 @@ from typing import Dict, Any, List, Optional
 from aliyah_sdk.logging import logger
 from aliyah_sdk.semconv import SpanAttributes, MessageAttributes, ToolAttributes, ToolStatus
 from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.sdk.offload import offload_content
 
 
 def extract_tool_definitions(tools: List[Dict[str, Any]]) -> AttributeMap:
@@ -38,7 +39,9 @@ def extract_tool_definitions(tools: List[Dict[str, Any]]) -> AttributeMap:
                 attributes[MessageAttributes.TOOL_CALL_DESCRIPTION.format(i=i)] = description
 
             if "input_schema" in tool:
-                attributes[MessageAttributes.TOOL_CALL_ARGUMENTS.format(i=i)] = json.dumps(tool["input_schema"])
+                attributes[MessageAttributes.TOOL_CALL_ARGUMENTS.format(i=i)] = offload_content(
+                    json.dumps(tool["input_schema"])
+                )
 
             tool_id = tool.get("id", f"tool-{i}")
             attributes[MessageAttributes.TOOL_CALL_ID.format(i=i)] = tool_id
@@ -60,7 +63,7 @@ def extract_tool_definitions(tools: List[Dict[str, Any]]) -> AttributeMap:
 
             tool_schemas.append(schema)
 
-        attributes["anthropic.tools.schemas"] = json.dumps(tool_schemas)
+        attributes["anthropic.tools.schemas"] = offload_content(json.dumps(tool_schemas))
 
     except Exception as e:
         logger.debug(f"[agentops.instrumentation.anthropic] Error extracting tool definitions: {e}")
@@ -13,18 +13,42 @@ from opentelemetry.trace import SpanKind
 from opentelemetry.instrumentation.utils import _SUPPRESS_INSTRUMENTATION_KEY
 
 from aliyah_sdk.semconv import SpanAttributes, LLMRequestTypeValues, CoreAttributes, MessageAttributes
+from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.instrumentation.common.streaming import StreamAccumulator
 from aliyah_sdk.instrumentation.common.wrappers import _with_tracer_wrapper
 from aliyah_sdk.instrumentation.anthropic.attributes.message import (
     get_message_request_attributes,
     get_stream_attributes,
 )
 from aliyah_sdk.instrumentation.anthropic.event_handler_wrapper import EventHandleWrapper
+from aliyah_sdk.sdk.offload import offload_content
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+def _get_final_message_attributes(final_message) -> AttributeMap:
+    """Extract the completion text and token usage from the final message snapshot of a stream."""
+    attributes: AttributeMap = {}
+    if hasattr(final_message, "content") and isinstance(final_message.content, list):
+        content_text = "".join(block.text for block in final_message.content if hasattr(block, "text"))
+        if content_text:
+            attributes[MessageAttributes.COMPLETION_TYPE.format(i=0)] = "text"
+            attributes[MessageAttributes.COMPLETION_ROLE.format(i=0)] = "assistant"
+            attributes[MessageAttributes.COMPLETION_CONTENT.format(i=0)] = offload_content(content_text)
+
+    if hasattr(final_message, "usage"):
+        usage = final_message.usage
+        if hasattr(usage, "input_tokens"):
+            attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] = usage.input_tokens
+        if hasattr(usage, "output_tokens"):
+            attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] = usage.output_tokens
+        if hasattr(usage, "input_tokens") and hasattr(usage, "output_tokens"):
+            attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS] = usage.input_tokens + usage.output_tokens
+    return attributes
+
+
 @_with_tracer_wrapper
 def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
     """Wrapper for the Messages.stream method.
@@ -51,9 +75,8 @@ def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
         attributes={SpanAttributes.LLM_REQUEST_TYPE: LLMRequestTypeValues.CHAT.value},
     )
 
-    request_attributes = get_message_request_attributes(kwargs)
-    for key, value in request_attributes.items():
-        span.set_attribute(key, value)
+    request_attributes = get_message_request_attributes(kwargs, span=span)
+    span.set_attributes(request_attributes)
 
     span.set_attribute(SpanAttributes.LLM_REQUEST_STREAMING, True)
 
@@ -63,6 +86,9 @@ def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
         wrapped_handler = EventHandleWrapper(original_handler=original_event_handler, span=span)
         kwargs["event_handler"] = wrapped_handler
 
+    # Span attributes for the response are set once, when the stream is closed
+    accumulator = StreamAccumulator(span)
+
     try:
 
         class TracedStreamManager:
@@ -91,8 +117,7 @@ def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
 
                 try:
                     stream_attributes = get_stream_attributes(self.stream)
-                    for key, value in stream_attributes.items():
-                        span.set_attribute(key, value)
+                    span.set_attributes(stream_attributes)
                 except Exception as e:
                     logger.debug(f"Error getting stream attributes: {e}")
 
@@ -102,21 +127,18 @@ def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
                 else:
                     try:
                         original_text_stream = self.stream.text_stream
-                        token_count = 0
 
                         class InstrumentedTextStream:
-                            """A wrapper for Anthropic's text stream that counts tokens."""
+                            """A wrapper for Anthropic's text stream that collects the streamed text."""
 
                             def __iter__(self):
-                                """Iterate through text chunks, counting tokens.
+                                """Iterate through text chunks, collecting them for the span.
 
                                 Yields:
                                     Text chunks from the original stream
                                 """
-                                nonlocal token_count
                                 for text in original_text_stream:
-                                    token_count += len(text.split())
-                                    span.set_attribute(SpanAttributes.LLM_USAGE_STREAMING_TOKENS, token_count)
+                                    accumulator.add(text)
                                     yield text
 
                         self.stream.text_stream = InstrumentedTextStream()
@@ -137,50 +159,21 @@ def messages_stream_wrapper(tracer, wrapped, instance, args, kwargs):
                     Result of the original context manager's __exit__
                 """
                 try:
-                    if exc_type is not None:
-                        span.record_exception(exc_val)
-                        span.set_attribute(CoreAttributes.ERROR_MESSAGE, str(exc_val))
-                        span.set_attribute(CoreAttributes.ERROR_TYPE, exc_type.__name__)
+                    final_message = None
 
-                    try:
-                        final_message = None
+                    if hasattr(self.original_manager, "_MessageStreamManager__stream") and hasattr(
+                        self.original_manager._MessageStreamManager__stream,
+                        "_MessageStream__final_message_snapshot",
+                    ):
+                        final_message = self.original_manager._MessageStreamManager__stream._MessageStream__final_message_snapshot
 
-                        if hasattr(self.original_manager, "_MessageStreamManager__stream") and hasattr(
-                            self.original_manager._MessageStreamManager__stream,
-                            "_MessageStream__final_message_snapshot",
-                        ):
-                            final_message = self.original_manager._MessageStreamManager__stream._MessageStream__final_message_snapshot
+                    if final_message:
+                        accumulator.update(_get_final_message_attributes(final_message))
+                except Exception as e:
+                    logger.debug(f"Failed to extract final message data: {e}")
 
-                        if final_message:
-                            if hasattr(final_message, "content"):
-                                content_text = ""
-                                if isinstance(final_message.content, list):
-                                    for content_block in final_message.content:
-                                        if hasattr(content_block, "text"):
-                                            content_text += content_block.text
-
-                                if content_text:
-                                    span.set_attribute(MessageAttributes.COMPLETION_TYPE.format(i=0), "text")
-                                    span.set_attribute(MessageAttributes.COMPLETION_ROLE.format(i=0), "assistant")
-                                    span.set_attribute(MessageAttributes.COMPLETION_CONTENT.format(i=0), content_text)
-
-                            if hasattr(final_message, "usage"):
-                                usage = final_message.usage
-                                if hasattr(usage, "input_tokens"):
-                                    span.set_attribute(SpanAttributes.LLM_USAGE_PROMPT_TOKENS, usage.input_tokens)
-
-                                if hasattr(usage, "output_tokens"):
-                                    span.set_attribute(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, usage.output_tokens)
-
-                                if hasattr(usage, "input_tokens") and hasattr(usage, "output_tokens"):
-                                    total_tokens = usage.input_tokens + usage.output_tokens
-                                    span.set_attribute(SpanAttributes.LLM_USAGE_TOTAL_TOKENS, total_tokens)
-                    except Exception as e:
-                        logger.debug(f"Failed to extract final message data: {e}")
-                finally:
-                    if span.is_recording():
-                        span.end()
-                    return self.original_manager.__exit__(exc_type, exc_val, exc_tb)
+                accumulator.finish(exc_val if exc_type is not None else None)
+                return self.original_manager.__exit__(exc_type, exc_val, exc_tb)
 
         stream_manager = wrapped(*args, **kwargs)
 
@@ -283,9 +276,8 @@ def messages_stream_async_wrapper(tracer, wrapped, instance, args, kwargs):
         attributes={SpanAttributes.LLM_REQUEST_TYPE: LLMRequestTypeValues.CHAT.value},
     )
 
-    request_attributes = get_message_request_attributes(kwargs)
-    for key, value in request_attributes.items():
-        span.set_attribute(key, value)
+    request_attributes = get_message_request_attributes(kwargs, span=span)
+    span.set_attributes(request_attributes)
 
     span.set_attribute(SpanAttributes.LLM_REQUEST_STREAMING, True)
 
@@ -295,6 +287,9 @@ def messages_stream_async_wrapper(tracer, wrapped, instance, args, kwargs):
         wrapped_handler = EventHandleWrapper(original_handler=original_event_handler, span=span)
         kwargs["event_handler"] = wrapped_handler
 
+    # Span attributes for the response are set once, when the stream is closed
+    accumulator = StreamAccumulator(span)
+
     async def _wrapped_stream():
         """Async wrapper function for the stream method.
 
@@ -331,29 +326,25 @@ def messages_stream_async_wrapper(tracer, wrapped, instance, args, kwargs):
 
                     try:
                         stream_attributes = get_stream_attributes(self.stream)
-                        for key, value in stream_attributes.items():
-                            span.set_attribute(key, value)
+                        span.set_attributes(stream_attributes)
                     except Exception as e:
                         logger.debug(f"Error getting async stream attributes: {e}")
 
                     if original_event_handler is None:
                         try:
                             original_text_stream = self.stream.text_stream
-                            token_count = 0
 
                             class InstrumentedAsyncTextStream:
-                                """A wrapper for Anthropic's async text stream that counts tokens."""
+                                """A wrapper for Anthropic's async text stream that collects the streamed text."""
 
                                 async def __aiter__(self):
-                                    """Async iterate through text chunks, counting tokens.
+                                    """Async iterate through text chunks, collecting them for the span.
 
                                     Yields:
                                         Text chunks from the original async stream
                                     """
-                                    nonlocal token_count
                                     async for text in original_text_stream:
-                                        token_count += len(text.split())
-                                        span.set_attribute(SpanAttributes.LLM_USAGE_STREAMING_TOKENS, token_count)
+                                        accumulator.add(text)
                                         yield text
 
                             self.stream.text_stream = InstrumentedAsyncTextStream()
@@ -374,54 +365,21 @@ def messages_stream_async_wrapper(tracer, wrapped, instance, args, kwargs):
                         Result of the original async context manager's __aexit__
                     """
                     try:
-                        if exc_type is not None:
-                            span.record_exception(exc_val)
-                            span.set_attribute(CoreAttributes.ERROR_MESSAGE, str(exc_val))
-                            span.set_attribute(CoreAttributes.ERROR_TYPE, exc_type.__name__)
+                        final_message = None
 
-                        try:
-                            final_message = None
-
-                            if hasattr(self.original_manager, "_AsyncMessageStreamManager__stream") and hasattr(
-                                self.original_manager._AsyncMessageStreamManager__stream,
-                                "_AsyncMessageStream__final_message_snapshot",
-                            ):
-                                final_message = self.original_manager._AsyncMessageStreamManager__stream._AsyncMessageStream__final_message_snapshot
-
-                            if final_message:
-                                if hasattr(final_message, "content"):
-                                    content_text = ""
-                                    if isinstance(final_message.content, list):
-                                        for content_block in final_message.content:
-                                            if hasattr(content_block, "text"):
-                                                content_text += content_block.text
-
-                                    if content_text:
-                                        span.set_attribute(MessageAttributes.COMPLETION_TYPE.format(i=0), "text")
-                                        span.set_attribute(MessageAttributes.COMPLETION_ROLE.format(i=0), "assistant")
-                                        span.set_attribute(
-                                            MessageAttributes.COMPLETION_CONTENT.format(i=0), content_text
-                                        )
-
-                                if hasattr(final_message, "usage"):
-                                    usage = final_message.usage
-                                    if hasattr(usage, "input_tokens"):
-                                        span.set_attribute(SpanAttributes.LLM_USAGE_PROMPT_TOKENS, usage.input_tokens)
-
-                                    if hasattr(usage, "output_tokens"):
-                                        span.set_attribute(
-                                            SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, usage.output_tokens
-                                        )
-
-                                    if hasattr(usage, "input_tokens") and hasattr(usage, "output_tokens"):
-                                        total_tokens = usage.input_tokens + usage.output_tokens
-                                        span.set_attribute(SpanAttributes.LLM_USAGE_TOTAL_TOKENS, total_tokens)
-                        except Exception as e:
-                            logger.debug(f"Failed to extract final async message data: {e}")
-                    finally:
-                        if span.is_recording():
-                            span.end()
-                        return await self.original_manager.__aexit__(exc_type, exc_val, exc_tb)
+                        if hasattr(self.original_manager, "_AsyncMessageStreamManager__stream") and hasattr(
+                            self.original_manager._AsyncMessageStreamManager__stream,
+                            "_AsyncMessageStream__final_message_snapshot",
+                        ):
+                            final_message = self.original_manager._AsyncMessageStreamManager__stream._AsyncMessageStream__final_message_snapshot
+
+                        if final_message:
+                            accumulator.update(_get_final_message_attributes(final_message))
+                    except Exception as e:
+                        logger.debug(f"Failed to extract final async message data: {e}")
+
+                    accumulator.finish(exc_val if exc_type is not None else None)
+                    return await self.original_manager.__aexit__(exc_type, exc_val, exc_tb)
 
             return TracedAsyncStreamManager(stream_manager)
 
@@ -118,33 +118,67 @@ class IndexedAttributeData(TypedDict, total=False):
     j: Optional[int] = None
 
 
-def _extract_attributes_from_mapping(span_data: Any, attribute_mapping: AttributeMap) -> AttributeMap:
-    """Helper function to extract attributes based on a mapping.
+_MISSING = object()
+_PRIMITIVE_TYPES = (int, float, bool)
 
-    Args:
-        span_data: The span data object or dict to extract attributes from
-        attribute_mapping: Dictionary mapping target attributes to source attributes
 
-    Returns:
-        Dictionary of extracted attributes
+class AttributeExtractor:
+    """An `AttributeMap` compiled into a callable.
+
+    The mapping is turned into a tuple of (target, source) pairs once, so
+    extracting attributes is a single pass over the pairs with one attribute
+    lookup each.
+    """
+
+    def __init__(self, attribute_mapping: AttributeMap):
+        self.mapping = attribute_mapping
+        self.fields = tuple(attribute_mapping.items())
+
+    def __call__(self, span_data: Any) -> AttributeMap:
+        return _extract_fields(span_data, self.fields)
+
+
+class IndexedAttributeExtractor(AttributeExtractor):
+    """An `IndexedAttributeMap` compiled into a callable taking the indexes.
+
+    Target keys are formatted per call through their `format(i=..., j=...)`;
+    for `IndexedAttributeKey` templates this returns cached, interned keys.
     """
+
+    def __call__(self, span_data: Any, i: int, j: Optional[int] = None) -> AttributeMap:
+        # Extract under the templates first, so only keys with a value are formatted
+        attributes = _extract_fields(span_data, self.fields)
+        if j is None:
+            return {target_attr.format(i=i): value for target_attr, value in attributes.items()}
+        return {target_attr.format(i=i, j=j): value for target_attr, value in attributes.items()}
+
+
+def _extract_fields(span_data: Any, fields) -> AttributeMap:
     attributes = {}
-    for target_attr, source_attr in attribute_mapping.items():
-        if hasattr(span_data, source_attr):
-            # Use getattr to handle properties
-            value = getattr(span_data, source_attr)
-        elif isinstance(span_data, dict) and source_attr in span_data:
-            # Use direct key access for dicts
-            value = span_data[source_attr]
-        else:
-            continue
+    is_dict = isinstance(span_data, dict)
+    for target_attr, source_attr in fields:
+        # Attributes take precedence over dict keys, to handle properties
+        value = getattr(span_data, source_attr, _MISSING)
+        if value is _MISSING:
+            if not is_dict:
+                continue
+            value = span_data.get(source_attr, _MISSING)
+            if value is _MISSING:
+                continue
 
         # Skip if value is None or empty
-        if value is None or (isinstance(value, (list, dict, str)) and not value):
+        if value is None:
+            continue
+        value_type = type(value)
+        if value_type is str:
+            if not value:
+                continue
+        elif value_type in _PRIMITIVE_TYPES:
+            pass
+        elif isinstance(value, (list, dict, str)) and not value:
             continue
-
         # Serialize complex objects
-        elif isinstance(value, (dict, list, object)) and not isinstance(value, (str, int, float, bool)):
+        elif not isinstance(value, (str, int, float, bool)):
             value = safe_serialize(value)
 
         attributes[target_attr] = value
@@ -152,6 +186,45 @@ def _extract_attributes_from_mapping(span_data: Any, attribute_mapping: Attribut
     return attributes
 
 
+# Compiled extractors keyed by the id of their mapping. Each entry holds its mapping, so
+# the id cannot be reused while cached; mappings are expected not to change once used.
+_compiled: Dict[int, AttributeExtractor] = {}
+_MAX_COMPILED = 512
+
+
+def _compile(attribute_mapping, extractor_class):
+    extractor = _compiled.get(id(attribute_mapping))
+    if extractor is None or extractor.mapping is not attribute_mapping or type(extractor) is not extractor_class:
+        if len(_compiled) >= _MAX_COMPILED:
+            # Mappings built per call would otherwise accumulate here
+            _compiled.clear()
+        extractor = _compiled[id(attribute_mapping)] = extractor_class(attribute_mapping)
+    return extractor
+
+
+def compile_attribute_map(attribute_mapping: AttributeMap) -> AttributeExtractor:
+    """Return the compiled extractor for a mapping, compiling it on first use."""
+    return _compile(attribute_mapping, AttributeExtractor)
+
+
+def compile_indexed_attribute_map(attribute_mapping: IndexedAttributeMap) -> IndexedAttributeExtractor:
+    """Return the compiled extractor for an indexed mapping, compiling it on first use."""
+    return _compile(attribute_mapping, IndexedAttributeExtractor)
+
+
+def _extract_attributes_from_mapping(span_data: Any, attribute_mapping: AttributeMap) -> AttributeMap:
+    """Helper function to extract attributes based on a mapping.
+
+    Args:
+        span_data: The span data object or dict to extract attributes from
+        attribute_mapping: Dictionary mapping target attributes to source attributes
+
+    Returns:
+        Dictionary of extracted attributes
+    """
+    return compile_attribute_map(attribute_mapping)(span_data)
+
+
 def _extract_attributes_from_mapping_with_index(
     span_data: Any, attribute_mapping: IndexedAttributeMap, i: int, j: Optional[int] = None
 ) -> AttributeMap:
@@ -169,18 +242,7 @@ def _extract_attributes_from_mapping_with_index(
     Returns:
         Dictionary of extracted attributes with formatted indexed keys.
     """
-
-    # `i` is required for formatting the attribute keys, `j` is optional
-    format_kwargs: IndexedAttributeData = {"i": i}
-    if j is not None:
-        format_kwargs["j"] = j
-
-    # Update the attribute mapping to include the index for the span
-    attribute_mapping_with_index: AttributeMap = {}
-    for target_attr, source_attr in attribute_mapping.items():
-        attribute_mapping_with_index[target_attr.format(**format_kwargs)] = source_attr
-
-    return _extract_attributes_from_mapping(span_data, attribute_mapping_with_index)
+    return compile_indexed_attribute_map(attribute_mapping)(span_data, i, j)
 
 
 def get_common_attributes() -> AttributeMap:
@@ -0,0 +1,150 @@
+"""Conversation delta capture for chat-style LLM requests.
+
+Chat APIs are stateless, so every call resends the whole conversation and a
+naive instrumentor records all of it again on every span: an n-turn chat costs
+O(n²) bytes of telemetry. With delta capture enabled, the message prefix of
+each request is fingerprinted and matched against the prefixes already
+recorded in the same trace. Only the messages after the longest known prefix
+are recorded, and the span points to the span that recorded the rest:
+
+    gen_ai.conversation.id                groups the spans of one conversation
+    gen_ai.conversation.offset            index of the first message on this span
+    gen_ai.conversation.previous_span_id  span holding the messages before it
+
+Message indexes in `gen_ai.prompt.{i}.*` stay absolute, so a conversation is
+rebuilt by following `previous_span_id` and merging the recorded messages.
+
+Only recording spans are registered as recorders, so spans dropped by head
+sampling never become a `previous_span_id`. Tail sampling keeps or drops whole
+traces and prefixes are only matched within a trace, so the recorder of a
+span is exported whenever the span is (as long as the processor still
+remembers the trace's decision).
+"""
+
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Tuple
+
+from opentelemetry import trace
+from opentelemetry.trace import Span
+
+from aliyah_sdk.config import Config
+from aliyah_sdk.helpers import safe_serialize
+from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.semconv import MessageAttributes
+
+
+@dataclass
+class ConversationDelta:
+    """Where a request's messages continue an already recorded conversation."""
+
+    conversation_id: str
+    # Messages before this index were recorded by `previous_span_id`
+    offset: int = 0
+    previous_span_id: Optional[str] = None
+
+    def attributes(self) -> AttributeMap:
+        attributes = {
+            MessageAttributes.CONVERSATION_ID: self.conversation_id,
+            MessageAttributes.CONVERSATION_OFFSET: self.offset,
+        }
+        if self.previous_span_id is not None:
+            attributes[MessageAttributes.CONVERSATION_PREVIOUS_SPAN_ID] = self.previous_span_id
+        return attributes
+
+
+class ConversationTracker:
+    """Remembers the message prefixes recorded per trace.
+
+    Each prefix is identified by a chained hash over its messages, so prefixes
+    of the same conversation share all hashes up to the point they diverge.
+    Known prefixes are kept in an LRU bounded by `max_prefixes`; an evicted
+    prefix is simply recorded again in full.
+
+    The delta of a span is computed once: attribute handlers may run several
+    times for the same span (e.g. again on errors), and would otherwise match
+    the prefixes the span itself just registered.
+    """
+
+    def __init__(self, max_prefixes: int = 10000, max_spans: int = 1000):
+        self.max_prefixes = max_prefixes
+        self.max_spans = max_spans
+        # (trace id, prefix hash) -> (conversation id, id of the span that recorded the prefix)
+        self._prefixes: "OrderedDict[Tuple[int, bytes], Tuple[str, str]]" = OrderedDict()
+        # (trace id, span id) -> delta computed for the span, most recent last
+        self._deltas: "OrderedDict[Tuple[int, str], ConversationDelta]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def delta(self, trace_id: int, span_id: str, messages: Sequence[Any]) -> ConversationDelta:
+        """Match `messages` against recorded prefixes and register this span as their recorder.
+
+        Later calls for the same span return the delta of the first call.
+        """
+        with self._lock:
+            known_delta = self._deltas.get((trace_id, span_id))
+        if known_delta is not None:
+            return known_delta
+
+        hashes = []
+        prefix_hash = b""
+        for message in messages:
+            prefix_hash = hashlib.sha256(prefix_hash + _fingerprint(message)).digest()
+            hashes.append(prefix_hash)
+
+        with self._lock:
+            offset = 0
+            match = None
+            # Prefix hashes are chained, so the first unknown prefix ends the match
+            for index, prefix_hash in enumerate(hashes):
+                known = self._prefixes.get((trace_id, prefix_hash))
+                if known is None:
+                    break
+                self._prefixes.move_to_end((trace_id, prefix_hash))
+                offset, match = index + 1, known
+
+            if match is None:
+                delta = ConversationDelta(uuid.uuid4().hex)
+            else:
+                delta = ConversationDelta(match[0], offset, match[1])
+
+            for prefix_hash in hashes[offset:]:
+                self._prefixes[(trace_id, prefix_hash)] = (delta.conversation_id, span_id)
+            while len(self._prefixes) > self.max_prefixes:
+                self._prefixes.popitem(last=False)
+            self._deltas[(trace_id, span_id)] = delta
+            while len(self._deltas) > self.max_spans:
+                self._deltas.popitem(last=False)
+        return delta
+
+
+def _fingerprint(message: Any) -> bytes:
+    if isinstance(message, str):
+        return message.encode("utf-8")
+    return safe_serialize(message).encode("utf-8")
+
+
+_tracker = ConversationTracker()
+
+
+def get_conversation_delta(messages: Any, span: Optional[Span] = None) -> Optional[ConversationDelta]:
+    """Return the delta for a request's messages, or None when they should be recorded in full.
+
+    `span` is the LLM span the messages are recorded on; defaults to the current
+    span, so wrappers that do not make their span current must pass it.
+    Messages are recorded in full when delta capture is disabled, when they
+    are not a list or tuple, or when the span is not recording (e.g. dropped by
+    sampling), as it could not serve as the recorder of later requests.
+    """
+    if not Config.CONVERSATION_DELTAS or not isinstance(messages, (list, tuple)) or not messages:
+        return None
+    if span is None:
+        span = trace.get_current_span()
+    if not span.is_recording():
+        return None
+    span_context = span.get_span_context()
+    if not span_context.is_valid:
+        return None
+    return _tracker.delta(span_context.trace_id, format(span_context.span_id, "016x"), messages)
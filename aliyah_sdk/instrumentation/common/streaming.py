@@ -0,0 +1,222 @@
+"""Telemetry accumulation for streamed LLM responses.
+
+Stream wrappers see a response one chunk at a time, often one token per chunk.
+Setting span attributes or growing a string on every chunk makes a long stream
+cost a lock acquisition and a copy of the text so far per token. The
+`StreamAccumulator` keeps per-chunk work to a list append and a few counters,
+and records everything on the span once, when the stream finishes.
+
+Streaming latency is recorded as histograms for every provider, labelled by
+system, model and agent:
+
+    gen_ai.client.time_to_first_token    request start to the first streamed token
+    gen_ai.client.time_per_output_token  first to last token, per output token after the first
+    gen_ai.client.generation_time        request start to the end of the stream
+"""
+
+import time
+from typing import Any, List, Mapping, Optional, Tuple
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Histogram
+from opentelemetry.trace import Span, Status, StatusCode
+
+from aliyah_sdk.config import Config
+from aliyah_sdk.helpers.serialization import MAX_CONTENT_SIZE
+from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.sdk.offload import offload_content
+from aliyah_sdk.semconv import AgentAttributes, CoreAttributes, MessageAttributes, Meters, SpanAttributes
+
+# Bucket boundaries, in seconds, from the OpenTelemetry GenAI semantic conventions
+TIME_TO_FIRST_TOKEN_BUCKETS = [0.001, 0.005, 0.01, 0.02, 0.04, 0.06, 0.08, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0]
+TIME_PER_OUTPUT_TOKEN_BUCKETS = [0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 2.5]
+GENERATION_TIME_BUCKETS = [0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.28, 2.56, 5.12, 10.24, 20.48, 40.96, 81.92]
+
+_latency_instruments: Optional[Tuple[Histogram, Histogram, Histogram]] = None
+
+
+def _latency_histograms() -> Tuple[Histogram, Histogram, Histogram]:
+    """Return the time to first token, time per output token and generation time histograms."""
+    global _latency_instruments
+    if _latency_instruments is None:
+        meter = metrics.get_meter(__name__)
+        _latency_instruments = (
+            meter.create_histogram(
+                Meters.LLM_TIME_TO_FIRST_TOKEN,
+                unit="s",
+                description="Time from the request to the first token of a streamed response",
+                explicit_bucket_boundaries_advisory=TIME_TO_FIRST_TOKEN_BUCKETS,
+            ),
+            meter.create_histogram(
+                Meters.LLM_TIME_PER_OUTPUT_TOKEN,
+                unit="s",
+                description="Time per output token after the first of a streamed response",
+                explicit_bucket_boundaries_advisory=TIME_PER_OUTPUT_TOKEN_BUCKETS,
+            ),
+            meter.create_histogram(
+                Meters.LLM_GENERATION_TIME,
+                unit="s",
+                description="Time from the request to the end of a streamed response",
+                explicit_bucket_boundaries_advisory=GENERATION_TIME_BUCKETS,
+            ),
+        )
+    return _latency_instruments
+
+
+def get_stream_metric_attributes(*sources: Mapping[str, Any]) -> AttributeMap:
+    """Build the system, model and agent labels of the latency metrics.
+
+    Sources are span attribute mappings, searched in order; the response model
+    is preferred over the requested one.
+    """
+    attributes: AttributeMap = {}
+    for key in (SpanAttributes.LLM_SYSTEM,):
+        value = next((source[key] for source in sources if source.get(key)), None)
+        if value is not None:
+            attributes[key] = value
+    model = next(
+        (
+            source[key]
+            for key in (SpanAttributes.LLM_RESPONSE_MODEL, SpanAttributes.LLM_REQUEST_MODEL)
+            for source in sources
+            if source.get(key)
+        ),
+        None,
+    )
+    if model is not None:
+        attributes[SpanAttributes.LLM_REQUEST_MODEL] = model
+    if Config.agent_name:
+        attributes[AgentAttributes.AGENT_NAME] = Config.agent_name
+    if Config.agent_id is not None:
+        attributes[AgentAttributes.AGENT_ID] = Config.agent_id
+    return attributes
+
+
+def record_stream_latency(
+    attributes: AttributeMap,
+    started: float,
+    first_token: Optional[float],
+    ended: Optional[float] = None,
+    output_tokens: int = 0,
+) -> None:
+    """Record the latency histograms of one streamed response.
+
+    Times are `time.perf_counter()` values. Pass `ended=None` for a stream that
+    did not complete, so only the time to first token is recorded.
+    """
+    time_to_first_token, time_per_output_token, generation_time = _latency_histograms()
+    if first_token is not None:
+        time_to_first_token.record(first_token - started, attributes)
+    if ended is None:
+        return
+    generation_time.record(ended - started, attributes)
+    if first_token is not None and output_tokens > 1:
+        time_per_output_token.record((ended - first_token) / (output_tokens - 1), attributes)
+
+
+class StreamAccumulator:
+    """Collects the text and attributes of a streamed response and records them on the span once.
+
+    Text beyond `max_size` characters is counted but not kept. The streaming
+    token count is approximated by the number of words in the text, counted
+    once when the stream finishes.
+
+    Usage:
+        accumulator = StreamAccumulator(span)
+        for chunk in stream:
+            accumulator.add(chunk.text)
+        accumulator.update(usage_attributes)
+        accumulator.finish()  # or finish(error), or close() when abandoned
+    """
+
+    def __init__(self, span: Span, max_size: int = MAX_CONTENT_SIZE, started: Optional[float] = None):
+        """
+        Args:
+            span: The span of the streamed request
+            max_size: Characters of streamed text kept for the completion content
+            started: `time.perf_counter()` value when the request was sent; defaults to now
+        """
+        self.span = span
+        self.max_size = max_size
+        self.started = time.perf_counter() if started is None else started
+        self.first_token: Optional[float] = None
+        self.chunks = 0
+        self._text: List[str] = []
+        self._size = 0
+        # Words in text past max_size, which is not kept
+        self._dropped_words = 0
+        self._attributes: AttributeMap = {}
+        self.finished = False
+
+    def add(self, text: Optional[str]) -> None:
+        """Record a chunk of streamed text."""
+        if not text:
+            return
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+        self.chunks += 1
+        if self._size < self.max_size:
+            self._text.append(text)
+            self._size += len(text)
+        else:
+            self._dropped_words += len(text.split())
+
+    def update(self, attributes: AttributeMap) -> None:
+        """Stage attributes to set when the stream finishes; later values win."""
+        self._attributes.update(attributes)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Record the stream on the span, with an OK or error status, and end it.
+
+        Streamed text becomes the completion content unless the staged
+        attributes already carry it. Only the first call to `finish` or `close`
+        has an effect.
+        """
+        if self.finished:
+            return
+        if error is not None:
+            self.span.record_exception(error)
+            self.update(
+                {
+                    CoreAttributes.ERROR_MESSAGE: str(error),
+                    CoreAttributes.ERROR_TYPE: error.__class__.__name__,
+                }
+            )
+            self.span.set_status(Status(StatusCode.ERROR, str(error)))
+        else:
+            self.span.set_status(Status(StatusCode.OK))
+        self._record(complete=error is None)
+
+    def close(self) -> None:
+        """Record what the stream produced so far and end the span, leaving its status as is."""
+        self._record(complete=False)
+
+    def _record(self, complete: bool) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        ended = time.perf_counter()
+
+        text = "".join(self._text)
+        attributes: AttributeMap = {
+            SpanAttributes.LLM_USAGE_STREAMING_TOKENS: len(text.split()) + self._dropped_words,
+        }
+        if text and MessageAttributes.COMPLETION_CONTENT.format(i=0) not in self._attributes:
+            attributes[MessageAttributes.COMPLETION_ROLE.format(i=0)] = "assistant"
+            attributes[MessageAttributes.COMPLETION_CONTENT.format(i=0)] = offload_content(text[: self.max_size])
+        attributes.update(self._attributes)
+
+        self.span.set_attributes(attributes)
+        self.span.end()
+
+        # Output tokens as reported by the provider, else one per streamed chunk
+        output_tokens = self._attributes.get(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS)
+        if not isinstance(output_tokens, int):
+            output_tokens = self.chunks
+        record_stream_latency(
+            get_stream_metric_attributes(self._attributes, getattr(self.span, "attributes", None) or {}),
+            self.started,
+            self.first_token,
+            ended if complete else None,
+            output_tokens,
+        )
@@ -58,12 +58,14 @@ class WrapConfig:
 def _update_span(span: Span, attributes: AttributeMap) -> None:
     """Update a span with the provided attributes.
 
+    The attributes are applied in one call, so the span's lock is taken once
+    rather than once per attribute.
+
     Args:
         span: The OpenTelemetry span to update
         attributes: A dictionary of attributes to set on the span
     """
-    for key, value in attributes.items():
-        span.set_attribute(key, value)
+    span.set_attributes(attributes)
 
 
 def _finish_span_success(span: Span) -> None:
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional, Tuple
 from aliyah_sdk.logging import logger
 from aliyah_sdk.semconv import SpanAttributes, LLMRequestTypeValues, MessageAttributes
 from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.sdk.offload import offload_content
 from aliyah_sdk.instrumentation.google_generativeai.attributes.common import (
     extract_request_attributes,
     get_common_instrumentation_attributes,
@@ -74,7 +75,7 @@ def _set_chat_history_attributes(attributes: AttributeMap, args: Tuple, kwargs:
                 elif hasattr(message, "role"):
                     role = message.role
 
-                attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = content
+                attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = offload_content(content)
                 attributes[MessageAttributes.PROMPT_ROLE.format(i=i)] = role
         except Exception as e:
             logger.debug(f"Error extracting chat message at index {i}: {e}")
@@ -9,6 +9,7 @@ from aliyah_sdk.instrumentation.common.attributes import (
     get_common_attributes,
     _extract_attributes_from_mapping,
 )
+from aliyah_sdk.sdk.offload import offload_content
 from aliyah_sdk.instrumentation.google_generativeai import LIBRARY_NAME, LIBRARY_VERSION
 
 # Common mapping for config parameters
@@ -82,6 +83,12 @@ def extract_request_attributes(kwargs: Dict[str, Any]) -> AttributeMap:
         except Exception as e:
             logger.debug(f"Error extracting config parameters: {e}")
 
+        # The system instruction is usually identical across calls
+        if SpanAttributes.LLM_REQUEST_SYSTEM_INSTRUCTION in attributes:
+            attributes[SpanAttributes.LLM_REQUEST_SYSTEM_INSTRUCTION] = offload_content(
+                attributes[SpanAttributes.LLM_REQUEST_SYSTEM_INSTRUCTION]
+            )
+
     if "stream" in kwargs:
         attributes[SpanAttributes.LLM_REQUEST_STREAMING] = kwargs["stream"]
 
@@ -2,9 +2,13 @@
 
 from typing import Dict, Any, Optional, Tuple
 
+from opentelemetry.trace import Span
+
 from aliyah_sdk.logging import logger
 from aliyah_sdk.semconv import SpanAttributes, LLMRequestTypeValues, MessageAttributes
 from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.instrumentation.common.conversation import get_conversation_delta
+from aliyah_sdk.sdk.offload import offload_content
 from aliyah_sdk.instrumentation.google_generativeai.attributes.common import (
     extract_request_attributes,
     get_common_instrumentation_attributes,
@@ -72,7 +76,9 @@ def _extract_content_from_prompt(content: Any) -> str:
         return ""
 
 
-def _set_prompt_attributes(attributes: AttributeMap, args: Tuple, kwargs: Dict[str, Any]) -> None:
+def _set_prompt_attributes(
+    attributes: AttributeMap, args: Tuple, kwargs: Dict[str, Any], span: Optional[Span] = None
+) -> None:
     """Extract and set prompt attributes from the request.
 
     Respects privacy controls and handles the various ways prompts can be specified
@@ -82,6 +88,7 @@ def _set_prompt_attributes(attributes: AttributeMap, args: Tuple, kwargs: Dict[s
         attributes: The attribute dictionary to update
         args: Positional arguments to the method
         kwargs: Keyword arguments to the method
+        span: The span the attributes are recorded on, if it is not the current span
     """
 
     content = None
@@ -96,11 +103,16 @@ def _set_prompt_attributes(attributes: AttributeMap, args: Tuple, kwargs: Dict[s
         return
 
     if isinstance(content, list):
-        for i, item in enumerate(content):
+        # Skip the turns an earlier span of the conversation already recorded
+        delta = get_conversation_delta(content, span)
+        if delta:
+            attributes.update(delta.attributes())
+            content = content[delta.offset :]
+        for i, item in enumerate(content, delta.offset if delta else 0):
             try:
                 extracted_text = _extract_content_from_prompt(item)
                 if extracted_text:
-                    attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = extracted_text
+                    attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = offload_content(extracted_text)
                     role = "user"
                     if isinstance(item, dict) and "role" in item:
                         role = item["role"]
@@ -113,7 +125,7 @@ def _set_prompt_attributes(attributes: AttributeMap, args: Tuple, kwargs: Dict[s
         try:
             extracted_text = _extract_content_from_prompt(content)
             if extracted_text:
-                attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = extracted_text
+                attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = offload_content(extracted_text)
                 attributes[MessageAttributes.PROMPT_ROLE.format(i=0)] = "user"
         except Exception as e:
             logger.debug(f"Error extracting prompt content: {e}")
@@ -143,7 +155,7 @@ def _set_response_attributes(attributes: AttributeMap, response: Any) -> None:
 
     try:
         if hasattr(response, "text"):
-            attributes[MessageAttributes.COMPLETION_CONTENT.format(i=0)] = response.text
+            attributes[MessageAttributes.COMPLETION_CONTENT.format(i=0)] = offload_content(response.text)
             attributes[MessageAttributes.COMPLETION_ROLE.format(i=0)] = "assistant"
         elif hasattr(response, "candidates"):
             # List of candidates
@@ -157,7 +169,7 @@ def _set_response_attributes(attributes: AttributeMap, response: Any) -> None:
                         elif hasattr(part, "text"):
                             text += part.text
 
-                    attributes[MessageAttributes.COMPLETION_CONTENT.format(i=i)] = text
+                    attributes[MessageAttributes.COMPLETION_CONTENT.format(i=i)] = offload_content(text)
                     attributes[MessageAttributes.COMPLETION_ROLE.format(i=i)] = "assistant"
 
                 if hasattr(candidate, "finish_reason"):
@@ -170,6 +182,7 @@ def get_model_attributes(
     args: Optional[Tuple] = None,
     kwargs: Optional[Dict[str, Any]] = None,
     return_value: Optional[Any] = None,
+    span: Optional[Span] = None,
 ) -> AttributeMap:
     """Extract attributes for GenerativeModel methods.
 
@@ -180,6 +193,7 @@ def get_model_attributes(
         args: Positional arguments to the method
         kwargs: Keyword arguments to the method
         return_value: Return value from the method
+        span: The span the attributes are recorded on, if it is not the current span
 
     Returns:
         Dictionary of extracted attributes
@@ -193,7 +207,7 @@ def get_model_attributes(
         attributes.update(kwargs_attributes)
 
     if args or kwargs:
-        _set_prompt_attributes(attributes, args or (), kwargs or {})
+        _set_prompt_attributes(attributes, args or (), kwargs or {}, span)
 
     if return_value is not None:
         _set_response_attributes(attributes, return_value)
@@ -205,6 +219,7 @@ def get_generate_content_attributes(
     args: Optional[Tuple] = None,
     kwargs: Optional[Dict[str, Any]] = None,
     return_value: Optional[Any] = None,
+    span: Optional[Span] = None,
 ) -> AttributeMap:
     """Extract attributes for the generate_content method.
 
@@ -215,11 +230,12 @@ def get_generate_content_attributes(
         args: Positional arguments to the method
         kwargs: Keyword arguments to the method
         return_value: Return value from the method
+        span: The span the attributes are recorded on, if it is not the current span
 
     Returns:
         Dictionary of extracted attributes
     """
-    return get_model_attributes(args, kwargs, return_value)
+    return get_model_attributes(args, kwargs, return_value, span)
 
 
 def get_token_counting_attributes(
@@ -6,13 +6,16 @@ It instruments streams to collect telemetry data for monitoring and analysis.
 """
 
 import logging
+import time
 from typing import TypeVar
 
 from opentelemetry import context as context_api
 from opentelemetry.trace import SpanKind, Status, StatusCode
 from opentelemetry.instrumentation.utils import _SUPPRESS_INSTRUMENTATION_KEY
 
-from aliyah_sdk.semconv import SpanAttributes, LLMRequestTypeValues, CoreAttributes, MessageAttributes
+from aliyah_sdk.semconv import SpanAttributes, LLMRequestTypeValues, CoreAttributes
+from aliyah_sdk.instrumentation.common.attributes import AttributeMap
+from aliyah_sdk.instrumentation.common.streaming import StreamAccumulator
 from aliyah_sdk.instrumentation.common.wrappers import _with_tracer_wrapper
 from aliyah_sdk.instrumentation.google_generativeai.attributes.model import (
     get_generate_content_attributes,
@@ -27,6 +30,18 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+def _get_usage_attributes(metadata) -> AttributeMap:
+    """Extract token usage from the usage metadata of a stream chunk."""
+    attributes: AttributeMap = {}
+    if hasattr(metadata, "prompt_token_count"):
+        attributes[SpanAttributes.LLM_USAGE_PROMPT_TOKENS] = metadata.prompt_token_count
+    if hasattr(metadata, "candidates_token_count"):
+        attributes[SpanAttributes.LLM_USAGE_COMPLETION_TOKENS] = metadata.candidates_token_count
+    if hasattr(metadata, "total_token_count"):
+        attributes[SpanAttributes.LLM_USAGE_TOTAL_TOKENS] = metadata.total_token_count
+    return attributes
+
+
 @_with_tracer_wrapper
 def generate_content_stream_wrapper(tracer, wrapped, instance, args, kwargs):
     """Wrapper for the GenerativeModel.generate_content_stream method.
@@ -54,9 +69,8 @@ def generate_content_stream_wrapper(tracer, wrapped, instance, args, kwargs):
     )
 
     # Extract request parameters and custom config
-    request_attributes = get_generate_content_attributes(args=args, kwargs=kwargs)
-    for key, value in request_attributes.items():
-        span.set_attribute(key, value)
+    request_attributes = get_generate_content_attributes(args=args, kwargs=kwargs, span=span)
+    span.set_attributes(request_attributes)
 
     # Mark as streaming request
     span.set_attribute(SpanAttributes.LLM_REQUEST_STREAMING, True)
@@ -64,16 +78,16 @@ def generate_content_stream_wrapper(tracer, wrapped, instance, args, kwargs):
     # Extract custom parameters from config (if present)
     if "config" in kwargs:
         config_attributes = extract_request_attributes({"config": kwargs["config"]})
-        for key, value in config_attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(config_attributes)
 
+    # Streaming latency is measured from the request
+    started = time.perf_counter()
     try:
         stream = wrapped(*args, **kwargs)
 
         # Extract model information if available
         stream_attributes = get_stream_attributes(stream)
-        for key, value in stream_attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(stream_attributes)
 
         def instrumented_stream():
             """Generator that wraps the original stream with instrumentation.
@@ -81,7 +95,7 @@ def generate_content_stream_wrapper(tracer, wrapped, instance, args, kwargs):
             Yields:
                 Items from the original stream with added instrumentation
             """
-            full_text = ""
+            accumulator = StreamAccumulator(span, started=started)
             last_chunk_with_metadata = None
 
             try:
@@ -90,36 +104,21 @@ def generate_content_stream_wrapper(tracer, wrapped, instance, args, kwargs):
                     if hasattr(chunk, "usage_metadata") and chunk.usage_metadata:
                         last_chunk_with_metadata = chunk
 
-                    # Track token count (approximate by word count if metadata not available)
                     if hasattr(chunk, "text"):
-                        full_text += chunk.text
+                        accumulator.add(chunk.text)
 
                     yield chunk
 
-                # Set final content when complete
-                if full_text:
-                    span.set_attribute(MessageAttributes.COMPLETION_CONTENT.format(i=0), full_text)
-                    span.set_attribute(MessageAttributes.COMPLETION_ROLE.format(i=0), "assistant")
-
                 # Get token usage from the last chunk if available
-                if last_chunk_with_metadata and hasattr(last_chunk_with_metadata, "usage_metadata"):
-                    metadata = last_chunk_with_metadata.usage_metadata
-                    if hasattr(metadata, "prompt_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_PROMPT_TOKENS, metadata.prompt_token_count)
-                    if hasattr(metadata, "candidates_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, metadata.candidates_token_count)
-                    if hasattr(metadata, "total_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_TOTAL_TOKENS, metadata.total_token_count)
-
-                span.set_status(Status(StatusCode.OK))
+                if last_chunk_with_metadata is not None:
+                    accumulator.update(_get_usage_attributes(last_chunk_with_metadata.usage_metadata))
+                accumulator.finish()
             except Exception as e:
-                span.record_exception(e)
-                span.set_attribute(CoreAttributes.ERROR_MESSAGE, str(e))
-                span.set_attribute(CoreAttributes.ERROR_TYPE, e.__class__.__name__)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+                accumulator.finish(e)
                 raise
             finally:
-                span.end()
+                # Closed before the end of the stream
+                accumulator.close()
 
         return instrumented_stream()
     except Exception as e:
@@ -158,9 +157,8 @@ async def generate_content_stream_async_wrapper(tracer, wrapped, instance, args,
     )
 
     # Extract request parameters and custom config
-    request_attributes = get_generate_content_attributes(args=args, kwargs=kwargs)
-    for key, value in request_attributes.items():
-        span.set_attribute(key, value)
+    request_attributes = get_generate_content_attributes(args=args, kwargs=kwargs, span=span)
+    span.set_attributes(request_attributes)
 
     # Mark as streaming request
     span.set_attribute(SpanAttributes.LLM_REQUEST_STREAMING, True)
@@ -168,16 +166,16 @@ async def generate_content_stream_async_wrapper(tracer, wrapped, instance, args,
     # Extract custom parameters from config (if present)
     if "config" in kwargs:
         config_attributes = extract_request_attributes({"config": kwargs["config"]})
-        for key, value in config_attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(config_attributes)
 
+    # Streaming latency is measured from the request
+    started = time.perf_counter()
     try:
         stream = await wrapped(*args, **kwargs)
 
         # Extract model information if available
         stream_attributes = get_stream_attributes(stream)
-        for key, value in stream_attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(stream_attributes)
 
         async def instrumented_stream():
             """Async generator that wraps the original stream with instrumentation.
@@ -185,7 +183,7 @@ async def generate_content_stream_async_wrapper(tracer, wrapped, instance, args,
             Yields:
                 Items from the original stream with added instrumentation
             """
-            full_text = ""
+            accumulator = StreamAccumulator(span, started=started)
             last_chunk_with_metadata = None
 
             try:
@@ -195,34 +193,20 @@ async def generate_content_stream_async_wrapper(tracer, wrapped, instance, args,
                         last_chunk_with_metadata = chunk
 
                     if hasattr(chunk, "text"):
-                        full_text += chunk.text
+                        accumulator.add(chunk.text)
 
                     yield chunk
 
-                # Set final content when complete
-                if full_text:
-                    span.set_attribute(MessageAttributes.COMPLETION_CONTENT.format(i=0), full_text)
-                    span.set_attribute(MessageAttributes.COMPLETION_ROLE.format(i=0), "assistant")
-
                 # Get token usage from the last chunk if available
-                if last_chunk_with_metadata and hasattr(last_chunk_with_metadata, "usage_metadata"):
-                    metadata = last_chunk_with_metadata.usage_metadata
-                    if hasattr(metadata, "prompt_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_PROMPT_TOKENS, metadata.prompt_token_count)
-                    if hasattr(metadata, "candidates_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, metadata.candidates_token_count)
-                    if hasattr(metadata, "total_token_count"):
-                        span.set_attribute(SpanAttributes.LLM_USAGE_TOTAL_TOKENS, metadata.total_token_count)
-
-                span.set_status(Status(StatusCode.OK))
+                if last_chunk_with_metadata is not None:
+                    accumulator.update(_get_usage_attributes(last_chunk_with_metadata.usage_metadata))
+                accumulator.finish()
             except Exception as e:
-                span.record_exception(e)
-                span.set_attribute(CoreAttributes.ERROR_MESSAGE, str(e))
-                span.set_attribute(CoreAttributes.ERROR_TYPE, e.__class__.__name__)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+                accumulator.finish(e)
                 raise
             finally:
-                span.end()
+                # Closed before the end of the stream
+                accumulator.close()
 
         return instrumented_stream()
     except Exception as e:
@@ -0,0 +1,134 @@
+"""
+Post-import hooks for lazy instrumentation.
+
+Instead of importing every supported provider SDK at init just to patch it,
+instrumentors are registered against the provider's module name and applied
+the moment the application itself imports that module. A `sys.meta_path`
+finder intercepts the import, lets the regular finders locate the module, and
+runs the registered hooks once the module has finished executing. Providers
+the application never imports are never loaded.
+"""
+
+import importlib.util
+import sys
+import threading
+from importlib.abc import Loader, MetaPathFinder
+from types import ModuleType
+from typing import Callable, Dict, List
+
+from aliyah_sdk.logging import logger
+
+ImportHook = Callable[[ModuleType], None]
+
+# Hooks waiting for their module to be imported, keyed by full module name
+_hooks: Dict[str, List[ImportHook]] = {}
+_lock = threading.RLock()
+
+
+def is_available(module_name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it.
+
+    Parent packages of a dotted name are imported (e.g. the `google` namespace
+    package for `google.genai`), the module itself is not.
+    """
+    if module_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def when_imported(module_name: str, hook: ImportHook) -> None:
+    """
+    Call `hook(module)` once `module_name` has been imported.
+
+    The hook runs immediately when the module is already imported, otherwise
+    right after the application's first import of it completes. Each hook runs
+    at most once.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        with _lock:
+            module = sys.modules.get(module_name)
+            if module is None:
+                _hooks.setdefault(module_name, []).append(hook)
+                _install_finder()
+                return
+    _run_hook(module_name, hook, module)
+
+
+def clear_import_hooks() -> None:
+    """Forget hooks that have not run yet and remove the finder from `sys.meta_path`."""
+    with _lock:
+        _hooks.clear()
+        if _finder in sys.meta_path:
+            sys.meta_path.remove(_finder)
+
+
+def _install_finder() -> None:
+    """Put the finder first on `sys.meta_path`. Call with the lock held."""
+    if _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+
+
+def _run_hook(module_name: str, hook: ImportHook, module: ModuleType) -> None:
+    try:
+        hook(module)
+    except Exception as e:
+        # A failing instrumentor must never break the application's import
+        logger.warning(f"Failed to run import hook for {module_name}: {e}")
+
+
+def _run_hooks(module: ModuleType) -> None:
+    with _lock:
+        hooks = _hooks.pop(module.__name__, [])
+        if not _hooks and _finder in sys.meta_path:
+            sys.meta_path.remove(_finder)
+    for hook in hooks:
+        _run_hook(module.__name__, hook, module)
+
+
+class _HookedLoader(Loader):
+    """Wraps a module's real loader and runs the pending hooks after the module executes."""
+
+    def __init__(self, loader: Loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # The module should only ever see its real loader
+        module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        self._loader.exec_module(module)
+        _run_hooks(module)
+
+
+class ImportHookFinder(MetaPathFinder):
+    """
+    `sys.meta_path` finder that attaches post-import hooks to watched modules.
+
+    It never locates modules itself: it asks the finders after it for the spec
+    and only wraps the loader of modules with pending hooks.
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in _hooks:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _HookedLoader(spec.loader)
+            return spec
+        return None
+
+
+_finder = ImportHookFinder()
@@ -1,4 +1,7 @@
 from typing import Optional, Tuple, Dict
+
+from opentelemetry.trace import Span
+
 from aliyah_sdk.logging import logger
 from aliyah_sdk.semconv import InstrumentationAttributes
 from aliyah_sdk.instrumentation.openai import LIBRARY_NAME, LIBRARY_VERSION
@@ -33,7 +36,10 @@ def get_common_instrumentation_attributes() -> AttributeMap:
 
 
 def get_response_attributes(
-    args: Optional[Tuple] = None, kwargs: Optional[Dict] = None, return_value: Optional["Response"] = None
+    args: Optional[Tuple] = None,
+    kwargs: Optional[Dict] = None,
+    return_value: Optional["Response"] = None,
+    span: Optional[Span] = None,
 ) -> AttributeMap:
     """ """
     # We can get an context object before, and after the request is made, so
@@ -43,7 +49,7 @@ def get_response_attributes(
     # Parse the keyword arguments to extract relevant attributes
     # We do not ever get `args` from this method call since it is a keyword-only method
     if kwargs:
-        attributes.update(get_response_kwarg_attributes(kwargs))
+        attributes.update(get_response_kwarg_attributes(kwargs, span))
 
     # Parse the return value to extract relevant attributes
     if return_value:
@@ -1,4 +1,7 @@
-from typing import List, Union
+from typing import List, Optional, Union
+
+from opentelemetry.trace import Span
+
 from aliyah_sdk.logging import logger
 from aliyah_sdk.semconv import (
     SpanAttributes,
@@ -10,6 +13,8 @@ from aliyah_sdk.instrumentation.common.attributes import (
     _extract_attributes_from_mapping,
     _extract_attributes_from_mapping_with_index,
 )
+from aliyah_sdk.instrumentation.common.conversation import get_conversation_delta
+from aliyah_sdk.sdk.offload import offload_content
 
 try:
     from openai.types.responses import (
@@ -316,8 +321,11 @@ RESPONSE_REASONING_ATTRIBUTES: AttributeMap = {
 }
 
 
-def get_response_kwarg_attributes(kwargs: dict) -> AttributeMap:
-    """Handles interpretation of openai Responses.create method keyword arguments."""
+def get_response_kwarg_attributes(kwargs: dict, span: Optional[Span] = None) -> AttributeMap:
+    """Handles interpretation of openai Responses.create method keyword arguments.
+
+    `span` is the span the attributes are recorded on, if it is not the current span.
+    """
 
     # Just gather the attributes that are not present in the Response object
     # TODO We could gather more here and have more context available in the
@@ -353,10 +361,15 @@ def get_response_kwarg_attributes(kwargs: dict) -> AttributeMap:
     _input: Union[str, list, None] = kwargs.get("input")
     if isinstance(_input, str):
         attributes[MessageAttributes.PROMPT_ROLE.format(i=0)] = "user"
-        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = _input
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=0)] = offload_content(_input)
 
     elif isinstance(_input, list):
-        for i, prompt in enumerate(_input):
+        # Skip the items an earlier span of the conversation already recorded
+        delta = get_conversation_delta(_input, span)
+        if delta:
+            attributes.update(delta.attributes())
+            _input = _input[delta.offset :]
+        for i, prompt in enumerate(_input, delta.offset if delta else 0):
             # Object type is pretty diverse, so we handle common attributes, but do so
             # conditionally because not all attributes are guaranteed to exist
             if hasattr(prompt, "type"):
@@ -364,7 +377,7 @@ def get_response_kwarg_attributes(kwargs: dict) -> AttributeMap:
             if hasattr(prompt, "role"):
                 attributes[MessageAttributes.PROMPT_ROLE.format(i=i)] = prompt.role
             if hasattr(prompt, "content"):
-                attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = prompt.content
+                attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = offload_content(prompt.content)
 
     else:
         logger.debug(f"[aaliyah.instrumentation.openai.response] '{type(_input)}' is not a recognized input type.")
@@ -380,6 +393,9 @@ def get_response_kwarg_attributes(kwargs: dict) -> AttributeMap:
 def get_response_response_attributes(response: "Response") -> AttributeMap:
     """Handles interpretation of an openai Response object."""
     attributes = _extract_attributes_from_mapping(response.__dict__, RESPONSE_ATTRIBUTES)
+    if SpanAttributes.LLM_PROMPTS in attributes:
+        # Instructions are usually identical across calls
+        attributes[SpanAttributes.LLM_PROMPTS] = offload_content(attributes[SpanAttributes.LLM_PROMPTS])
 
     if response.output:
         attributes.update(get_response_output_attributes(response.output))
@@ -480,7 +496,11 @@ def get_response_tools_attributes(tools: List["ToolTypes"]) -> AttributeMap:
 
     for i, tool in enumerate(tools):
         if isinstance(tool, FunctionTool):
-            attributes.update(_extract_attributes_from_mapping_with_index(tool, RESPONSE_TOOL_ATTRIBUTES, i))
+            tool_attributes = _extract_attributes_from_mapping_with_index(tool, RESPONSE_TOOL_ATTRIBUTES, i)
+            arguments_key = MessageAttributes.TOOL_CALL_ARGUMENTS.format(i=i)
+            if arguments_key in tool_attributes:
+                tool_attributes[arguments_key] = offload_content(tool_attributes[arguments_key])
+            attributes.update(tool_attributes)
 
         elif isinstance(tool, WebSearchTool):
             attributes.update(get_response_tool_web_search_attributes(tool, i))
@@ -156,8 +156,7 @@ class OpenAIAgentsExporter:
 
             if not span_is_ended:
                 # Update with core attributes
-                for key, value in attributes.items():
-                    existing_span.set_attribute(key, value)
+                existing_span.set_attributes(attributes)
 
                 # Handle error if present
                 if hasattr(trace, "error") and trace.error:
@@ -361,8 +360,7 @@ class OpenAIAgentsExporter:
 
             if not span_is_ended:
                 # Update and end the existing span
-                for key, value in attributes.items():
-                    existing_span.set_attribute(key, value)
+                existing_span.set_attributes(attributes)
 
                 # Set status and handle any error information
                 existing_span.set_status(Status(StatusCode.OK if span.status == "OK" else StatusCode.ERROR))
@@ -4,6 +4,7 @@ LangChain callback handler for Aaliyah.
 This module provides the LangChain callback handler for Aaliyah tracing and monitoring.
 """
 
+import time
 from typing import Any, Dict, List, Optional, Union
 
 from opentelemetry import trace
@@ -11,6 +12,7 @@ from opentelemetry.context import attach, detach
 from opentelemetry.trace import SpanContext, set_span_in_context
 
 from aliyah_sdk.helpers.serialization import safe_serialize
+from aliyah_sdk.instrumentation.common.streaming import get_stream_metric_attributes, record_stream_latency
 from aliyah_sdk.logging import logger
 from aliyah_sdk.sdk.core import TracingCore
 from aliyah_sdk.semconv import SpanKind, SpanAttributes, LangChainAttributes, LangChainAttributeValues, CoreAttributes
@@ -48,6 +50,7 @@ class LangchainCallbackHandler(BaseCallbackHandler):
         self.session_token = None
         self.context_tokens = {}  # Store context tokens by run_id
         self.token_counts = {}  # Track token counts for streaming
+        self.stream_timings = {}  # [start, first token] perf_counter times by run_id
 
         # Initialize Aaliyah
         if auto_session:
@@ -181,6 +184,33 @@ class LangchainCallbackHandler(BaseCallbackHandler):
         # Clean up token counts if present
         if run_id in self.token_counts:
             del self.token_counts[run_id]
+        self.stream_timings.pop(run_id, None)
+
+    def _record_stream_latency(self, run_id: Any, span: Any, completed: bool, output_tokens: Optional[int] = None):
+        """
+        Record the latency metrics of a streamed LLM call.
+
+        Args:
+            run_id: Unique identifier for the operation
+            span: The span of the LLM call
+            completed: Whether the stream ended normally
+            output_tokens: Output tokens reported by the model, else the streamed token count
+        """
+        timing = self.stream_timings.get(run_id)
+        streamed = self.token_counts.get(run_id, 0)
+        if timing is None or not streamed:
+            return
+
+        try:
+            record_stream_latency(
+                get_stream_metric_attributes(getattr(span, "attributes", None) or {}),
+                timing[0],
+                timing[1],
+                time.perf_counter() if completed else None,
+                output_tokens or streamed,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record stream latency: {e}")
 
     def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
         """Run when LLM starts running."""
@@ -215,6 +245,7 @@ class LangchainCallbackHandler(BaseCallbackHandler):
 
             # Initialize token count for streaming if needed
             self.token_counts[run_id] = 0
+            self.stream_timings[run_id] = [time.perf_counter(), None]
 
             # Log parent relationship for debugging
             if parent_run_id:
@@ -236,6 +267,7 @@ class LangchainCallbackHandler(BaseCallbackHandler):
                 return
 
             span = self.active_spans.get(run_id)
+            completion_tokens = None
 
             if hasattr(response, "generations") and response.generations:
                 completions = []
@@ -254,6 +286,7 @@ class LangchainCallbackHandler(BaseCallbackHandler):
                 token_usage = response.llm_output.get("token_usage", {})
 
                 if "completion_tokens" in token_usage:
+                    completion_tokens = token_usage["completion_tokens"]
                     try:
                         span.set_attribute(SpanAttributes.LLM_USAGE_COMPLETION_TOKENS, token_usage["completion_tokens"])
                     except Exception as e:
@@ -278,6 +311,8 @@ class LangchainCallbackHandler(BaseCallbackHandler):
                 except Exception as e:
                     logger.warning(f"Failed to set streaming tokens: {e}")
 
+            self._record_stream_latency(run_id, span, completed=True, output_tokens=completion_tokens)
+
             # End the span after setting all attributes
             self._end_span(run_id)
 
@@ -489,6 +524,10 @@ class LangchainCallbackHandler(BaseCallbackHandler):
                 logger.warning(f"No span found for token in run {run_id}")
                 return
 
+            timing = self.stream_timings.get(run_id)
+            if timing is not None and timing[1] is None:
+                timing[1] = time.perf_counter()
+
             # Count tokens for later attribution
             if run_id in self.token_counts:
                 self.token_counts[run_id] += 1
@@ -547,6 +586,7 @@ class LangchainCallbackHandler(BaseCallbackHandler):
 
             # Initialize token count for streaming if needed
             self.token_counts[run_id] = 0
+            self.stream_timings[run_id] = [time.perf_counter(), None]
 
             self._create_span("chat_model", SpanKind.LLM, run_id, attributes, parent_run_id)
 
@@ -574,6 +614,8 @@ class LangchainCallbackHandler(BaseCallbackHandler):
             except Exception as e:
                 logger.warning(f"Failed to set error attributes: {e}")
 
+            self._record_stream_latency(run_id, span, completed=False)
+
             # End span with error
             self._end_span(run_id)
 
@@ -0,0 +1,231 @@
+"""
+Bounded buffer for captured print/log output.
+
+Captured lines are grouped into per-trace segments and held in memory up to a
+fixed number of characters. Past that, the oldest lines are either spilled to
+rotating temp files (when a spill budget is configured) or dropped, so the
+memory footprint of print-heavy agents stays predictable.
+"""
+
+import os
+import tempfile
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Deque, List, Optional
+
+from aliyah_sdk.logging.config import logger
+
+
+class _Segment:
+    """Lines captured while one trace (or no trace) was active."""
+
+    __slots__ = ("lines", "size", "spill_files", "spill_size")
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+        self.size = 0
+        # Spill files of this segment, oldest first
+        self.spill_files: List[str] = []
+        self.spill_size = 0
+
+
+class LogRingBuffer:
+    """
+    Fixed-capacity, trace-segmented store for captured output.
+
+    Lines are appended to the segment of the active trace (see `start_segment`).
+    When more than `capacity` characters are held in memory, the oldest lines
+    are moved to temp files of up to `spill_file_size` bytes, or dropped when
+    `spill_max_bytes` is 0. When the spill files exceed `spill_max_bytes`, the
+    oldest file is deleted.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024 * 1024,
+        spill_max_bytes: int = 0,
+        spill_file_size: int = 1024 * 1024,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Characters held in memory across all segments
+            spill_max_bytes: Bytes that may be spilled to temp files; 0 disables spilling
+            spill_file_size: Size at which a segment starts a new spill file
+            spill_dir: Directory for spill files; defaults to a per-process temp directory
+        """
+        self.capacity = capacity
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_file_size = spill_file_size
+        self.spill_dir = spill_dir
+        self._segments: "OrderedDict[Optional[int], _Segment]" = OrderedDict()
+        self._current: Optional[int] = None
+        self._size = 0
+        self._spill_size = 0
+        self._lock = Lock()
+        self.dropped_chars = 0
+
+    def configure(self, capacity: int, spill_max_bytes: int) -> None:
+        with self._lock:
+            self.capacity = capacity
+            self.spill_max_bytes = spill_max_bytes
+            self._enforce_capacity()
+
+    def start_segment(self, trace_id: Optional[int]) -> None:
+        """Attribute lines appended from now on to `trace_id`."""
+        with self._lock:
+            self._current = trace_id
+
+    def end_segment(self, trace_id: int) -> None:
+        """Stop attributing new lines to `trace_id`."""
+        with self._lock:
+            if self._current == trace_id:
+                self._current = None
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            segment = self._segments.get(self._current)
+            if segment is None:
+                segment = self._segments[self._current] = _Segment()
+            segment.lines.append(line)
+            segment.size += len(line)
+            self._size += len(line)
+            if self._size > self.capacity:
+                self._enforce_capacity()
+
+    def size(self) -> int:
+        """Characters buffered in memory plus bytes spilled to disk."""
+        return self._size + self._spill_size
+
+    def drain(self, trace_id: Optional[int] = None) -> str:
+        """
+        Remove and return the output captured for a trace.
+
+        Output captured while no trace was active is included, since it was
+        printed by the process running the trace.
+
+        Args:
+            trace_id: The trace to drain; None drains every segment
+        """
+        with self._lock:
+            if trace_id is None:
+                segments = list(self._segments.values())
+                self._segments.clear()
+            else:
+                segments = [
+                    self._segments.pop(key) for key in (None, trace_id) if key in self._segments
+                ]
+            parts = []
+            for segment in segments:
+                parts.extend(self._read_spill(segment))
+                parts.extend(segment.lines)
+                self._size -= segment.size
+            return "".join(parts)
+
+    def clear(self, delete_spill: bool = True) -> None:
+        """
+        Discard all captured output.
+
+        Args:
+            delete_spill: Delete spill files; a forked child passes False because
+                the files belong to its parent
+        """
+        with self._lock:
+            if delete_spill:
+                for segment in self._segments.values():
+                    for path in segment.spill_files:
+                        self._remove(path)
+            self._segments.clear()
+            self._size = 0
+            self._spill_size = 0
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = Lock()
+        self.clear(delete_spill=False)
+
+    def _enforce_capacity(self) -> None:
+        """Spill or drop the oldest lines until memory use is within capacity. Call with the lock held."""
+        spill_batch: List[str] = []
+        for key in list(self._segments):
+            segment = self._segments[key]
+            while segment.lines and self._size > self.capacity:
+                line = segment.lines.popleft()
+                segment.size -= len(line)
+                self._size -= len(line)
+                if self.spill_max_bytes > 0:
+                    spill_batch.append(line)
+                else:
+                    self._count_drop(len(line))
+            if spill_batch:
+                self._spill(segment, spill_batch)
+                spill_batch = []
+            if self._size <= self.capacity:
+                break
+
+    def _spill(self, segment: _Segment, lines: List[str]) -> None:
+        data = "".join(lines).encode("utf-8")
+        try:
+            if not segment.spill_files or os.path.getsize(segment.spill_files[-1]) >= self.spill_file_size:
+                segment.spill_files.append(self._new_spill_file())
+            with open(segment.spill_files[-1], "ab") as f:
+                f.write(data)
+        except OSError as e:
+            logger.debug(f"[aaliyah.LogRingBuffer] Failed to spill captured output: {e}")
+            self._count_drop(len(data))
+            return
+        segment.spill_size += len(data)
+        self._spill_size += len(data)
+
+        # Rotate out the oldest spill files once the spill budget is exceeded
+        for oldest in list(self._segments.values()):
+            while oldest.spill_files and self._spill_size > self.spill_max_bytes:
+                path = oldest.spill_files.pop(0)
+                size = self._file_size(path)
+                self._remove(path)
+                oldest.spill_size -= size
+                self._spill_size -= size
+                self._count_drop(size)
+            if self._spill_size <= self.spill_max_bytes:
+                break
+
+    def _read_spill(self, segment: _Segment) -> List[str]:
+        parts = []
+        for path in segment.spill_files:
+            try:
+                with open(path, "rb") as f:
+                    parts.append(f.read().decode("utf-8", errors="replace"))
+            except OSError:
+                pass
+            self._remove(path)
+        self._spill_size -= segment.spill_size
+        segment.spill_files = []
+        segment.spill_size = 0
+        return parts
+
+    def _new_spill_file(self) -> str:
+        directory = self.spill_dir or os.path.join(tempfile.gettempdir(), f"aliyah-logs-{os.getpid()}")
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="capture-", suffix=".log", dir=directory)
+        os.close(fd)
+        return path
+
+    def _count_drop(self, size: int) -> None:
+        if not self.dropped_chars:
+            logger.warning("[aaliyah.LogRingBuffer] Captured output exceeds the buffer, dropping the oldest lines")
+        self.dropped_chars += size
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
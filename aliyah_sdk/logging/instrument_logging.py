@@ -1,27 +1,89 @@
 import builtins
 import logging
 import atexit
-from typing import Any
-from io import StringIO
+import os
+import time
+from typing import Any, Optional
+
+from aliyah_sdk.logging.buffer import LogRingBuffer
 
 _original_print = builtins.print
 
 # Global buffer to store logs
-_log_buffer = StringIO()
+_log_buffer = LogRingBuffer()
+# Whether print() output is captured; checked first on every print
+_capture_enabled = False
+_cleanup_registered = False
+
+# asctime of the last formatted second, reused for lines printed within the same second
+_last_second = -1
+_last_second_text = ""
+
+
+class RingBufferHandler(logging.Handler):
+    """Logging handler that appends formatted records to the capture buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            _log_buffer.append(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
 
 
-def setup_print_logger() -> None:
+def _format_line(message: str) -> str:
+    """Format a printed line like the buffer logger's "%(asctime)s - %(levelname)s - %(message)s"."""
+    global _last_second, _last_second_text
+
+    now = time.time()
+    second = int(now)
+    if second != _last_second:
+        _last_second_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _last_second = second
+    return f"{_last_second_text},{int(now * 1000) % 1000:03d} - INFO - {message}\n"
+
+
+def print_logger(*args: Any, **kwargs: Any) -> None:
+    """
+    Custom print function that logs to buffer and console.
+
+    Args:
+        *args: Arguments to print
+        **kwargs: Keyword arguments to print
+    """
+    if _capture_enabled:
+        _log_buffer.append(_format_line(" ".join(str(arg) for arg in args)))
+
+    # print to console using original print
+    _original_print(*args, **kwargs)
+
+
+def setup_print_logger(
+    capture: bool = True,
+    buffer_size: int = 1024 * 1024,
+    spill_max_bytes: int = 0,
+) -> None:
     """
     Instruments the built-in print function and configures logging to use a memory buffer.
     Preserves existing logging configuration and console output behavior.
+
+    Args:
+        capture: Capture output at all. When False print() is left untouched.
+        buffer_size: Characters of captured output held in memory
+        spill_max_bytes: Bytes of older output that may be spilled to temp files; 0 drops it instead
     """
+    global _capture_enabled, _cleanup_registered
+
+    _log_buffer.configure(buffer_size, spill_max_bytes)
+    _capture_enabled = capture
+    if not capture:
+        return
+
     buffer_logger = logging.getLogger("aaliyah_buffer_logger")
     buffer_logger.setLevel(logging.DEBUG)
 
     # Check if the logger already has handlers to prevent duplicates
     if not buffer_logger.handlers:
-        # Create a StreamHandler that writes to our StringIO buffer
-        buffer_handler = logging.StreamHandler(_log_buffer)
+        buffer_handler = RingBufferHandler()
         buffer_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
         buffer_handler.setLevel(logging.DEBUG)
         buffer_logger.addHandler(buffer_handler)
@@ -29,20 +91,6 @@ def setup_print_logger() -> None:
         # Ensure the new logger doesn't propagate to root
         buffer_logger.propagate = False
 
-    def print_logger(*args: Any, **kwargs: Any) -> None:
-        """
-        Custom print function that logs to buffer and console.
-
-        Args:
-            *args: Arguments to print
-            **kwargs: Keyword arguments to print
-        """
-        message = " ".join(str(arg) for arg in args)
-        buffer_logger.info(message)
-
-        # print to console using original print
-        _original_print(*args, **kwargs)
-
     # Only replace print if it hasn't been replaced already
     if builtins.print is _original_print:
         builtins.print = print_logger
@@ -52,6 +100,8 @@ def setup_print_logger() -> None:
         Cleanup function to be called when the process exits.
         Restores the original print function and clears the buffer.
         """
+        global _capture_enabled
+
         try:
             # Remove our buffer handler
             for handler in buffer_logger.handlers[:]:
@@ -59,8 +109,8 @@ def setup_print_logger() -> None:
                 buffer_logger.removeHandler(handler)
 
             # Clear the buffer
-            _log_buffer.seek(0)
-            _log_buffer.truncate()
+            _capture_enabled = False
+            _log_buffer.clear()
 
             # Restore the original print function
             builtins.print = _original_print
@@ -69,23 +119,46 @@ def setup_print_logger() -> None:
             _original_print(f"Error during cleanup: {e}")
 
     # Register the cleanup function to run when the process exits
-    atexit.register(cleanup)
+    if not _cleanup_registered:
+        atexit.register(cleanup)
+        _cleanup_registered = True
+
+
+def _clear_log_buffer_after_fork() -> None:
+    """Drop output captured by the parent so a forked child only uploads its own logs."""
+    _log_buffer._at_fork_reinit()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_log_buffer_after_fork)
+
+
+def start_log_segment(trace_id: Optional[int]) -> None:
+    """Attribute output captured from now on to `trace_id`."""
+    _log_buffer.start_segment(trace_id)
+
+
+def end_log_segment(trace_id: int) -> None:
+    """Stop attributing captured output to `trace_id`."""
+    _log_buffer.end_segment(trace_id)
+
+
+def buffered_log_size() -> int:
+    """Return the amount of captured output waiting to be shipped."""
+    return _log_buffer.size()
+
+
+def drain_log_buffer(trace_id: Optional[int] = None) -> str:
+    """Return the output captured for `trace_id` (or everything) and remove it from the buffer."""
+    return _log_buffer.drain(trace_id)
 
 
 def upload_logfile(trace_id: int) -> None:
     """
-    Upload the log content from the memory buffer to the API.
-    """
-    from aliyah_sdk import get_client
+    Hand the log content captured for a trace to the background log shipper.
 
-    # Get the content from the buffer
-    log_content = _log_buffer.getvalue()
-    if not log_content:
-        return
-
-    client = get_client()
-    client.api.v1.upload_logfile(log_content, trace_id)
+    Returns immediately; the upload happens on the shipper thread.
+    """
+    from aliyah_sdk.logging.shipper import get_log_shipper
 
-    # Clear the buffer after upload
-    _log_buffer.seek(0)
-    _log_buffer.truncate()
+    get_log_shipper().end_trace(trace_id)
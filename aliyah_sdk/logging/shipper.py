@@ -0,0 +1,275 @@
+"""
+Background shipping of captured logs.
+
+Output captured by the print logger is cut into chunks, gzip-compressed and
+uploaded from a daemon thread, tagged with the trace it was captured under.
+Chunks are cut when the buffer reaches a size threshold, when the upload
+interval elapses, and when the trace's root span ends, so long sessions upload
+their logs incrementally instead of in one large request at the end.
+"""
+
+import atexit
+import gzip
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition, Lock, Thread
+from typing import Deque, Optional
+
+from aliyah_sdk.logging.config import logger
+from aliyah_sdk.logging.instrument_logging import (
+    buffered_log_size,
+    drain_log_buffer,
+    end_log_segment,
+    start_log_segment,
+)
+
+
+@dataclass
+class LogChunk:
+    """A compressed piece of captured output waiting to be uploaded."""
+
+    trace_id: int
+    sequence: int
+    body: bytes
+    attempts: int = 0
+    next_attempt: float = 0.0
+
+
+class LogShipper:
+    """
+    Uploads captured logs in compressed chunks from a background thread.
+
+    Failed uploads are retried with jittered exponential backoff. Pending chunks
+    are bounded by `max_pending_bytes`; when the bound is exceeded the oldest
+    chunks are dropped.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 256 * 1024,
+        upload_interval: float = 30.0,
+        max_pending_bytes: int = 16 * 1024 * 1024,
+        max_attempts: int = 5,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ):
+        """
+        Initialize the shipper.
+
+        Args:
+            chunk_size: Buffered characters that trigger a chunk
+            upload_interval: Seconds after which buffered output is shipped regardless of size
+            max_pending_bytes: Upper bound for compressed chunks waiting to be uploaded
+            max_attempts: Uploads attempted per chunk before it is dropped
+            retry_interval: Initial delay between retries, in seconds
+            max_retry_interval: Upper bound for the retry delay, in seconds
+        """
+        self.chunk_size = chunk_size
+        self.upload_interval = upload_interval
+        self.max_pending_bytes = max_pending_bytes
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        self._pending: Deque[LogChunk] = deque()
+        self._pending_bytes = 0
+        self._sequences = {}
+        self._trace_id: Optional[int] = None
+        self._last_cut = time.monotonic()
+        self._uploading = False
+        self._condition = Condition(Lock())
+        self._stopped = False
+        self.dropped_chunks = 0
+
+        self._thread = Thread(target=self._run, name="AaliyahLogShipper", daemon=True)
+        self._thread.start()
+
+    def start_trace(self, trace_id: int) -> None:
+        """Tag output captured from now on with `trace_id`."""
+        start_log_segment(trace_id)
+        with self._condition:
+            self._trace_id = trace_id
+            self._last_cut = time.monotonic()
+
+    def end_trace(self, trace_id: int) -> None:
+        """Ship everything captured for `trace_id` without waiting for the upload."""
+        end_log_segment(trace_id)
+        self._cut(trace_id)
+        with self._condition:
+            if self._trace_id == trace_id:
+                self._trace_id = None
+            self._sequences.pop(trace_id, None)
+            stopped = self._stopped
+            self._condition.notify()
+        if stopped:
+            # Traces ending after shutdown (e.g. from other exit handlers) are uploaded inline
+            self._upload_due()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until pending chunks are uploaded.
+
+        Returns:
+            True if nothing is left to upload
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while self._pending or self._uploading:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Ship buffered output of the active trace and stop the thread."""
+        trace_id = self._trace_id
+        if trace_id is not None:
+            self._cut(trace_id)
+        self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _abandon(self) -> None:
+        """
+        Make a shipper inherited across fork inert.
+
+        Its thread did not survive the fork, and its condition may have been held
+        by another thread of the parent, so the chunks it still holds are left to
+        the parent and `flush` and `shutdown` return immediately.
+        """
+        self._condition = Condition(Lock())
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._uploading = False
+        self._trace_id = None
+        self._stopped = True
+
+    def _cut(self, trace_id: int) -> None:
+        content = drain_log_buffer(trace_id)
+        with self._condition:
+            self._last_cut = time.monotonic()
+        if not content:
+            return
+
+        body = gzip.compress(content.encode("utf-8"))
+        with self._condition:
+            sequence = self._sequences.get(trace_id, 0)
+            self._sequences[trace_id] = sequence + 1
+            self._pending.append(LogChunk(trace_id, sequence, body))
+            self._pending_bytes += len(body)
+            while self._pending_bytes > self.max_pending_bytes and len(self._pending) > 1:
+                self._drop(self._pending.popleft())
+            self._condition.notify()
+
+    def _drop(self, chunk: LogChunk) -> None:
+        """Forget a chunk. Call with the condition held."""
+        self._pending_bytes -= len(chunk.body)
+        if not self.dropped_chunks:
+            logger.warning("[aaliyah.LogShipper] Dropping captured logs that could not be uploaded")
+        self.dropped_chunks += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                self._condition.wait(self._next_wakeup())
+                trace_id = self._trace_id
+                due = time.monotonic() - self._last_cut >= self.upload_interval
+
+            # Cut a chunk for the running trace once it is large or old enough
+            if trace_id is not None and (due or buffered_log_size() >= self.chunk_size):
+                self._cut(trace_id)
+
+            self._upload_due()
+
+    def _next_wakeup(self) -> float:
+        """Seconds until the thread has work. Call with the condition held."""
+        now = time.monotonic()
+        # Poll the buffer size once a second
+        wakeup = 1.0
+        if self._trace_id is not None:
+            wakeup = min(wakeup, max(0.0, self._last_cut + self.upload_interval - now))
+        if self._pending:
+            wakeup = min(wakeup, max(0.0, self._pending[0].next_attempt - now))
+        return wakeup
+
+    def _upload_due(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending or self._pending[0].next_attempt > time.monotonic():
+                    return
+                chunk = self._pending.popleft()
+                self._uploading = True
+
+            success = self._upload(chunk)
+
+            with self._condition:
+                self._uploading = False
+                if success:
+                    self._pending_bytes -= len(chunk.body)
+                elif chunk.attempts >= self.max_attempts:
+                    self._drop(chunk)
+                else:
+                    delay = min(self.max_retry_interval, self.retry_interval * 2 ** (chunk.attempts - 1))
+                    chunk.next_attempt = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                    # Keep ordering within the trace: retry this chunk before later ones
+                    self._pending.appendleft(chunk)
+                self._condition.notify_all()
+                if not success:
+                    return
+
+    def _upload(self, chunk: LogChunk) -> bool:
+        from aliyah_sdk import get_client
+
+        chunk.attempts += 1
+        try:
+            client = get_client()
+            if client is None or getattr(client, "api", None) is None:
+                return False
+            client.api.v1.upload_logfile(chunk.body, chunk.trace_id, compressed=True, sequence=chunk.sequence)
+            return True
+        except Exception as e:
+            logger.debug(f"[aaliyah.LogShipper] Log upload failed (attempt {chunk.attempts}): {e}")
+            return False
+
+
+_shipper: Optional[LogShipper] = None
+_shipper_lock = Lock()
+
+
+def get_log_shipper() -> LogShipper:
+    """Return the process-wide log shipper, starting it on first use."""
+    global _shipper
+    if _shipper is None:
+        with _shipper_lock:
+            if _shipper is None:
+                from aliyah_sdk.config import Config
+
+                _shipper = LogShipper(
+                    chunk_size=Config.LOG_CHUNK_SIZE,
+                    upload_interval=Config.LOG_UPLOAD_INTERVAL,
+                )
+                atexit.register(_shipper.shutdown)
+    return _shipper
+
+
+def _reset_log_shipper_after_fork() -> None:
+    """The shipper thread does not survive fork; the child starts its own on first use."""
+    global _shipper, _shipper_lock
+    if _shipper is not None:
+        # The parent's exit handler would wait on chunks the child can never upload
+        atexit.unregister(_shipper.shutdown)
+        _shipper._abandon()
+    _shipper = None
+    _shipper_lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_log_shipper_after_fork)
@@ -1,39 +1,46 @@
 from __future__ import annotations
 
 import atexit
+import importlib
+import json
+import tempfile
 import threading
 import platform
+import socket
 import sys
 import os
 import time
 import psutil
-from typing import Optional
+from concurrent.futures import Future
+from typing import Dict, Optional, Union
 
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry import context as context_api
-import requests
-
 
+from aliyah_sdk.client.http.transport import METRICS, TRACES, HttpTransport
 from aliyah_sdk.config import Config
 from aliyah_sdk.exceptions import AaliyahClientNotInitializedException
 from aliyah_sdk.logging import logger, setup_print_logger
-from aliyah_sdk.sdk.processors import InternalSpanProcessor
+from aliyah_sdk.logging.shipper import get_log_shipper
+from aliyah_sdk.sdk.exporters import ResilientOTLPMetricExporter, ResilientOTLPSpanExporter
+from aliyah_sdk.sdk.processors import AdaptiveBatchSpanProcessor, DetectedResourceProcessor, InternalSpanProcessor
+from aliyah_sdk.sdk.sampling import AaliyahSampler, SampleRate, TailSamplingProcessor
+from aliyah_sdk.sdk.sidecar import SidecarSpanExporter, default_socket_path
+from aliyah_sdk.sdk.spool import DEFAULT_SPOOL_DIR, SpanSpool, SpoolingSpanExporter
 from aliyah_sdk.sdk.types import TracingConfig
 from aliyah_sdk.semconv import ResourceAttributes
 
 # No need to create shortcuts since we're using our own ResourceAttributes class now
 
-class ShutdownMonitoringProcessor(BatchSpanProcessor):
+class ShutdownMonitoringProcessor(AdaptiveBatchSpanProcessor):
     """
     Custom span processor that monitors HTTP responses for shutdown signals.
-    This wraps the existing OTLP exporter to intercept responses.
+    Trace export responses are observed through a response hook on the shared HTTP transport.
     """
     
     def __init__(self, span_exporter, **kwargs):
@@ -44,64 +51,23 @@ class ShutdownMonitoringProcessor(BatchSpanProcessor):
             
             # Store reference to the exporter
             self.span_exporter = span_exporter
-            self._original_export = span_exporter.export
-            
-            # Wrap the exporter's export method
-            span_exporter.export = self._export_with_monitoring
+            HttpTransport.add_response_hook(self._check_response_for_shutdown, channel=TRACES)
             
             logger.debug("ShutdownMonitoringProcessor initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing ShutdownMonitoringProcessor: {e}")
             raise
-    
-    def _export_with_monitoring(self, spans):
-        """Export spans and monitor response for shutdown signals"""
-        try:
-            # Call the original export method
-            result = self._original_export(spans)
-            
-            # Try to access the HTTP response if available
-            # This is a bit hacky but works with the current OTLP exporter structure
-            if hasattr(self.span_exporter, '_session'):
-                session = self.span_exporter._session
-                
-                # Check if there's a recent response
-                if hasattr(session, 'last_response') and session.last_response:
-                    response = session.last_response
-                    self._check_response_for_shutdown(response)
-                
-                # Alternative: monkey patch the session to capture responses
-                elif not hasattr(session, '_shutdown_monitoring_patched'):
-                    self._patch_session_for_monitoring(session)
-            
-            return result
-            
-        except Exception as e:
-            logger.debug(f"Error in shutdown monitoring: {e}")
-            return self._original_export(spans)
-    
-    def _patch_session_for_monitoring(self, session):
-        """Patch the requests session to capture responses"""
-        try:
-            original_request = session.request
-            
-            def monitored_request(*args, **kwargs):
-                response = original_request(*args, **kwargs)
-                session.last_response = response
-                self._check_response_for_shutdown(response)
-                return response
-            
-            session.request = monitored_request
-            session._shutdown_monitoring_patched = True
-            
-        except Exception as e:
-            logger.debug(f"Error patching session: {e}")
+
+    def shutdown(self) -> None:
+        HttpTransport.remove_response_hook(self._check_response_for_shutdown)
+        super().shutdown()
     
     def _check_response_for_shutdown(self, response):
         """Check HTTP response for shutdown signals"""
         try:
-            if not hasattr(response, 'headers'):
+            # Processors inherited by a forked child no longer export
+            if self.done or not hasattr(response, 'headers'):
                 return
                 
             agent_status = response.headers.get('X-Agent-Status', '').lower()
@@ -198,14 +164,14 @@ def get_imported_libraries():
     return user_libs
 
 
-def get_system_stats():
+def get_host_info():
     """
-    Get basic system stats including CPU and memory information.
+    Get host attributes that do not change while the host is up.
 
     Returns:
-        dict: Dictionary with system information
+        dict: Dictionary with host information
     """
-    system_info = {
+    host_info = {
         ResourceAttributes.HOST_MACHINE: platform.machine(),
         ResourceAttributes.HOST_NAME: platform.node(),
         ResourceAttributes.HOST_NODE: platform.node(),
@@ -213,26 +179,305 @@ def get_system_stats():
         ResourceAttributes.HOST_SYSTEM: platform.system(),
         ResourceAttributes.HOST_VERSION: platform.version(),
         ResourceAttributes.HOST_OS_RELEASE: platform.release(),
+        ResourceAttributes.CPU_COUNT: os.cpu_count() or 0,
     }
 
-    # Add CPU stats
     try:
-        system_info[ResourceAttributes.CPU_COUNT] = os.cpu_count() or 0
-        system_info[ResourceAttributes.CPU_PERCENT] = psutil.cpu_percent(interval=0.1)
+        host_info[ResourceAttributes.MEMORY_TOTAL] = psutil.virtual_memory().total
+    except Exception as e:
+        logger.debug(f"Error getting memory stats: {e}")
+
+    return host_info
+
+
+def get_usage_stats(cpu_interval: float = 0.1):
+    """
+    Get current CPU and memory usage.
+
+    Blocks for `cpu_interval` seconds to measure CPU usage, so call it off the
+    caller's thread.
+
+    Returns:
+        dict: Dictionary with usage information
+    """
+    usage = {}
+    try:
+        usage[ResourceAttributes.CPU_PERCENT] = psutil.cpu_percent(interval=cpu_interval)
     except Exception as e:
         logger.debug(f"Error getting CPU stats: {e}")
 
-    # Add memory stats
     try:
         memory = psutil.virtual_memory()
-        system_info[ResourceAttributes.MEMORY_TOTAL] = memory.total
-        system_info[ResourceAttributes.MEMORY_AVAILABLE] = memory.available
-        system_info[ResourceAttributes.MEMORY_USED] = memory.used
-        system_info[ResourceAttributes.MEMORY_PERCENT] = memory.percent
+        usage[ResourceAttributes.MEMORY_AVAILABLE] = memory.available
+        usage[ResourceAttributes.MEMORY_USED] = memory.used
+        usage[ResourceAttributes.MEMORY_PERCENT] = memory.percent
     except Exception as e:
         logger.debug(f"Error getting memory stats: {e}")
 
-    return system_info
+    return usage
+
+
+def get_system_stats():
+    """
+    Get basic system stats including CPU and memory information.
+
+    Returns:
+        dict: Dictionary with system information
+    """
+    return {**get_host_info(), **get_usage_stats()}
+
+
+def _host_info_cache_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f"aliyah-host-info-{os.getuid() if hasattr(os, 'getuid') else 0}.json")
+
+
+def load_host_info(cache_ttl: int = Config.RESOURCE_CACHE_TTL):
+    """
+    Get host attributes, reusing the values cached by an earlier process on this host.
+
+    Args:
+        cache_ttl: Seconds a cached entry stays valid; 0 disables the cache
+
+    Returns:
+        dict: Dictionary with host information
+    """
+    if cache_ttl <= 0:
+        return get_host_info()
+
+    path = _host_info_cache_path()
+    host = platform.node()
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached.get("host") == host and time.time() - cached.get("created", 0) < cache_ttl:
+            return cached["attributes"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    host_info = get_host_info()
+    try:
+        # Written to a temp file and renamed so concurrent processes never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump({"host": host, "created": time.time(), "attributes": host_info}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not cache host info: {e}")
+    return host_info
+
+
+def _detect_resource_in_background(processor: DetectedResourceProcessor) -> threading.Thread:
+    """Collect usage stats and imported libraries off the caller's thread and hand them to `processor`."""
+
+    def detect():
+        attributes = {}
+        try:
+            attributes = get_usage_stats()
+            attributes[ResourceAttributes.IMPORTED_LIBRARIES] = get_imported_libraries()
+            # Validated like resource attributes, e.g. sequences of mixed types are dropped
+            attributes = dict(Resource(attributes).attributes)
+            logger.debug("Resource detection finished")
+        except Exception as e:
+            logger.debug(f"Resource detection failed: {e}")
+        # Also on failure, so root spans stop waiting for the attributes
+        processor.set_detected_attributes(attributes)
+
+    thread = threading.Thread(target=detect, name="AaliyahResourceDetection", daemon=True)
+    thread.start()
+    return thread
+
+
+def _create_span_exporter(
+    exporter_endpoint: str,
+    jwt: Optional[str] = None,
+    spool_enabled: bool = False,
+    spool_dir: Optional[str] = None,
+    spool_max_bytes: int = Config.SPOOL_MAX_BYTES,
+    spool_max_age: int = Config.SPOOL_MAX_AGE,
+    export_mode: str = Config.EXPORT_MODE,
+    sidecar_socket: Optional[str] = None,
+    max_queue_size: int = Config.MAX_QUEUE_SIZE,
+    export_flush_interval: int = Config.EXPORT_FLUSH_INTERVAL,
+):
+    """
+    Create the span exporter for the configured export mode.
+
+    Returns:
+        A SidecarSpanExporter in sidecar mode (where Unix sockets are available),
+        otherwise the OTLP exporter, wrapped in a SpoolingSpanExporter when spooling
+        is enabled
+    """
+    if export_mode == "sidecar" and not hasattr(socket, "AF_UNIX"):
+        logger.warning("Sidecar export mode needs Unix sockets, which this platform lacks; exporting in-process")
+        export_mode = "inprocess"
+
+    if export_mode == "sidecar":
+        if spool_enabled:
+            logger.warning("Span spooling is not supported in sidecar export mode; ignoring spool_enabled")
+        return SidecarSpanExporter(
+            exporter_endpoint,
+            sidecar_socket or default_socket_path(),
+            jwt=jwt,
+            max_queue_size=max_queue_size,
+            export_flush_interval=export_flush_interval,
+        )
+
+    exporter = ResilientOTLPSpanExporter(
+        endpoint=exporter_endpoint,
+        headers={"X-API-Key": jwt} if jwt else {},
+        session=HttpTransport.create_session(TRACES),
+    )
+    if not spool_enabled:
+        return exporter
+
+    try:
+        spool = SpanSpool(
+            directory=spool_dir or DEFAULT_SPOOL_DIR,
+            max_bytes=spool_max_bytes,
+            max_age_seconds=spool_max_age,
+        )
+        logger.debug(f"Spooling spans to {spool.directory}")
+        return SpoolingSpanExporter(exporter, spool)
+    except OSError as e:
+        logger.warning(f"Could not open span spool, exporting directly: {e}")
+        return exporter
+
+
+def _create_span_processors(
+    exporter_endpoint: str,
+    jwt: Optional[str] = None,
+    max_queue_size: int = Config.MAX_QUEUE_SIZE,
+    export_flush_interval: int = Config.EXPORT_FLUSH_INTERVAL,
+    max_wait_time: int = Config.MAX_WAIT_TIME,
+    max_export_batch_size: int = Config.MAX_EXPORT_BATCH_SIZE,
+    min_export_batch_size: int = Config.MIN_EXPORT_BATCH_SIZE,
+    reserved_queue_size: int = Config.RESERVED_QUEUE_SIZE,
+    spool_enabled: bool = Config.SPOOL_ENABLED,
+    spool_dir: Optional[str] = Config.SPOOL_DIR,
+    spool_max_bytes: int = Config.SPOOL_MAX_BYTES,
+    spool_max_age: int = Config.SPOOL_MAX_AGE,
+    export_mode: str = Config.EXPORT_MODE,
+    sidecar_socket: Optional[str] = None,
+    tail_sampling: bool = Config.TAIL_SAMPLING,
+    tail_sample_rate: float = Config.TAIL_SAMPLE_RATE,
+    tail_latency_threshold: int = Config.TAIL_LATENCY_THRESHOLD,
+) -> list[SpanProcessor]:
+    """
+    Create the span processors that export spans to the backend.
+
+    Returns:
+        The export processor, wrapped in a TailSamplingProcessor when tail sampling
+        is enabled, followed by the InternalSpanProcessor
+    """
+    processors = _create_export_processors(
+        exporter_endpoint,
+        jwt=jwt,
+        max_queue_size=max_queue_size,
+        export_flush_interval=export_flush_interval,
+        max_wait_time=max_wait_time,
+        max_export_batch_size=max_export_batch_size,
+        min_export_batch_size=min_export_batch_size,
+        reserved_queue_size=reserved_queue_size,
+        spool_enabled=spool_enabled,
+        spool_dir=spool_dir,
+        spool_max_bytes=spool_max_bytes,
+        spool_max_age=spool_max_age,
+        export_mode=export_mode,
+        sidecar_socket=sidecar_socket,
+    )
+    if tail_sampling:
+        processors[0] = TailSamplingProcessor(
+            processors[0],
+            sample_rate=tail_sample_rate,
+            latency_threshold_millis=tail_latency_threshold,
+        )
+    return processors
+
+
+def _create_export_processors(
+    exporter_endpoint: str,
+    jwt: Optional[str] = None,
+    max_queue_size: int = Config.MAX_QUEUE_SIZE,
+    export_flush_interval: int = Config.EXPORT_FLUSH_INTERVAL,
+    max_wait_time: int = Config.MAX_WAIT_TIME,
+    max_export_batch_size: int = Config.MAX_EXPORT_BATCH_SIZE,
+    min_export_batch_size: int = Config.MIN_EXPORT_BATCH_SIZE,
+    reserved_queue_size: int = Config.RESERVED_QUEUE_SIZE,
+    spool_enabled: bool = Config.SPOOL_ENABLED,
+    spool_dir: Optional[str] = Config.SPOOL_DIR,
+    spool_max_bytes: int = Config.SPOOL_MAX_BYTES,
+    spool_max_age: int = Config.SPOOL_MAX_AGE,
+    export_mode: str = Config.EXPORT_MODE,
+    sidecar_socket: Optional[str] = None,
+) -> list[SpanProcessor]:
+    try:
+        # Use regular OTLP exporter
+        logger.debug(f"Creating OTLP exporter for endpoint: {exporter_endpoint}")
+        exporter = _create_span_exporter(
+            exporter_endpoint,
+            jwt=jwt,
+            spool_enabled=spool_enabled,
+            spool_dir=spool_dir,
+            spool_max_bytes=spool_max_bytes,
+            spool_max_age=spool_max_age,
+            export_mode=export_mode,
+            sidecar_socket=sidecar_socket,
+            max_queue_size=max_queue_size,
+            export_flush_interval=export_flush_interval,
+        )
+        logger.debug("OTLP exporter created successfully")
+
+        # Use enhanced processor that monitors responses
+        logger.debug("Creating ShutdownMonitoringProcessor...")
+        processor = ShutdownMonitoringProcessor(
+            exporter,
+            max_queue_size=max_queue_size,
+            max_export_batch_size=max_export_batch_size,
+            min_export_batch_size=min_export_batch_size,
+            reserved_queue_size=reserved_queue_size,
+            schedule_delay_millis=export_flush_interval,
+            max_schedule_delay_millis=max_wait_time,
+        )
+        logger.debug("ShutdownMonitoringProcessor created successfully")
+        
+        return [processor, InternalSpanProcessor()]
+
+    except Exception as e:
+        logger.error(f"Error setting up shutdown monitoring processor: {e}")
+        # Fallback to regular processor if monitoring fails
+        logger.warning("Falling back to AdaptiveBatchSpanProcessor without shutdown monitoring")
+        
+        exporter = _create_span_exporter(
+            exporter_endpoint,
+            jwt=jwt,
+            spool_enabled=spool_enabled,
+            spool_dir=spool_dir,
+            spool_max_bytes=spool_max_bytes,
+            spool_max_age=spool_max_age,
+            export_mode=export_mode,
+            sidecar_socket=sidecar_socket,
+            max_queue_size=max_queue_size,
+            export_flush_interval=export_flush_interval,
+        )
+        
+        processor = AdaptiveBatchSpanProcessor(
+            exporter,
+            max_queue_size=max_queue_size,
+            max_export_batch_size=max_export_batch_size,
+            min_export_batch_size=min_export_batch_size,
+            reserved_queue_size=reserved_queue_size,
+            schedule_delay_millis=export_flush_interval,
+            max_schedule_delay_millis=max_wait_time,
+        )
+        return [processor, InternalSpanProcessor()]
+
+
+def _reset_exporter_session(exporter, channel: str) -> None:
+    """Give an OTLP exporter a new HTTP session so it stops sharing sockets with a parent process."""
+    session = getattr(exporter, "_session", None)
+    if session is None:
+        return
+    exporter._session = HttpTransport.create_session(channel, headers=session.headers)
 
 
 def setup_telemetry(
@@ -243,9 +488,27 @@ def setup_telemetry(
     max_queue_size: int = Config.MAX_QUEUE_SIZE,
     max_wait_time: int = Config.MAX_WAIT_TIME, 
     export_flush_interval: int = Config.EXPORT_FLUSH_INTERVAL,
+    max_export_batch_size: int = Config.MAX_EXPORT_BATCH_SIZE,
+    min_export_batch_size: int = Config.MIN_EXPORT_BATCH_SIZE,
+    reserved_queue_size: int = Config.RESERVED_QUEUE_SIZE,
     jwt: Optional[str] = None,
     agent_id: Optional[int] = None,     # ADD THIS
     agent_name: Optional[str] = None,   # ADD THIS
+    spool_enabled: bool = Config.SPOOL_ENABLED,
+    spool_dir: Optional[str] = Config.SPOOL_DIR,
+    spool_max_bytes: int = Config.SPOOL_MAX_BYTES,
+    spool_max_age: int = Config.SPOOL_MAX_AGE,
+    export_mode: str = Config.EXPORT_MODE,
+    sidecar_socket: Optional[str] = None,
+    capture_logs: bool = Config.CAPTURE_LOGS,
+    log_buffer_size: int = Config.LOG_BUFFER_SIZE,
+    log_spill_max_bytes: int = Config.LOG_SPILL_MAX_BYTES,
+    resource_cache_ttl: int = Config.RESOURCE_CACHE_TTL,
+    sample_rate: SampleRate = Config.SAMPLE_RATE,
+    sampling_rules: Optional[Union[str, dict]] = Config.SAMPLING_RULES,
+    tail_sampling: bool = Config.TAIL_SAMPLING,
+    tail_sample_rate: float = Config.TAIL_SAMPLE_RATE,
+    tail_latency_threshold: int = Config.TAIL_LATENCY_THRESHOLD,
 ) -> tuple[TracerProvider, MeterProvider]:
     """Setup telemetry with enhanced monitoring"""
     
@@ -259,72 +522,59 @@ def setup_telemetry(
     if agent_id is not None:
         resource_attrs["agent.id"] = str(agent_id)
         logger.debug(f"Including agent_id in resource attributes: {agent_id}")
-        print(f"DEBUG setup_telemetry: Adding agent.id to resource: {agent_id}")
 
     if agent_name:
         resource_attrs["agent.name"] = agent_name
         logger.debug(f"Including agent_name in resource attributes: {agent_name}")
-        print(f"DEBUG setup_telemetry: Adding agent.name to resource: {agent_name}")
 
-    # Add system information
-    system_stats = get_system_stats()
-    resource_attrs.update(system_stats)
-
-    # Add imported libraries
-    imported_libraries = get_imported_libraries()
-    resource_attrs[ResourceAttributes.IMPORTED_LIBRARIES] = imported_libraries
+    # Add host information; usage stats and imported libraries are set on root spans
+    # once background detection finishes, so init never waits on them
+    resource_attrs.update(load_host_info(resource_cache_ttl))
 
     resource = Resource(resource_attrs)
-    provider = TracerProvider(resource=resource)
+    sampler = AaliyahSampler(sample_rate, rules=sampling_rules, agent_id=agent_id)
+    provider = TracerProvider(resource=resource, sampler=sampler)
     trace.set_tracer_provider(provider)
 
-    try:
-        # Use regular OTLP exporter
-        logger.debug(f"Creating OTLP exporter for endpoint: {exporter_endpoint}")
-        exporter = OTLPSpanExporter(
-            endpoint=exporter_endpoint, 
-            headers={"X-API-Key": jwt} if jwt else {}
-        )
-        logger.debug("OTLP exporter created successfully")
-
-        # Use enhanced processor that monitors responses
-        logger.debug("Creating ShutdownMonitoringProcessor...")
-        processor = ShutdownMonitoringProcessor(
-            exporter,
-            max_export_batch_size=max_queue_size,
-            schedule_delay_millis=export_flush_interval,
-        )
-        logger.debug("ShutdownMonitoringProcessor created successfully")
-        
+    detected_resource = DetectedResourceProcessor()
+    provider.add_span_processor(detected_resource)
+    _detect_resource_in_background(detected_resource)
+
+    for processor in _create_span_processors(
+        exporter_endpoint,
+        jwt=jwt,
+        max_queue_size=max_queue_size,
+        export_flush_interval=export_flush_interval,
+        max_wait_time=max_wait_time,
+        max_export_batch_size=max_export_batch_size,
+        min_export_batch_size=min_export_batch_size,
+        reserved_queue_size=reserved_queue_size,
+        spool_enabled=spool_enabled,
+        spool_dir=spool_dir,
+        spool_max_bytes=spool_max_bytes,
+        spool_max_age=spool_max_age,
+        export_mode=export_mode,
+        sidecar_socket=sidecar_socket,
+        tail_sampling=tail_sampling,
+        tail_sample_rate=tail_sample_rate,
+        tail_latency_threshold=tail_latency_threshold,
+    ):
         provider.add_span_processor(processor)
-        provider.add_span_processor(InternalSpanProcessor())
-        
-    except Exception as e:
-        logger.error(f"Error setting up shutdown monitoring processor: {e}")
-        # Fallback to regular processor if monitoring fails
-        logger.warning("Falling back to regular BatchSpanProcessor without shutdown monitoring")
-        
-        exporter = OTLPSpanExporter(
-            endpoint=exporter_endpoint, 
-            headers={"X-API-Key": jwt} if jwt else {}
-        )
-        
-        processor = BatchSpanProcessor(
-            exporter,
-            max_export_batch_size=max_queue_size,
-            schedule_delay_millis=export_flush_interval,
-        )
-        provider.add_span_processor(processor)
-        provider.add_span_processor(InternalSpanProcessor())
 
     # Setup metrics (regular OTLP exporter)
     metric_reader = PeriodicExportingMetricReader(
-        OTLPMetricExporter(endpoint=metrics_endpoint, headers={"X-API-Key": jwt} if jwt else {})
+        ResilientOTLPMetricExporter(
+            endpoint=metrics_endpoint,
+            headers={"X-API-Key": jwt} if jwt else {},
+            session=HttpTransport.create_session(METRICS),
+        )
     )
     meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
     metrics.set_meter_provider(meter_provider)
 
-    setup_print_logger()
+    setup_print_logger(capture=capture_logs, buffer_size=log_buffer_size, spill_max_bytes=log_spill_max_bytes)
+    # Start the log shipper now so its exit handler runs after the client's session cleanup
+    get_log_shipper()
     context_api.get_current()
     logger.debug("Telemetry system initialized with shutdown monitoring")
 
@@ -354,15 +604,17 @@ class TracingCore:
 
     def __init__(self):
         """Initialize the tracing core."""
-        print("DEBUG TracingCore.__init__: Start") # Debug print
         self._provider = None
         self._meter_provider = None # Also store meter provider
         self._initialized = False
         self._config: Optional[Config] = None # Store the Config *instance*
+        self._processor_kwargs: dict = {}
+        self._inherited_processors: list = []
+        # Tracers by name; creating one per span is comparatively expensive
+        self._tracers: Dict[str, trace.Tracer] = {}
 
         # Don't register atexit here, Client does it once for shutdown()
         # atexit.register(self.shutdown)
-        print("DEBUG TracingCore.__init__: Finish") # Debug print
 
 
     def initialize(self, config_instance: Config, jwt: Optional[str] = None, project_id: Optional[str] = None, agent_id: Optional[int] = None, agent_name: Optional[str] = None):
@@ -379,12 +631,6 @@ class TracingCore:
          
                 return
 
-           
-            if hasattr(config_instance, 'api_key'):
-                print(f"DEBUG TracingCore.initialize: config_instance.api_key type: {type(config_instance.api_key)}")
-            
-            if hasattr(config_instance, 'exporter_endpoint'):
-                print(f"DEBUG TracingCore.initialize: config_instance.exporter_endpoint: '{config_instance.exporter_endpoint}'")
 
             self._config = config_instance
 
@@ -395,7 +641,47 @@ class TracingCore:
             max_queue_size = getattr(config_instance, 'max_queue_size', Config.MAX_QUEUE_SIZE)
             max_wait_time = getattr(config_instance, 'max_wait_time', Config.MAX_WAIT_TIME)
             export_flush_interval = getattr(config_instance, 'export_flush_interval', Config.EXPORT_FLUSH_INTERVAL)
-
+            max_export_batch_size = getattr(config_instance, 'max_export_batch_size', Config.MAX_EXPORT_BATCH_SIZE)
+            min_export_batch_size = getattr(config_instance, 'min_export_batch_size', Config.MIN_EXPORT_BATCH_SIZE)
+            reserved_queue_size = getattr(config_instance, 'reserved_queue_size', Config.RESERVED_QUEUE_SIZE)
+            spool_enabled = getattr(config_instance, 'spool_enabled', Config.SPOOL_ENABLED)
+            spool_dir = getattr(config_instance, 'spool_dir', Config.SPOOL_DIR)
+            spool_max_bytes = getattr(config_instance, 'spool_max_bytes', Config.SPOOL_MAX_BYTES)
+            spool_max_age = getattr(config_instance, 'spool_max_age', Config.SPOOL_MAX_AGE)
+            export_mode = getattr(config_instance, 'export_mode', Config.EXPORT_MODE)
+            # Resolved once so forked workers reuse the sidecar started by this process
+            sidecar_socket = getattr(config_instance, 'sidecar_socket', None) or default_socket_path()
+            capture_logs = getattr(config_instance, 'capture_logs', Config.CAPTURE_LOGS)
+            log_buffer_size = getattr(config_instance, 'log_buffer_size', Config.LOG_BUFFER_SIZE)
+            log_spill_max_bytes = getattr(config_instance, 'log_spill_max_bytes', Config.LOG_SPILL_MAX_BYTES)
+            resource_cache_ttl = getattr(config_instance, 'resource_cache_ttl', Config.RESOURCE_CACHE_TTL)
+            sample_rate = getattr(config_instance, 'sample_rate', Config.SAMPLE_RATE)
+            sampling_rules = getattr(config_instance, 'sampling_rules', Config.SAMPLING_RULES)
+            tail_sampling = getattr(config_instance, 'tail_sampling', Config.TAIL_SAMPLING)
+            tail_sample_rate = getattr(config_instance, 'tail_sample_rate', Config.TAIL_SAMPLE_RATE)
+            tail_latency_threshold = getattr(config_instance, 'tail_latency_threshold', Config.TAIL_LATENCY_THRESHOLD)
+
+
+            # Kept so export processors can be rebuilt in forked child processes
+            self._processor_kwargs = dict(
+                exporter_endpoint=exporter_endpoint,
+                jwt=jwt,
+                max_queue_size=max_queue_size,
+                export_flush_interval=export_flush_interval,
+                max_wait_time=max_wait_time,
+                max_export_batch_size=max_export_batch_size,
+                min_export_batch_size=min_export_batch_size,
+                reserved_queue_size=reserved_queue_size,
+                spool_enabled=spool_enabled,
+                spool_dir=spool_dir,
+                spool_max_bytes=spool_max_bytes,
+                spool_max_age=spool_max_age,
+                export_mode=export_mode,
+                sidecar_socket=sidecar_socket,
+                tail_sampling=tail_sampling,
+                tail_sample_rate=tail_sample_rate,
+                tail_latency_threshold=tail_latency_threshold,
+            )
 
             self._provider, self._meter_provider = setup_telemetry(
                 service_name=service_name,
@@ -405,9 +691,27 @@ class TracingCore:
                 max_queue_size=max_queue_size,
                 max_wait_time=max_wait_time,
                 export_flush_interval=export_flush_interval,
+                max_export_batch_size=max_export_batch_size,
+                min_export_batch_size=min_export_batch_size,
+                reserved_queue_size=reserved_queue_size,
                 jwt=jwt,
                 agent_id=agent_id,
-                agent_name=agent_name
+                agent_name=agent_name,
+                spool_enabled=spool_enabled,
+                spool_dir=spool_dir,
+                spool_max_bytes=spool_max_bytes,
+                spool_max_age=spool_max_age,
+                export_mode=export_mode,
+                sidecar_socket=sidecar_socket,
+                capture_logs=capture_logs,
+                log_buffer_size=log_buffer_size,
+                log_spill_max_bytes=log_spill_max_bytes,
+                resource_cache_ttl=resource_cache_ttl,
+                sample_rate=sample_rate,
+                sampling_rules=sampling_rules,
+                tail_sampling=tail_sampling,
+                tail_sample_rate=tail_sample_rate,
+                tail_latency_threshold=tail_latency_threshold,
             )
 
             # 🔥 NEW: Enable instrumentors if instrument_llm_calls is True
@@ -415,64 +719,150 @@ class TracingCore:
                 
                 self._enable_llm_instrumentors()
             else:
-                print("DEBUG TracingCore.initialize: instrument_llm_calls=False, skipping instrumentors")
+                logger.debug("instrument_llm_calls=False, skipping instrumentors")
 
             self._initialized = True
             
 
     def _enable_llm_instrumentors(self):
-        """Enable LLM framework instrumentors when instrument_llm_calls=True."""
-        
-        # List of instrumentors to try enabling (order matters - Karo first for smart detection)
+        """
+        Enable LLM framework instrumentors when instrument_llm_calls=True.
+
+        Nothing is imported here: each instrumentor is applied when the application
+        first imports the library it patches, so unused provider SDKs are never loaded.
+        """
+        from aliyah_sdk.instrumentation.import_hook import is_available, when_imported
+
+        # Instrumentors to enable, with the module whose import activates them
+        # (order matters - Karo first for smart detection)
         instrumentors_to_enable = [
             # Karo framework instrumentor (highest priority - provides smart provider detection)
-            ("aliyah_sdk.instrumentation.karo", "KaroInstrumentor"),
+            ("aliyah_sdk.instrumentation.karo", "KaroInstrumentor", "karo"),
             # Direct LLM provider instrumentors (fallback for non-Karo usage)
-            ("opentelemetry.instrumentation.openai", "OpenAIInstrumentor"),
-            ("opentelemetry.instrumentation.anthropic", "AnthropicInstrumentor"),
-            ("opentelemetry.instrumentation.google_generativeai", "GoogleGenerativeAIInstrumentor"),
+            ("opentelemetry.instrumentation.openai", "OpenAIInstrumentor", "openai"),
+            ("opentelemetry.instrumentation.anthropic", "AnthropicInstrumentor", "anthropic"),
+            ("opentelemetry.instrumentation.google_generativeai", "GoogleGenerativeAIInstrumentor", "google.genai"),
         ]
-        
-        enabled_count = 0
-        
-        for module_name, class_name in instrumentors_to_enable:
-            try:
-                # Dynamic import of the instrumentor
-                module = __import__(module_name, fromlist=[class_name])
-                instrumentor_class = getattr(module, class_name)
-                instrumentor = instrumentor_class()
-                
-                # Check if already instrumented
-                if not instrumentor.is_instrumented_by_opentelemetry:
-                    instrumentor.instrument(
-                        tracer_provider=self._provider,
-                        meter_provider=self._meter_provider
-                    )
-                    provider_name = class_name.replace("Instrumentor", "")
-                    
-                    logger.debug(f"Successfully enabled {provider_name} instrumentor")
-                    enabled_count += 1
-                else:
-                    provider_name = class_name.replace("Instrumentor", "")
-                    
-                    logger.debug(f"{provider_name} instrumentor was already enabled")
-                    
-            except ImportError:
-                provider_name = class_name.replace("Instrumentor", "")
-                
+
+        watched_count = 0
+
+        for module_name, class_name, library_name in instrumentors_to_enable:
+            provider_name = class_name.replace("Instrumentor", "")
+            if not is_available(module_name):
                 logger.debug(f"{provider_name} instrumentation package not found")
-            except Exception as e:
-                provider_name = class_name.replace("Instrumentor", "")
-                
-                logger.warning(f"Failed to enable {provider_name} instrumentation: {e}")
-        
-        if enabled_count > 0:
-            
-            logger.info(f"Successfully enabled {enabled_count} LLM instrumentors")
-        else:
+                continue
+            if not is_available(library_name):
+                logger.debug(f"{library_name} is not installed; skipping {provider_name} instrumentation")
+                continue
+
+            when_imported(
+                library_name,
+                lambda _module, module_name=module_name, class_name=class_name: self._enable_instrumentor(
+                    module_name, class_name
+                ),
+            )
+            watched_count += 1
 
+        if watched_count > 0:
+            logger.info(f"Enabled {watched_count} LLM instrumentors")
+        else:
             logger.warning("No LLM instrumentors were enabled - check package installations")
 
+    def _enable_instrumentor(self, module_name: str, class_name: str) -> None:
+        """Import and apply one instrumentor. Runs once the library it patches is imported."""
+        provider_name = class_name.replace("Instrumentor", "")
+        try:
+            module = importlib.import_module(module_name)
+            instrumentor = getattr(module, class_name)()
+
+            # Check if already instrumented
+            if instrumentor.is_instrumented_by_opentelemetry:
+                logger.debug(f"{provider_name} instrumentor was already enabled")
+                return
+
+            instrumentor.instrument(
+                tracer_provider=self._provider,
+                meter_provider=self._meter_provider
+            )
+            logger.debug(f"Successfully enabled {provider_name} instrumentor")
+        except Exception as e:
+            logger.warning(f"Failed to enable {provider_name} instrumentation: {e}")
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Rebuild export state in a forked child process.
+
+        Only the forking thread survives os.fork(), so the parent's export threads are dead
+        in the child and its HTTP connections are shared with the parent. The tracer provider
+        is kept, together with its resource attributes such as agent.id, but its span
+        processors are replaced with fresh ones and the metric exporter gets its own session.
+        """
+        TracingCore._lock = threading.Lock()
+        if not self._initialized or self._provider is None:
+            return
+
+        try:
+            active_processor = self._provider._active_span_processor  # type: ignore
+            # Detected resource attributes carry over to the child; the processor has no thread
+            kept = [p for p in active_processor._span_processors if isinstance(p, DetectedResourceProcessor)]
+            inherited = [p for p in active_processor._span_processors if p not in kept]
+            for processor in kept:
+                processor._at_fork_reinit()
+            for processor in inherited:
+                if isinstance(processor, TailSamplingProcessor):
+                    processor = processor.span_processor
+                if isinstance(processor, BatchSpanProcessor):
+                    # Spans queued before the fork belong to the parent, which exports them
+                    processor.done = True
+                    processor.queue.clear()
+            # Inherited processors stay referenced so their own at-fork hooks remain valid
+            self._inherited_processors.extend(inherited)
+            active_processor._span_processors = tuple(kept + _create_span_processors(**self._processor_kwargs))
+        except Exception as e:
+            logger.warning(f"Failed to rebuild span processors after fork: {e}")
+
+        if self._meter_provider is not None:
+            try:
+                for reader in self._meter_provider._sdk_config.metric_readers:  # type: ignore
+                    _reset_exporter_session(getattr(reader, "_exporter", None), METRICS)
+            except Exception as e:
+                logger.warning(f"Failed to reset metric exporter after fork: {e}")
+
+    def flush_trace(self, trace_id: int) -> Future:
+        """
+        Export the queued spans of a single trace in the background.
+
+        Args:
+            trace_id: The trace to flush
+
+        Returns:
+            A future resolving to True once every span processor has exported the trace's
+            queued spans, or False if any export failed.
+        """
+        futures = []
+        if self._initialized and self._provider is not None:
+            for processor in self._provider._active_span_processor._span_processors:  # type: ignore
+                if isinstance(processor, (AdaptiveBatchSpanProcessor, TailSamplingProcessor)):
+                    futures.append(processor.flush_trace(trace_id))
+
+        combined: Future = Future()
+        if not futures:
+            combined.set_result(True)
+            return combined
+
+        pending = [len(futures)]
+        pending_lock = threading.Lock()
+
+        def _on_done(_):
+            with pending_lock:
+                pending[0] -= 1
+                if pending[0]:
+                    return
+            combined.set_result(all(future.result() for future in futures))
+
+        for future in futures:
+            future.add_done_callback(_on_done)
+        return combined
 
     @property
     def initialized(self) -> bool:
@@ -514,6 +904,7 @@ class TracingCore:
                       logger.warning(f"Error shutting down meter provider: {e}")
 
 
+            self._tracers.clear()
             self._initialized = False
             
 
@@ -547,7 +938,10 @@ class TracingCore:
         if not self._initialized:
             raise AaliyahClientNotInitializedException
 
-        return trace.get_tracer(name)
+        tracer = self._tracers.get(name)
+        if tracer is None:
+            tracer = self._tracers[name] = trace.get_tracer(name)
+        return tracer
 
     # @classmethod
     # def initialize_from_config(cls, config, **kwargs):
@@ -594,3 +988,10 @@ class TracingCore:
     #     # No need to register them here anymore
 
 
+def _reinit_tracing_core_after_fork() -> None:
+    if TracingCore._instance is not None:
+        TracingCore._instance._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_tracing_core_after_fork)
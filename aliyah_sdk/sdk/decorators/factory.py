@@ -3,13 +3,14 @@ import functools
 import asyncio
 
 import wrapt  # type: ignore
+from opentelemetry import context as context_api
 
 from aliyah_sdk.logging import logger
 from aliyah_sdk.sdk.core import TracingCore
 
 from .utility import (
     _create_as_current_span,
-    _make_span,
+    _start_span,
     _process_async_generator,
     _process_sync_generator,
     _record_entity_input,
@@ -87,90 +88,131 @@ def create_entity_decorator(entity_kind: str):
 
             return WrappedClass
 
-        # Create the actual decorator wrapper function for functions
-        @wrapt.decorator
-        def wrapper(wrapped, instance, args, kwargs):
-            # Skip instrumentation if tracer not initialized
-            if not TracingCore.get_instance()._initialized:
-                return wrapped(*args, **kwargs)
-
-            # Use provided name or function name
-            operation_name = name or wrapped.__name__
-
-            # Handle different types of functions (sync, async, generators)
-            is_async = asyncio.iscoroutinefunction(wrapped) or inspect.iscoroutinefunction(wrapped)
-            is_generator = inspect.isgeneratorfunction(wrapped)
-            is_async_generator = inspect.isasyncgenfunction(wrapped)
-
-            # Handle generator functions
-            if is_generator:
-                # Use the old approach for generators
-                span, ctx, token = _make_span(operation_name, entity_kind, version)
-                try:
-                    _record_entity_input(span, args, kwargs)
-                except Exception as e:
-                    logger.warning(f"Failed to record entity input: {e}")
-
-                result = wrapped(*args, **kwargs)
-                return _process_sync_generator(span, result)
+        # Use provided name or function name
+        operation_name = name or wrapped.__name__
 
-            # Handle async generator functions
-            elif is_async_generator:
-                # Use the old approach for async generators
-                span, ctx, token = _make_span(operation_name, entity_kind, version)
-                try:
-                    _record_entity_input(span, args, kwargs)
-                except Exception as e:
-                    logger.warning(f"Failed to record entity input: {e}")
-
-                result = wrapped(*args, **kwargs)
-                return _process_async_generator(span, token, result)
+        # Classify the callable once here instead of on every call
+        if inspect.isgeneratorfunction(wrapped):
+            wrapper = _generator_wrapper(operation_name, entity_kind, version)
+        elif inspect.isasyncgenfunction(wrapped):
+            wrapper = _async_generator_wrapper(operation_name, entity_kind, version)
+        elif asyncio.iscoroutinefunction(wrapped) or inspect.iscoroutinefunction(wrapped):
+            wrapper = _async_wrapper(operation_name, entity_kind, version)
+        else:
+            wrapper = _sync_wrapper(operation_name, entity_kind, version)
 
-            # Handle async functions
-            elif is_async:
+        # Return the wrapper for functions, we already returned WrappedClass for classes
+        return wrapper(wrapped)  # type: ignore
 
-                async def _wrapped_async():
-                    with _create_as_current_span(operation_name, entity_kind, version) as span:
-                        try:
-                            _record_entity_input(span, args, kwargs)
-                        except Exception as e:
-                            logger.warning(f"Failed to record entity input: {e}")
+    return decorator
 
-                        try:
-                            result = await wrapped(*args, **kwargs)
-                            try:
-                                _record_entity_output(span, result)
-                            except Exception as e:
-                                logger.warning(f"Failed to record entity output: {e}")
-                            return result
-                        except Exception as e:
-                            span.record_exception(e)
-                            raise
 
-                return _wrapped_async()
+def _deferred_span_start(operation_name: str, entity_kind: str, version, args, kwargs):
+    """Return a function starting a generator's span under the caller's context, with its input recorded."""
+    parent = context_api.get_current()
+
+    def start_span():
+        span = _start_span(operation_name, entity_kind, version, context=parent)
+        try:
+            _record_entity_input(span, args, kwargs)
+        except Exception as e:
+            logger.warning(f"Failed to record entity input: {e}")
+        return span
+
+    return start_span
+
+
+def _generator_wrapper(operation_name: str, entity_kind: str, version):
+    @wrapt.decorator
+    def wrapper(wrapped, instance, args, kwargs):
+        # Skip instrumentation if tracer not initialized
+        if not TracingCore.get_instance()._initialized:
+            return wrapped(*args, **kwargs)
+
+        # The span starts when the generator is first advanced
+        start_span = _deferred_span_start(operation_name, entity_kind, version, args, kwargs)
+        try:
+            result = wrapped(*args, **kwargs)
+        except Exception as e:
+            span = start_span()
+            span.record_exception(e)
+            span.end()
+            raise
+        return _process_sync_generator(start_span, result, operation_name, entity_kind)
+
+    return wrapper
+
+
+def _async_generator_wrapper(operation_name: str, entity_kind: str, version):
+    @wrapt.decorator
+    def wrapper(wrapped, instance, args, kwargs):
+        # Skip instrumentation if tracer not initialized
+        if not TracingCore.get_instance()._initialized:
+            return wrapped(*args, **kwargs)
+
+        # The span starts when the generator is first advanced
+        start_span = _deferred_span_start(operation_name, entity_kind, version, args, kwargs)
+        try:
+            result = wrapped(*args, **kwargs)
+        except Exception as e:
+            span = start_span()
+            span.record_exception(e)
+            span.end()
+            raise
+        return _process_async_generator(start_span, result, operation_name, entity_kind)
+
+    return wrapper
+
+
+def _async_wrapper(operation_name: str, entity_kind: str, version):
+    @wrapt.decorator
+    async def wrapper(wrapped, instance, args, kwargs):
+        # Skip instrumentation if tracer not initialized
+        if not TracingCore.get_instance()._initialized:
+            return await wrapped(*args, **kwargs)
+
+        with _create_as_current_span(operation_name, entity_kind, version) as span:
+            try:
+                _record_entity_input(span, args, kwargs)
+            except Exception as e:
+                logger.warning(f"Failed to record entity input: {e}")
+
+            try:
+                result = await wrapped(*args, **kwargs)
+                try:
+                    _record_entity_output(span, result)
+                except Exception as e:
+                    logger.warning(f"Failed to record entity output: {e}")
+                return result
+            except Exception as e:
+                span.record_exception(e)
+                raise
 
-            # Handle sync functions
-            else:
-                with _create_as_current_span(operation_name, entity_kind, version) as span:
-                    try:
-                        _record_entity_input(span, args, kwargs)
+    return wrapper
 
-                    except Exception as e:
-                        logger.warning(f"Failed to record entity input: {e}")
 
-                    try:
-                        result = wrapped(*args, **kwargs)
+def _sync_wrapper(operation_name: str, entity_kind: str, version):
+    @wrapt.decorator
+    def wrapper(wrapped, instance, args, kwargs):
+        # Skip instrumentation if tracer not initialized
+        if not TracingCore.get_instance()._initialized:
+            return wrapped(*args, **kwargs)
 
-                        try:
-                            _record_entity_output(span, result)
-                        except Exception as e:
-                            logger.warning(f"Failed to record entity output: {e}")
-                        return result
-                    except Exception as e:
-                        span.record_exception(e)
-                        raise
+        with _create_as_current_span(operation_name, entity_kind, version) as span:
+            try:
+                _record_entity_input(span, args, kwargs)
+            except Exception as e:
+                logger.warning(f"Failed to record entity input: {e}")
 
-        # Return the wrapper for functions, we already returned WrappedClass for classes
-        return wrapper(wrapped)  # type: ignore
+            try:
+                result = wrapped(*args, **kwargs)
+                try:
+                    _record_entity_output(span, result)
+                except Exception as e:
+                    logger.warning(f"Failed to record entity output: {e}")
+                return result
+            except Exception as e:
+                span.record_exception(e)
+                raise
 
-    return decorator
+    return wrapper
@@ -1,16 +1,20 @@
+import logging
+import time
 import types
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Callable, Dict, Generator, Optional
 
 from opentelemetry import context as context_api
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.context import attach, set_value
-from opentelemetry.trace import Span
+from opentelemetry.trace import Span, Status, StatusCode
 
-from aliyah_sdk.helpers.serialization import safe_serialize
+from aliyah_sdk.config import Config
+from aliyah_sdk.helpers.serialization import bounded_serialize
 from aliyah_sdk.logging import logger
 from aliyah_sdk.sdk.core import TracingCore
-from aliyah_sdk.semconv import SpanKind
+from aliyah_sdk.sdk.deferred import defer_attribute
+from aliyah_sdk.semconv import Meters, SpanKind
 from aliyah_sdk.semconv.span_attributes import SpanAttributes
 
 """
@@ -31,34 +35,183 @@ def set_entity_path(entity_path: str) -> None:
 # Helper functions for content management
 
 
-def _check_content_size(content_json: str) -> bool:
-    """Verify that a JSON string is within acceptable size limits (1MB)"""
-    return len(content_json) < 1_000_000
+class _ItemTimer:
+    """
+    Times the items of a decorated generator and ends its span once.
 
+    Time to first item is measured from the first request for an item, when the
+    generator's span starts. Inter-item latency is the time the generator takes to produce each later
+    item once it is asked for, so time the consumer spends between items is
+    not counted. Both are recorded as histograms as items arrive; the span
+    gets the item count and a summary when the generator stops.
+    """
 
-def _process_sync_generator(span: trace.Span, generator: types.GeneratorType):
-    """Process a synchronous generator and manage its span lifecycle"""
-    # Ensure span context is attached to the generator context
-    context_api.attach(trace.set_span_in_context(span))
+    def __init__(self, span: trace.Span, operation_name: str, span_kind: str):
+        self.span = span
+        self.metric_attributes = {SpanAttributes.OPERATION_NAME: operation_name, SpanAttributes.AALIYAH_SPAN_KIND: span_kind}
+        self.started = time.perf_counter()
+        self.items = 0
+        self.time_to_first_item: Optional[float] = None
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.completed = False
+        self.ended = False
+
+    def item(self, requested: float) -> None:
+        """Record an item produced after being requested at `requested` (a perf_counter value)."""
+        now = time.perf_counter()
+        self.items += 1
+        time_to_first_item, inter_item_latency, _ = _stream_histograms()
+        if self.time_to_first_item is None:
+            self.time_to_first_item = now - self.started
+            time_to_first_item.record(self.time_to_first_item, self.metric_attributes)
+        else:
+            latency = now - requested
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            inter_item_latency.record(latency, self.metric_attributes)
+
+    def fail(self, error: BaseException) -> None:
+        self.span.record_exception(error)
+        self.span.set_status(Status(StatusCode.ERROR, str(error)))
+
+    def end(self) -> None:
+        if self.ended:
+            return
+        self.ended = True
+        attributes: Dict[str, Any] = {
+            SpanAttributes.AALIYAH_STREAM_ITEM_COUNT: self.items,
+            SpanAttributes.AALIYAH_STREAM_COMPLETED: self.completed,
+        }
+        if self.time_to_first_item is not None:
+            attributes[SpanAttributes.AALIYAH_STREAM_TIME_TO_FIRST_ITEM] = self.time_to_first_item
+        if self.items > 1:
+            attributes[SpanAttributes.AALIYAH_STREAM_INTER_ITEM_LATENCY_MEAN] = self.total_latency / (self.items - 1)
+            attributes[SpanAttributes.AALIYAH_STREAM_INTER_ITEM_LATENCY_MAX] = self.max_latency
+        self.span.set_attributes(attributes)
+        self.span.end()
+        _stream_histograms()[2].record(self.items, self.metric_attributes)
+
+
+_stream_instruments: Optional[tuple] = None
+
+
+def _stream_histograms() -> tuple:
+    """Return the time to first item, inter-item latency and item count histograms."""
+    global _stream_instruments
+    if _stream_instruments is None:
+        meter = metrics.get_meter(__name__)
+        _stream_instruments = (
+            meter.create_histogram(
+                Meters.STREAM_TIME_TO_FIRST_ITEM, unit="s", description="Time until a decorated generator yields its first item"
+            ),
+            meter.create_histogram(
+                Meters.STREAM_INTER_ITEM_LATENCY, unit="s", description="Time a decorated generator takes to produce each later item"
+            ),
+            meter.create_histogram(Meters.STREAM_ITEMS, unit="{item}", description="Items yielded by a decorated generator"),
+        )
+    return _stream_instruments
+
+
+def _process_sync_generator(
+    start_span: Callable[[], Span], generator: types.GeneratorType, operation_name: str, span_kind: str
+):
+    """
+    Drive a synchronous generator under its span, timing each item.
 
-    # Yield from the generator while maintaining span context
-    yield from generator
+    The span is started by `start_span` when the generator is first advanced, so
+    a generator that is closed or discarded without being iterated leaves no
+    span behind. The span is current only while the generator's own code runs,
+    so no context stays attached across yields. It ends when the generator is
+    exhausted, raises, is closed, or is garbage collected before it finishes.
+    """
+    span = start_span()
+    timer = _ItemTimer(span, operation_name, span_kind)
+    ctx = trace.set_span_in_context(span)
+    value: Any = None
+    error: Optional[BaseException] = None
+    try:
+        while True:
+            token = context_api.attach(ctx)
+            requested = time.perf_counter()
+            try:
+                item = generator.throw(error) if error is not None else generator.send(value)
+            except StopIteration as stop:
+                timer.completed = True
+                return stop.value
+            finally:
+                context_api.detach(token)
+            timer.item(requested)
+
+            error = None
+            try:
+                value = yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                # Thrown in by the consumer; passed on to the generator
+                error = e
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        timer.fail(e)
+        raise
+    finally:
+        token = context_api.attach(ctx)
+        try:
+            generator.close()
+        finally:
+            context_api.detach(token)
+            timer.end()
 
-    # End the span when generator is exhausted
-    span.end()
-    # No detach because of OpenTelemetry issue #2606
-    # Context will be detached during garbage collection
 
+async def _process_async_generator(
+    start_span: Callable[[], Span], generator: types.AsyncGeneratorType, operation_name: str, span_kind: str
+):
+    """
+    Drive an asynchronous generator under its span, timing each item.
 
-async def _process_async_generator(span: trace.Span, context_token: Any, generator: types.AsyncGeneratorType):
-    """Process an asynchronous generator and manage its span lifecycle"""
+    The asynchronous counterpart of `_process_sync_generator`; an abandoned
+    generator is closed, and its span ended, by the event loop's
+    async generator finalizer.
+    """
+    span = start_span()
+    timer = _ItemTimer(span, operation_name, span_kind)
+    ctx = trace.set_span_in_context(span)
+    value: Any = None
+    error: Optional[BaseException] = None
     try:
-        async for item in generator:
-            yield item
+        while True:
+            token = context_api.attach(ctx)
+            requested = time.perf_counter()
+            try:
+                item = await (generator.athrow(error) if error is not None else generator.asend(value))
+            except StopAsyncIteration:
+                timer.completed = True
+                return
+            finally:
+                context_api.detach(token)
+            timer.item(requested)
+
+            error = None
+            try:
+                value = yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        timer.fail(e)
+        raise
     finally:
-        # Always ensure span is ended and context detached
-        span.end()
-        context_api.detach(context_token)
+        token = context_api.attach(ctx)
+        try:
+            await generator.aclose()
+        finally:
+            context_api.detach(token)
+            timer.end()
 
 
 def _get_current_span_info():
@@ -95,9 +248,11 @@ def _create_as_current_span(
     Yields:
         A span with proper context that will be automatically closed when exiting the context
     """
-    # Log before we do anything
-    before_span = _get_current_span_info()
-    logger.debug(f"[DEBUG] BEFORE {operation_name}.{span_kind} - Current context: {before_span}")
+    # Span introspection for debug logs is skipped entirely unless debug logging is on
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        before_span = _get_current_span_info()
+        logger.debug(f"[DEBUG] BEFORE {operation_name}.{span_kind} - Current context: {before_span}")
 
     # Create span with proper naming convention
     span_name = f"{operation_name}.{span_kind}"
@@ -117,13 +272,10 @@ def _create_as_current_span(
     if version is not None:
         attributes[SpanAttributes.OPERATION_VERSION] = version
 
-    # Get current context explicitly to debug it
-    current_context = context_api.get_current()
-
-    # Use OpenTelemetry's context manager to properly handle span lifecycle
-    with tracer.start_as_current_span(span_name, attributes=attributes, context=current_context) as span:
-        # Log after span creation
-        if hasattr(span, "get_span_context"):
+    # Use OpenTelemetry's context manager to properly handle span lifecycle;
+    # the span is parented to the current context
+    with tracer.start_as_current_span(span_name, attributes=attributes) as span:
+        if debug:
             span_ctx = span.get_span_context()
             logger.debug(
                 f"[DEBUG] CREATED {span_name} - span_id: {span_ctx.span_id:x}, parent: {before_span.get('span_id', 'None')}"
@@ -131,31 +283,30 @@ def _create_as_current_span(
 
         yield span
 
-    # Log after we're done
-    after_span = _get_current_span_info()
-    logger.debug(f"[DEBUG] AFTER {operation_name}.{span_kind} - Returned to context: {after_span}")
+    if debug:
+        after_span = _get_current_span_info()
+        logger.debug(f"[DEBUG] AFTER {operation_name}.{span_kind} - Returned to context: {after_span}")
 
 
-def _make_span(
-    operation_name: str, span_kind: str, version: Optional[int] = None, attributes: Optional[Dict[str, Any]] = None
-) -> tuple:
+def _start_span(
+    operation_name: str,
+    span_kind: str,
+    version: Optional[int] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+    context: Optional[context_api.Context] = None,
+) -> Span:
     """
-    Create a span without context management for manual span lifecycle control.
-
-    This function creates a span that will be properly nested within any parent span
-    based on the current execution context, but requires manual ending via _finalize_span.
+    Create a span parented to the current context without making it current.
 
     Args:
         operation_name: Name of the operation being traced
         span_kind: Type of operation (from SpanKind)
         version: Optional version identifier for the operation
         attributes: Optional dictionary of attributes to set on the span
+        context: Context to parent the span to instead of the current one
 
     Returns:
-        A tuple of (span, context, token) where:
-        - span is the created span
-        - context is the span context
-        - token is the context token needed for detaching
+        The started span, which the caller must end
     """
     # Create span with proper naming convention
     span_name = f"{operation_name}.{span_kind}"
@@ -175,15 +326,38 @@ def _make_span(
     if version is not None:
         attributes[SpanAttributes.OPERATION_VERSION] = version
 
-    current_context = context_api.get_current()
+    current_context = context if context is not None else context_api.get_current()
 
     # Create the span with proper context management
     if span_kind == SpanKind.SESSION:
         # For session spans, create as a root span
-        span = tracer.start_span(span_name, attributes=attributes)
-    else:
-        # For other spans, use the current context
-        span = tracer.start_span(span_name, context=current_context, attributes=attributes)
+        return tracer.start_span(span_name, attributes=attributes)
+    # For other spans, use the current context
+    return tracer.start_span(span_name, context=current_context, attributes=attributes)
+
+
+def _make_span(
+    operation_name: str, span_kind: str, version: Optional[int] = None, attributes: Optional[Dict[str, Any]] = None
+) -> tuple:
+    """
+    Create a span without context management for manual span lifecycle control.
+
+    This function creates a span that will be properly nested within any parent span
+    based on the current execution context, but requires manual ending via _finalize_span.
+
+    Args:
+        operation_name: Name of the operation being traced
+        span_kind: Type of operation (from SpanKind)
+        version: Optional version identifier for the operation
+        attributes: Optional dictionary of attributes to set on the span
+
+    Returns:
+        A tuple of (span, context, token) where:
+        - span is the created span
+        - context is the span context
+        - token is the context token needed for detaching
+    """
+    span = _start_span(operation_name, span_kind, version, attributes)
 
     # Set as current context and get token for detachment
     ctx = trace.set_span_in_context(span)
@@ -196,12 +370,12 @@ def _record_entity_input(span: trace.Span, args: tuple, kwargs: Dict[str, Any])
     """Record operation input parameters to span if content tracing is enabled"""
     try:
         input_data = {"args": args, "kwargs": kwargs}
-        json_data = safe_serialize(input_data)
-
-        if _check_content_size(json_data):
-            span.set_attribute(SpanAttributes.AALIYAH_ENTITY_INPUT, json_data)
-        else:
-            logger.debug("Operation input exceeds size limit, not recording")
+        # The export worker serializes a snapshot of the input when deferral is enabled
+        if Config.DEFERRED_SERIALIZATION and defer_attribute(span, SpanAttributes.AALIYAH_ENTITY_INPUT, input_data):
+            return
+        # Oversized inputs are truncated while encoding instead of being encoded in full
+        json_data = bounded_serialize(input_data)
+        span.set_attribute(SpanAttributes.AALIYAH_ENTITY_INPUT, json_data)
     except Exception as err:
         logger.warning(f"Failed to serialize operation input: {err}")
 
@@ -209,17 +383,15 @@ def _record_entity_input(span: trace.Span, args: tuple, kwargs: Dict[str, Any])
 def _record_entity_output(span: trace.Span, result: Any) -> None:
     """Record operation output value to span if content tracing is enabled"""
     try:
-        json_data = safe_serialize(result)
-
-        if _check_content_size(json_data):
-            span.set_attribute(SpanAttributes.AALIYAH_ENTITY_OUTPUT, json_data)
-        else:
-            logger.debug("Operation output exceeds size limit, not recording")
+        if Config.DEFERRED_SERIALIZATION and defer_attribute(span, SpanAttributes.AALIYAH_ENTITY_OUTPUT, result):
+            return
+        json_data = bounded_serialize(result)
+        span.set_attribute(SpanAttributes.AALIYAH_ENTITY_OUTPUT, json_data)
     except Exception as err:
         logger.warning(f"Failed to serialize operation output: {err}")
 
 
-def _finalize_span(span: trace.Span, token: Any) -> None:
+def _finalize_span(span: trace.Span, token: Any, flush: bool = True) -> None:
     """
     Finalizes a span and cleans up its context.
 
@@ -239,6 +411,8 @@ def _finalize_span(span: trace.Span, token: Any) -> None:
     Args:
         span: The span to finalize
         token: The context token to detach
+        flush: Whether to force flush the span processors; callers that flush
+            on their own pass False
     """
     # End the span
     if span:
@@ -254,6 +428,9 @@ def _finalize_span(span: trace.Span, token: Any) -> None:
         except Exception:
             pass
 
+    if not flush:
+        return
+
     # Try to flush span processors
     # Note: force_flush() might not be available in certain scenarios:
     # - During application shutdown when the provider may be partially destroyed
@@ -0,0 +1,139 @@
+"""
+Deferred serialization of span content.
+
+Serializing the inputs and outputs of decorated functions happens inside the
+call and adds to its latency. With deferred serialization enabled, the
+decorators instead attach a snapshot of the value to the span, and the export
+worker serializes it, under the same byte budget, right before the span is
+encoded. Spans dropped by sampling or a full queue are never serialized.
+
+Snapshots follow a copy-on-capture policy: lists, dicts, sets, tuples and
+bytearrays are copied when captured, so mutating an argument after the call
+does not change what is recorded. Strings, numbers and other immutable values
+are kept as they are, and other objects (Pydantic models, dataclasses, custom
+classes) are captured by reference and recorded in the state they have at
+export. Values too large to copy cheaply are serialized right away instead.
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, Iterable
+
+from opentelemetry.attributes import BoundedAttributes
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.trace import Span
+
+from aliyah_sdk.helpers.serialization import bounded_serialize
+from aliyah_sdk.logging import logger
+
+# Containers with more nodes than this are serialized eagerly
+MAX_SNAPSHOT_NODES = 512
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), frozenset)
+
+
+class _SnapshotTooLarge(Exception):
+    pass
+
+
+def snapshot(value: Any, max_nodes: int = MAX_SNAPSHOT_NODES) -> Any:
+    """
+    Copy the mutable builtin containers in `value` so later mutation does not affect it.
+
+    Raises:
+        _SnapshotTooLarge: if `value` has more than `max_nodes` nodes
+    """
+    budget = [max_nodes]
+
+    def copy(item: Any) -> Any:
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise _SnapshotTooLarge
+        if isinstance(item, _IMMUTABLE_TYPES):
+            return item
+        if isinstance(item, dict):
+            return {key: copy(child) for key, child in item.items()}
+        if isinstance(item, list):
+            return [copy(child) for child in item]
+        if isinstance(item, tuple):
+            children = [copy(child) for child in item]
+            # Plain and named tuples of immutable values need no copy
+            if all(child is original for child, original in zip(children, item)):
+                return item
+            return tuple(children)
+        if isinstance(item, set):
+            return {copy(child) for child in item}
+        if isinstance(item, bytearray):
+            return bytes(item)
+        return item
+
+    try:
+        return copy(value)
+    except RecursionError:
+        raise _SnapshotTooLarge from None
+
+
+# Snapshots by id of the span's attribute mapping. The mapping is shared by the
+# span and the ReadableSpan handed to processors when it ends, so it identifies
+# the span on both sides; entries are removed when the mapping is collected.
+_pending: Dict[int, Dict[str, Any]] = {}
+# Reentrant: a garbage collection while the lock is held can run the removal callback
+_pending_lock = threading.RLock()
+
+
+def defer_attribute(span: Span, key: str, value: Any) -> bool:
+    """
+    Attach a snapshot of `value` to `span`, to be serialized as attribute `key` on export.
+
+    Returns:
+        False if the value was not deferred and should be serialized now
+    """
+    attributes = getattr(span, "_attributes", None)
+    if not isinstance(attributes, BoundedAttributes) or not span.is_recording():
+        return False
+    try:
+        captured = snapshot(value)
+    except _SnapshotTooLarge:
+        return False
+
+    attributes_id = id(attributes)
+    with _pending_lock:
+        values = _pending.get(attributes_id)
+        if values is None:
+            values = _pending[attributes_id] = {}
+            weakref.finalize(attributes, _discard, attributes_id)
+        values[key] = captured
+    return True
+
+
+def _discard(attributes_id: int) -> None:
+    with _pending_lock:
+        _pending.pop(attributes_id, None)
+
+
+def resolve_deferred_attributes(spans: Iterable[ReadableSpan]) -> None:
+    """Serialize the deferred values of ended spans and add them to the spans' attributes."""
+    if not _pending:
+        return
+    for span in spans:
+        attributes = span._attributes
+        if attributes is None:
+            continue
+        with _pending_lock:
+            values = _pending.pop(id(attributes), None)
+        if not values:
+            continue
+
+        merged = dict(attributes)
+        for key, value in values.items():
+            try:
+                merged[key] = bounded_serialize(value)
+            except Exception as err:
+                logger.warning(f"Failed to serialize deferred {key}: {err}")
+        # Attributes of ended spans are immutable, so the span gets a new mapping
+        span._attributes = BoundedAttributes(
+            maxlen=attributes.maxlen,
+            attributes=merged,
+            immutable=True,
+            max_value_len=attributes.max_value_len,
+        )
@@ -1,18 +1,129 @@
 # Define a separate class for the authenticated OTLP exporter
 # This is imported conditionally to avoid dependency issues
+import gzip
+import time
+import zlib
+from io import BytesIO
 from typing import Dict, Optional, Sequence
 
 import requests
+from opentelemetry.exporter.otlp.proto.common.metrics_encoder import encode_metrics
 from opentelemetry.exporter.otlp.proto.http import Compression
+from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.metrics.export import MetricExportResult, MetricsData
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExportResult
 
+from aliyah_sdk.client.http.circuit_breaker import CircuitOpenError, jittered_backoff
+from aliyah_sdk.client.http.transport import METRICS, TRACES, HttpTransport
 from aliyah_sdk.exceptions import AaliyahApiJwtExpiredException, ApiServerException
 from aliyah_sdk.logging import logger
 
+# Attempts per export and the jittered delay between them, in seconds
+EXPORT_ATTEMPTS = 3
+EXPORT_RETRY_BASE = 0.5
+EXPORT_RETRY_MAX = 5.0
 
-class AuthenticatedOTLPExporter(OTLPSpanExporter):
+
+def _post(exporter, serialized_data: bytes) -> requests.Response:
+    """
+    Post an encoded batch once.
+
+    The OTLP exporters' own `_export` posts again on any ConnectionError, which
+    would count each failure twice against the circuit breaker; retries are
+    left to `_send`.
+    """
+    data = serialized_data
+    if exporter._compression == Compression.Gzip:
+        gzip_data = BytesIO()
+        with gzip.GzipFile(fileobj=gzip_data, mode="w") as gzip_stream:
+            gzip_stream.write(serialized_data)
+        data = gzip_data.getvalue()
+    elif exporter._compression == Compression.Deflate:
+        data = zlib.compress(serialized_data)
+
+    return exporter._session.post(
+        url=exporter._endpoint,
+        data=data,
+        verify=exporter._certificate_file,
+        timeout=exporter._timeout,
+        cert=exporter._client_cert,
+    )
+
+
+def _send(exporter, serialized_data: bytes, channel: str) -> bool:
+    """
+    Post an encoded batch, retrying transient failures while the channel's circuit is closed.
+
+    Replaces the OTLP exporters' own retry loop, which sleeps for up to a minute
+    per batch while the backend is down.
+    """
+    breaker = HttpTransport.get_breaker(channel)
+    for attempt in range(EXPORT_ATTEMPTS):
+        try:
+            response = exporter._export(serialized_data)
+        except CircuitOpenError:
+            return False
+        except requests.RequestException as e:
+            logger.debug(f"[aaliyah.{type(exporter).__name__}] Export attempt {attempt + 1} failed: {e}")
+        else:
+            if response.ok:
+                return True
+            if not exporter._retryable(response):
+                logger.error(
+                    f"[aaliyah.{type(exporter).__name__}] Backend rejected batch: {response.status_code} {response.text}"
+                )
+                return False
+            logger.debug(f"[aaliyah.{type(exporter).__name__}] Transient export error: {response.status_code}")
+
+        if attempt + 1 < EXPORT_ATTEMPTS and not breaker.is_open():
+            time.sleep(jittered_backoff(attempt, EXPORT_RETRY_BASE, EXPORT_RETRY_MAX))
+    return False
+
+
+class ResilientOTLPSpanExporter(OTLPSpanExporter):
+    """
+    OTLP span exporter that fails fast while the backend is unavailable.
+
+    Batches are not encoded while the traces circuit of the HTTP transport is
+    open, and transient failures are retried a few times with jittered backoff
+    instead of the base exporter's minute-long retry loop.
+    """
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        breaker = HttpTransport.get_breaker(TRACES)
+        if breaker.is_open():
+            breaker.count_rejected()
+            return SpanExportResult.FAILURE
+        return super().export(spans)
+
+    def _export(self, serialized_data: bytes) -> requests.Response:
+        return _post(self, serialized_data)
+
+    def _export_serialized_spans(self, serialized_data: bytes) -> SpanExportResult:
+        if _send(self, serialized_data, TRACES):
+            return SpanExportResult.SUCCESS
+        return SpanExportResult.FAILURE
+
+
+class ResilientOTLPMetricExporter(OTLPMetricExporter):
+    """OTLP metric exporter that fails fast while the backend is unavailable, like ResilientOTLPSpanExporter."""
+
+    def export(self, metrics_data: MetricsData, timeout_millis: float = 10_000, **kwargs) -> MetricExportResult:
+        breaker = HttpTransport.get_breaker(METRICS)
+        if breaker.is_open():
+            breaker.count_rejected()
+            return MetricExportResult.FAILURE
+        if _send(self, encode_metrics(metrics_data).SerializeToString(), METRICS):
+            return MetricExportResult.SUCCESS
+        return MetricExportResult.FAILURE
+
+    def _export(self, serialized_data: bytes) -> requests.Response:
+        return _post(self, serialized_data)
+
+
+class AuthenticatedOTLPExporter(ResilientOTLPSpanExporter):
     """
     OTLP exporter with JWT authentication support.
 
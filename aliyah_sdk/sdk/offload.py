@@ -0,0 +1,297 @@
+"""
+Content-addressed offload of large prompt and completion content.
+
+Agents send the same system prompt, tool definitions and conversation prefix
+on every LLM call, and each span would otherwise carry a full copy of them.
+With offload enabled, content above a size threshold is hashed, uploaded once
+through the objects API, and replaced on the span by a reference to its hash.
+Hashes already uploaded are remembered in a bounded LRU, so repeated content
+costs one hash per call and no upload.
+"""
+
+import atexit
+import hashlib
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from threading import Condition, Lock, Thread
+from typing import Any, Deque, Dict, Optional
+
+from aliyah_sdk.config import Config
+from aliyah_sdk.logging import logger
+from aliyah_sdk.sdk.self_metrics import register_self_metrics
+from aliyah_sdk.semconv import Meters
+
+# Offloaded content is replaced on the span by this prefix followed by the hex digest
+OBJECT_REFERENCE_PREFIX = "aaliyah-object://sha256:"
+
+
+@dataclass
+class PendingObject:
+    """Content waiting to be uploaded under its hash."""
+
+    digest: str
+    body: bytes
+    attempts: int = 0
+    next_attempt: float = 0.0
+
+
+class ContentOffloader:
+    """
+    Uploads large content once per hash from a background thread.
+
+    `offload` never blocks on the network: it returns the reference right
+    away and queues the upload when the hash has not been seen before. Failed
+    uploads are retried with jittered exponential backoff. When pending
+    uploads exceed `max_pending_bytes`, new content stays inline on the span
+    instead of being queued.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        cache_size: int = 10000,
+        max_pending_bytes: int = 16 * 1024 * 1024,
+        max_attempts: int = 5,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ):
+        """
+        Initialize the offloader.
+
+        Args:
+            min_size: Content shorter than this many characters stays inline
+            cache_size: Number of uploaded hashes remembered for deduplication
+            max_pending_bytes: Upper bound for content waiting to be uploaded
+            max_attempts: Uploads attempted per object before it is dropped
+            retry_interval: Initial delay between retries, in seconds
+            max_retry_interval: Upper bound for the retry delay, in seconds
+        """
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self.max_pending_bytes = max_pending_bytes
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        # Hashes the backend already has, least recently used first
+        self._uploaded: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Deque[PendingObject] = deque()
+        # Hashes queued or being uploaded, so concurrent calls do not queue them twice
+        self._queued: Dict[str, int] = {}
+        self._pending_bytes = 0
+        self._uploading = False
+        self._condition = Condition(Lock())
+        self._stopped = False
+
+        self.uploaded_objects = 0
+        self.uploaded_bytes = 0
+        self.deduplicated_bytes = 0
+        self.failed_uploads = 0
+
+        register_self_metrics(
+            self,
+            gauges=(Meters.SDK_OFFLOAD_PENDING_BYTES,),
+            counters=(
+                Meters.SDK_OFFLOAD_UPLOADED_OBJECTS,
+                Meters.SDK_OFFLOAD_UPLOADED_BYTES,
+                Meters.SDK_OFFLOAD_DEDUPLICATED_BYTES,
+                Meters.SDK_OFFLOAD_FAILED_UPLOADS,
+            ),
+        )
+
+        self._thread = Thread(target=self._run, name="AaliyahContentOffloader", daemon=True)
+        self._thread.start()
+
+    def offload(self, content: str) -> str:
+        """
+        Return the reference to store on the span in place of `content`.
+
+        Content below `min_size`, or arriving while the upload queue is full,
+        is returned unchanged.
+        """
+        if len(content) < self.min_size:
+            return content
+
+        body = content.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        with self._condition:
+            if digest in self._uploaded:
+                self._uploaded.move_to_end(digest)
+                self.deduplicated_bytes += len(body)
+            elif digest in self._queued:
+                self.deduplicated_bytes += len(body)
+            elif self._stopped or self._pending_bytes + len(body) > self.max_pending_bytes:
+                return content
+            else:
+                self._pending.append(PendingObject(digest, body))
+                self._queued[digest] = len(body)
+                self._pending_bytes += len(body)
+                self._condition.notify()
+        return OBJECT_REFERENCE_PREFIX + digest
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until pending content is uploaded.
+
+        Returns:
+            True if nothing is left to upload
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while self._pending or self._uploading:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Upload pending content and stop the thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _abandon(self) -> None:
+        """
+        Make an offloader inherited across fork inert.
+
+        Its thread did not survive the fork, and its condition may have been held
+        by another thread of the parent, so the uploads it still holds are left to
+        the parent and `flush` and `shutdown` return immediately.
+        """
+        self._condition = Condition(Lock())
+        self._pending.clear()
+        self._queued.clear()
+        self._pending_bytes = 0
+        self._uploading = False
+        self._stopped = True
+
+    def self_metrics(self) -> Dict[str, float]:
+        with self._condition:
+            return {
+                Meters.SDK_OFFLOAD_PENDING_BYTES: self._pending_bytes,
+                Meters.SDK_OFFLOAD_UPLOADED_OBJECTS: self.uploaded_objects,
+                Meters.SDK_OFFLOAD_UPLOADED_BYTES: self.uploaded_bytes,
+                Meters.SDK_OFFLOAD_DEDUPLICATED_BYTES: self.deduplicated_bytes,
+                Meters.SDK_OFFLOAD_FAILED_UPLOADS: self.failed_uploads,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                self._condition.wait(self._next_wakeup())
+            self._upload_due()
+
+    def _next_wakeup(self) -> Optional[float]:
+        """Seconds until the thread has work, None to wait for new content. Call with the condition held."""
+        if not self._pending:
+            return None
+        return max(0.0, min(obj.next_attempt for obj in self._pending) - time.monotonic())
+
+    def _upload_due(self) -> None:
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                obj = next((obj for obj in self._pending if obj.next_attempt <= now), None)
+                if obj is None:
+                    return
+                self._pending.remove(obj)
+                self._uploading = True
+
+            success = self._upload(obj)
+
+            with self._condition:
+                self._uploading = False
+                if success:
+                    self._forget(obj)
+                    self._remember(obj.digest)
+                    self.uploaded_objects += 1
+                    self.uploaded_bytes += len(obj.body)
+                elif obj.attempts >= self.max_attempts:
+                    self._forget(obj)
+                    if not self.failed_uploads:
+                        logger.warning("[aaliyah.ContentOffloader] Dropping offloaded content that could not be uploaded")
+                    self.failed_uploads += 1
+                else:
+                    delay = min(self.max_retry_interval, self.retry_interval * 2 ** (obj.attempts - 1))
+                    obj.next_attempt = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                    self._pending.append(obj)
+                self._condition.notify_all()
+
+    def _forget(self, obj: PendingObject) -> None:
+        """Drop an object from the queue bookkeeping. Call with the condition held."""
+        self._queued.pop(obj.digest, None)
+        self._pending_bytes -= len(obj.body)
+
+    def _remember(self, digest: str) -> None:
+        """Record an uploaded hash, evicting the least recently used. Call with the condition held."""
+        self._uploaded[digest] = None
+        self._uploaded.move_to_end(digest)
+        while len(self._uploaded) > self.cache_size:
+            self._uploaded.popitem(last=False)
+
+    def _upload(self, obj: PendingObject) -> bool:
+        from aliyah_sdk import get_client
+
+        obj.attempts += 1
+        try:
+            client = get_client()
+            if client is None or getattr(client, "api", None) is None:
+                return False
+            client.api.v1.upload_object(obj.body, content_hash=f"sha256:{obj.digest}")
+            return True
+        except Exception as e:
+            logger.debug(f"[aaliyah.ContentOffloader] Upload of {obj.digest} failed (attempt {obj.attempts}): {e}")
+            return False
+
+
+_offloader: Optional[ContentOffloader] = None
+_offloader_lock = Lock()
+
+
+def get_content_offloader() -> ContentOffloader:
+    """Return the process-wide offloader, starting it on first use."""
+    global _offloader
+    if _offloader is None:
+        with _offloader_lock:
+            if _offloader is None:
+                _offloader = ContentOffloader(
+                    min_size=Config.OFFLOAD_MIN_SIZE,
+                    cache_size=Config.OFFLOAD_CACHE_SIZE,
+                )
+                atexit.register(_offloader.shutdown)
+    return _offloader
+
+
+def offload_content(content: Any) -> Any:
+    """
+    Replace large string content by a reference to its uploaded copy.
+
+    Returns `content` unchanged when offload is disabled, when it is not a
+    string, or when it is shorter than `Config.OFFLOAD_MIN_SIZE`.
+    """
+    if not Config.CONTENT_OFFLOAD or not isinstance(content, str) or len(content) < Config.OFFLOAD_MIN_SIZE:
+        return content
+    return get_content_offloader().offload(content)
+
+
+def _reset_offloader_after_fork() -> None:
+    """The upload thread does not survive fork; the child starts its own on first use."""
+    global _offloader, _offloader_lock
+    if _offloader is not None:
+        # The parent's exit handler would wait on uploads the child can never make
+        atexit.unregister(_offloader.shutdown)
+        _offloader._abandon()
+    _offloader = None
+    _offloader_lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_offloader_after_fork)
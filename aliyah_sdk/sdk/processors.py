@@ -5,35 +5,95 @@ This module contains processors for OpenTelemetry spans.
 """
 
 import time
+from collections import deque
+from concurrent.futures import Future
 from threading import Event, Lock, Thread
-from typing import Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Set
 
-from opentelemetry.context import Context
+from opentelemetry.context import _SUPPRESS_INSTRUMENTATION_KEY, Context, attach, detach, set_value
 from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
-from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult, _FlushRequest
+from opentelemetry.trace import StatusCode
 
 from aliyah_sdk.logging import logger
 from aliyah_sdk.helpers.dashboard import log_trace_url
+from aliyah_sdk.sdk.deferred import resolve_deferred_attributes
+from aliyah_sdk.sdk.self_metrics import register_self_metrics
+from aliyah_sdk.sdk.sidecar import SidecarSpanExporter
 from aliyah_sdk.semconv.core import CoreAttributes
+from aliyah_sdk.semconv.meters import Meters
+from aliyah_sdk.semconv.span_attributes import SpanAttributes
+from aliyah_sdk.semconv.span_kinds import SpanKind
 from aliyah_sdk.logging import upload_logfile
+from aliyah_sdk.logging.shipper import get_log_shipper
 
 
 class LiveSpanProcessor(SpanProcessor):
-    def __init__(self, span_exporter: SpanExporter, **kwargs):
+    """
+    Streams snapshots of spans that have not ended yet.
+
+    Only spans that changed since the last tick are re-exported: a span is marked
+    dirty when it starts and whenever its attributes, events, status or name are
+    updated. Snapshots are taken under the processor's lock, skipping spans that
+    have ended, and exported before `on_end` can export the final span, so the
+    backend never receives an in-flight copy after the completed one. Starting
+    and ending spans never waits on the exporter.
+    """
+
+    # Span methods that change what a snapshot would contain
+    _TRACKED_METHODS = ("set_attributes", "add_event", "set_status", "update_name")
+
+    def __init__(self, span_exporter: SpanExporter, export_interval_millis: float = 1000, **kwargs):
+        """
+        Initialize the processor.
+
+        Args:
+            span_exporter: The exporter snapshots and ended spans are sent to
+            export_interval_millis: How often changed in-flight spans are exported
+        """
         self.span_exporter = span_exporter
+        self.export_interval_millis = export_interval_millis
         self._in_flight: Dict[int, Span] = {}
+        self._dirty: Set[int] = set()
         self._lock = Lock()
+        # Exporters are not thread-safe; serializes the export thread and on_end
+        self._export_lock = Lock()
         self._stop_event = Event()
         self._export_thread = Thread(target=self._export_periodically, daemon=True)
         self._export_thread.start()
 
     def _export_periodically(self) -> None:
-        while not self._stop_event.is_set():
-            time.sleep(1)
+        while not self._stop_event.wait(self.export_interval_millis / 1e3):
+            self._export_dirty()
+
+    def _export_dirty(self) -> None:
+        if not self._dirty:
+            return
+        # Held from the snapshot to its export: a span ending meanwhile has its final
+        # export in on_end wait until the snapshot is sent
+        with self._export_lock:
             with self._lock:
-                to_export = [self._readable_span(span) for span in self._in_flight.values()]
-                if to_export:
-                    self.span_exporter.export(to_export)
+                # The set is never replaced: span wrappers add to it without taking the lock
+                dirty = set(self._dirty)
+                self._dirty.difference_update(dirty)
+                snapshots = self._snapshots(self._in_flight[span_id] for span_id in dirty if span_id in self._in_flight)
+            self._send(snapshots)
+
+    def _snapshots(self, spans) -> List[ReadableSpan]:
+        return [self._readable_span(span) for span in spans if span.end_time is None]
+
+    def _export(self, spans) -> None:
+        with self._export_lock:
+            self._send(spans)
+
+    def _send(self, spans) -> None:
+        """Export spans; the caller holds the export lock"""
+        if not spans:
+            return
+        try:
+            self.span_exporter.export(spans)
+        except Exception as e:
+            logger.debug(f"[aaliyah.LiveSpanProcessor] Export failed: {e}")
 
     def _readable_span(self, span: Span) -> ReadableSpan:
         readable = span._readable_span()
@@ -44,18 +104,35 @@ class LiveSpanProcessor(SpanProcessor):
         }
         return readable
 
+    def _track_changes(self, span: Span) -> None:
+        """Wrap the span's mutating methods so changes mark it dirty."""
+        span_id = span.context.span_id
+        dirty = self._dirty
+        for name in self._TRACKED_METHODS:
+            original = getattr(span, name)
+
+            def tracked(*args, _original=original, **kwargs):
+                result = _original(*args, **kwargs)
+                dirty.add(span_id)
+                return result
+
+            setattr(span, name, tracked)
+
     def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
         if not span.context or not span.context.trace_flags.sampled:
             return
         with self._lock:
             self._in_flight[span.context.span_id] = span
+            self._dirty.add(span.context.span_id)
+        self._track_changes(span)
 
     def on_end(self, span: ReadableSpan) -> None:
         if not span.context or not span.context.trace_flags.sampled:
             return
         with self._lock:
-            del self._in_flight[span.context.span_id]
-            self.span_exporter.export((span,))
+            self._in_flight.pop(span.context.span_id, None)
+            self._dirty.discard(span.context.span_id)
+        self._export((span,))
 
     def shutdown(self) -> None:
         self._stop_event.set()
@@ -71,10 +148,437 @@ class LiveSpanProcessor(SpanProcessor):
         This method is primarily used for testing to ensure all spans
         are exported before assertions are made.
         """
+        with self._export_lock:
+            with self._lock:
+                snapshots = self._snapshots(self._in_flight.values())
+                self._dirty.clear()
+            self._send(snapshots)
+
+
+class SpanLaneQueue:
+    """
+    Span queue split into priority lanes.
+
+    Drop-in replacement for the deque used by `BatchSpanProcessor`: spans are
+    added with `appendleft` and taken with `pop`. Each span is routed to a lane:
+
+    - `control`: session and other boundary spans (see `CONTROL_SPAN_KINDS`)
+    - `error`: spans that ended with an error status
+    - `bulk`: everything else
+
+    `pop` always drains `control` before `error` before `bulk`, so boundary and
+    failure spans are exported first. The priority lanes have their own reserved
+    capacity, which bulk traffic never uses, so bulk spans cannot push out a
+    session or error span queued in its lane. When a priority lane is full its
+    spans spill into the bulk lane and are treated as bulk spans from then on:
+    when the bulk lane is full its oldest span is dropped, spilled or not.
+    """
+
+    CONTROL = "control"
+    ERROR = "error"
+    BULK = "bulk"
+    LANES = (CONTROL, ERROR, BULK)
+
+    CONTROL_SPAN_KINDS = frozenset({SpanKind.SESSION, SpanKind.WORKFLOW, SpanKind.AGENT})
+
+    def __init__(self, max_queue_size: int, reserved_queue_size: int):
+        """
+        Initialize the queue.
+
+        Args:
+            max_queue_size: Capacity of the bulk lane
+            reserved_queue_size: Capacity reserved for each priority lane
+        """
+        self._lanes: Dict[str, Deque[ReadableSpan]] = {lane: deque() for lane in self.LANES}
+        self._capacity = {
+            self.CONTROL: reserved_queue_size,
+            self.ERROR: reserved_queue_size,
+            self.BULK: max_queue_size,
+        }
+        self._lock = Lock()
+        # Number of queued spans per trace, so per-session flushes can tell when they are done
+        self._trace_counts: Dict[int, int] = {}
+        self.dropped: Dict[str, int] = {lane: 0 for lane in self.LANES}
+
+    def _at_fork_reinit(self) -> None:
+        # The lock may have been held by another thread when the process forked
+        self._lock = Lock()
+
+    @classmethod
+    def lane_for(cls, span: ReadableSpan) -> str:
+        """Return the lane a span belongs to."""
+        attributes = span.attributes or {}
+        if attributes.get(SpanAttributes.AALIYAH_SPAN_KIND) in cls.CONTROL_SPAN_KINDS:
+            return cls.CONTROL
+        if span.status is not None and span.status.status_code is StatusCode.ERROR:
+            return cls.ERROR
+        return cls.BULK
+
+    def appendleft(self, span: ReadableSpan) -> None:
+        lane = self.lane_for(span)
+        with self._lock:
+            if len(self._lanes[lane]) >= self._capacity[lane] and lane != self.BULK:
+                # Priority lane is full: spill into bulk, evicting bulk spans if needed
+                bulk = self._lanes[self.BULK]
+                if len(bulk) >= self._capacity[self.BULK]:
+                    if not bulk:
+                        self._drop(lane)
+                        self._push(lane, span)
+                        return
+                    self._drop(self.BULK)
+                self._push(self.BULK, span)
+                return
+            if len(self._lanes[lane]) >= self._capacity[lane]:
+                self._drop(lane)
+            self._push(lane, span)
+
+    def _push(self, lane: str, span: ReadableSpan) -> None:
+        self._lanes[lane].appendleft(span)
+        trace_id = span.context.trace_id
+        self._trace_counts[trace_id] = self._trace_counts.get(trace_id, 0) + 1
+
+    def _forget(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        count = self._trace_counts.get(trace_id, 0) - 1
+        if count > 0:
+            self._trace_counts[trace_id] = count
+        else:
+            self._trace_counts.pop(trace_id, None)
+
+    def _drop(self, lane: str) -> None:
+        self._forget(self._lanes[lane].pop())
+        if not self.dropped[lane]:
+            logger.warning(f"[aaliyah.SpanLaneQueue] {lane} lane is full, dropping its oldest spans")
+        self.dropped[lane] += 1
+
+    def pop(self) -> ReadableSpan:
+        with self._lock:
+            for lane in self.LANES:
+                queue = self._lanes[lane]
+                if queue:
+                    span = queue.pop()
+                    self._forget(span)
+                    return span
+        raise IndexError("pop from an empty SpanLaneQueue")
+
+    def take_trace(self, trace_id: int) -> List[ReadableSpan]:
+        """Remove and return all queued spans of a trace, oldest first."""
+        with self._lock:
+            if trace_id not in self._trace_counts:
+                return []
+            taken: List[ReadableSpan] = []
+            for lane in self.LANES:
+                queue = self._lanes[lane]
+                kept = [span for span in queue if span.context.trace_id != trace_id]
+                if len(kept) != len(queue):
+                    taken.extend(span for span in reversed(queue) if span.context.trace_id == trace_id)
+                    queue.clear()
+                    queue.extend(kept)
+            del self._trace_counts[trace_id]
+            return taken
+
+    def has_trace(self, trace_id: int) -> bool:
+        return trace_id in self._trace_counts
+
+    def clear(self) -> None:
+        with self._lock:
+            for queue in self._lanes.values():
+                queue.clear()
+            self._trace_counts.clear()
+
+    def lane_sizes(self) -> Dict[str, int]:
+        return {lane: len(queue) for lane, queue in self._lanes.items()}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._lanes.values())
+
+    def __bool__(self) -> bool:
+        return any(self._lanes.values())
+
+
+class AdaptiveBatchSpanProcessor(BatchSpanProcessor):
+    """
+    Batch span processor that tunes its batch size and flush delay at runtime.
+
+    Queue capacity and batch size are separate limits. After every export the
+    processor looks at the smoothed export latency and the queue depth:
+
+    - when exports are slower than `target_export_latency_millis` (or fail), the
+      batch size is halved and the flush delay doubled, up to `max_schedule_delay_millis`;
+    - when exports are fast and the queue still holds at least a full batch, the
+      batch size is doubled, up to `max_export_batch_size`, and the flush delay
+      returns to `schedule_delay_millis`.
+
+    Spans are queued in a `SpanLaneQueue`, so session, error and control spans
+    get reserved capacity and are exported ahead of bulk spans. `flush_trace`
+    exports the queued spans of a single trace in the background.
+
+    The effective values are reported as SDK self-metrics.
+    """
+
+    def __init__(
+        self,
+        span_exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 512,
+        min_export_batch_size: int = 32,
+        schedule_delay_millis: float = 1000,
+        max_schedule_delay_millis: float = 5000,
+        target_export_latency_millis: float = 1000,
+        reserved_queue_size: int = 256,
+        **kwargs,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            span_exporter: The exporter spans are sent to
+            max_queue_size: Maximum number of spans held in memory
+            max_export_batch_size: Upper bound for the batch size
+            min_export_batch_size: Lower bound for the batch size
+            schedule_delay_millis: Flush delay while the backend is healthy
+            max_schedule_delay_millis: Upper bound for the flush delay
+            target_export_latency_millis: Export latency above which batches shrink
+            reserved_queue_size: Capacity reserved for each priority lane
+        """
+        max_export_batch_size = min(max_export_batch_size, max_queue_size)
+        min_export_batch_size = max(1, min(min_export_batch_size, max_export_batch_size))
+        # Per-trace flushes, guarded by self.condition. Set before the base class starts the worker
+        self._trace_flushes: Dict[int, List[Future]] = {}
+        self._exporting_traces: Set[int] = set()
+        self._failed_traces: Set[int] = set()
+        super().__init__(
+            span_exporter,
+            max_queue_size=max_queue_size,
+            schedule_delay_millis=schedule_delay_millis,
+            max_export_batch_size=min_export_batch_size,
+            **kwargs,
+        )
+        # The worker is still idle, so the plain deque can be swapped for the lanes
+        self.queue = SpanLaneQueue(max_queue_size, reserved_queue_size)
+        # Drops are reported per lane by the queue; silence the base class warning,
+        # which compares the total length against the bulk capacity
+        self._spans_dropped = True
+        self.min_export_batch_size = min_export_batch_size
+        self.max_batch_size_limit = max_export_batch_size
+        self.base_schedule_delay_millis = schedule_delay_millis
+        self.max_schedule_delay_millis = max(schedule_delay_millis, max_schedule_delay_millis)
+        self.target_export_latency_millis = target_export_latency_millis
+        self.export_latency_millis: Optional[float] = None
+        # Spans of batches the exporter failed to deliver
+        self.failed_spans = 0
+
+        register_self_metrics(
+            self,
+            gauges=(
+                Meters.SDK_EXPORT_BATCH_SIZE,
+                Meters.SDK_EXPORT_SCHEDULE_DELAY,
+                Meters.SDK_EXPORT_LATENCY,
+                Meters.SDK_EXPORT_QUEUE_SIZE,
+            ),
+            counters=(Meters.SDK_EXPORT_DROPPED_SPANS, Meters.SDK_EXPORT_FAILED_SPANS),
+        )
+
+    def flush_trace(self, trace_id: int) -> Future:
+        """
+        Export the queued spans of one trace without waiting for the rest of the queue.
+
+        Args:
+            trace_id: The trace whose spans should be exported
+
+        Returns:
+            A future resolving to True once the trace's queued spans were exported
+            successfully, or False if an export failed.
+        """
+        future: Future = Future()
+        if self.done:
+            future.set_result(True)
+            return future
+
+        with self.condition:
+            if self.queue.has_trace(trace_id) or trace_id in self._exporting_traces:
+                self._trace_flushes.setdefault(trace_id, []).append(future)
+                self.condition.notify_all()
+                return future
+
+        future.set_result(True)
+        return future
+
+    def _get_and_unset_flush_request(self) -> Optional[_FlushRequest]:
+        flush_request = super()._get_and_unset_flush_request()
+        self._resolve_trace_flushes()
+        if flush_request is None and self._trace_flushes:
+            # Wake the worker for pending trace flushes; with num_spans=0 it exports a single batch
+            flush_request = _FlushRequest()
+        return flush_request
+
+    def _resolve_trace_flushes(self) -> None:
+        """Complete the trace flushes that have nothing left to export. Call with self.condition held."""
+        for trace_id in list(self._trace_flushes):
+            if self.queue.has_trace(trace_id) or trace_id in self._exporting_traces:
+                continue
+            success = trace_id not in self._failed_traces
+            self._failed_traces.discard(trace_id)
+            for future in self._trace_flushes.pop(trace_id):
+                future.set_result(success)
+
+    def _at_fork_reinit(self):
+        self.queue._at_fork_reinit()
+        # Flushes requested in the parent are completed by the parent
+        self._trace_flushes = {}
+        self._exporting_traces = set()
+        self._failed_traces = set()
+        super()._at_fork_reinit()
+
+    def _export_batch(self) -> int:
+        """Export at most `max_export_batch_size` spans and adapt to how long it took."""
+        with self.condition:
+            requested = list(self._trace_flushes)
+
+        # Spans of traces being flushed go first, then the regular lane order
+        batch: List[ReadableSpan] = []
+        for trace_id in requested:
+            batch.extend(self.queue.take_trace(trace_id))
+        if not batch:
+            batch_size = self.max_export_batch_size
+            # Only the worker thread consumes from the queue, so pop() cannot fail here
+            while len(batch) < batch_size and self.queue:
+                batch.append(self.queue.pop())
+        if not batch:
+            return 0
+
+        trace_ids = {span.context.trace_id for span in batch}
+        with self.condition:
+            self._exporting_traces = trace_ids
+
+        success = True
+        for start_index in range(0, len(batch), self.max_batch_size_limit):
+            success = self._export_spans(batch[start_index:start_index + self.max_batch_size_limit]) and success
+
+        with self.condition:
+            self._exporting_traces = set()
+            if not success:
+                self._failed_traces.update(trace_ids.intersection(self._trace_flushes))
+            self._resolve_trace_flushes()
+        return len(batch)
+
+    def _export_spans(self, spans: List[ReadableSpan]) -> bool:
+        # Content deferred by the decorators is serialized here, off the request path and
+        # outside the measured export latency
+        resolve_deferred_attributes(spans)
+        token = attach(set_value(_SUPPRESS_INSTRUMENTATION_KEY, True))
+        start = time.monotonic()
+        try:
+            result = self.span_exporter.export(spans)
+        except Exception:
+            logger.exception("Exception while exporting Span batch.")
+            result = SpanExportResult.FAILURE
+        detach(token)
+
+        self._adapt((time.monotonic() - start) * 1000, result)
+        if result is not SpanExportResult.SUCCESS:
+            self.failed_spans += len(spans)
+        return result is SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: Optional[int] = None) -> bool:
+        """
+        Export every queued span and wait for the exports to finish.
+
+        In sidecar mode an export only hands spans to the sidecar, so the flush is
+        forwarded and also waits for the sidecar's upload, within the same timeout.
+        """
+        if timeout_millis is None:
+            timeout_millis = self.export_timeout_millis
+        deadline = time.monotonic() + timeout_millis / 1000
+        if not super().force_flush(timeout_millis):
+            return False
+        if isinstance(self.span_exporter, SidecarSpanExporter):
+            remaining = max(0, int((deadline - time.monotonic()) * 1000))
+            return self.span_exporter.force_flush(remaining)
+        return True
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        with self.condition:
+            self._resolve_trace_flushes()
+
+    def _adapt(self, latency_millis: float, result: SpanExportResult) -> None:
+        if self.export_latency_millis is None:
+            self.export_latency_millis = latency_millis
+        else:
+            self.export_latency_millis = 0.7 * self.export_latency_millis + 0.3 * latency_millis
+
+        if result is not SpanExportResult.SUCCESS or self.export_latency_millis > self.target_export_latency_millis:
+            self.max_export_batch_size = max(self.min_export_batch_size, self.max_export_batch_size // 2)
+            self.schedule_delay_millis = min(self.max_schedule_delay_millis, self.schedule_delay_millis * 2)
+        elif len(self.queue) >= self.max_export_batch_size:
+            self.max_export_batch_size = min(self.max_batch_size_limit, self.max_export_batch_size * 2)
+            self.schedule_delay_millis = self.base_schedule_delay_millis
+        else:
+            self.schedule_delay_millis = max(self.base_schedule_delay_millis, self.schedule_delay_millis / 2)
+
+    def self_metrics(self) -> Dict[str, float]:
+        return {
+            Meters.SDK_EXPORT_BATCH_SIZE: self.max_export_batch_size,
+            Meters.SDK_EXPORT_SCHEDULE_DELAY: self.schedule_delay_millis,
+            Meters.SDK_EXPORT_LATENCY: self.export_latency_millis or 0.0,
+            Meters.SDK_EXPORT_QUEUE_SIZE: self.queue.lane_sizes(),
+            Meters.SDK_EXPORT_DROPPED_SPANS: dict(self.queue.dropped),
+            Meters.SDK_EXPORT_FAILED_SPANS: self.failed_spans,
+        }
+
+
+class DetectedResourceProcessor(SpanProcessor):
+    """
+    Sets resource attributes detected after startup on root spans.
+
+    The provider's Resource is created at init and never changed, so every
+    exported span shares one resource. Usage stats and imported libraries take
+    too long to detect at init; once detection finishes they are set on the
+    root spans still running and on every root span started afterwards.
+    """
+
+    def __init__(self):
+        self._attributes: Optional[Dict[str, Any]] = None
+        self._lock = Lock()
+        # Root spans started before detection finished, by span id
+        self._waiting: Dict[int, Span] = {}
+
+    def _at_fork_reinit(self) -> None:
+        # The lock may have been held by another thread when the process forked
+        self._lock = Lock()
+
+    def set_detected_attributes(self, attributes: Dict[str, Any]) -> None:
+        """Record the detected attributes and set them on the root spans waiting for them."""
         with self._lock:
-            to_export = [self._readable_span(span) for span in self._in_flight.values()]
-            if to_export:
-                self.span_exporter.export(to_export)
+            self._attributes = attributes
+            waiting = list(self._waiting.values())
+            self._waiting.clear()
+        for span in waiting:
+            if span.is_recording():
+                span.set_attributes(attributes)
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        if span.parent is not None or not span.is_recording():
+            return
+        with self._lock:
+            attributes = self._attributes
+            if attributes is None:
+                self._waiting[span.context.span_id] = span
+                return
+        if attributes:
+            span.set_attributes(attributes)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self._waiting:
+            with self._lock:
+                self._waiting.pop(span.context.span_id, None)
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
 
 
 class InternalSpanProcessor(SpanProcessor):
@@ -109,6 +613,8 @@ class InternalSpanProcessor(SpanProcessor):
             self._root_span_id = span.context.span_id
             logger.debug(f"[aaliyah.InternalSpanProcessor] Found root span: {span.name}")
             log_trace_url(span)
+            # Captured output is shipped in chunks tagged with this trace
+            get_log_shipper().start_trace(span.context.trace_id)
 
     def on_end(self, span: ReadableSpan) -> None:
         """
@@ -125,6 +631,7 @@ class InternalSpanProcessor(SpanProcessor):
             logger.debug(f"[aaliyah.InternalSpanProcessor] Ending root span: {span.name}")
             log_trace_url(span)
             try:
+                # Queues the remaining output for the shipper thread; does not block on the upload
                 upload_logfile(span.context.trace_id)
             except Exception as e:
                 logger.error(f"[aaliyah.InternalSpanProcessor] Error uploading logfile: {e}")
@@ -0,0 +1,352 @@
+"""
+Head and tail sampling for Aaliyah SDK.
+
+Head sampling (`AaliyahSampler`) decides when a span starts whether it is
+recorded at all, from a default rate plus rules keyed by agent id or
+AALIYAH_SPAN_KIND. Tail sampling (`TailSamplingProcessor`) holds the spans of
+each trace until its root span (normally the session span) ends and only then
+decides whether the trace is exported, so errors, slow traces and flagged
+traces are always kept while routine traces are sampled.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+from opentelemetry.trace import Link, SpanKind as OTelSpanKind, StatusCode, TraceState, get_current_span
+from opentelemetry.util.types import Attributes
+
+from aliyah_sdk.sdk.self_metrics import register_self_metrics
+from aliyah_sdk.semconv.agent import AgentAttributes
+from aliyah_sdk.semconv.meters import Meters
+from aliyah_sdk.semconv.span_attributes import SpanAttributes
+from aliyah_sdk.semconv.span_kinds import SpanKind
+
+SampleRate = Union[float, str]
+
+_TRACE_ID_MASK = (1 << 64) - 1
+
+
+class SamplingRule:
+    """
+    Keeps a fraction of spans, or at most a number of spans per second.
+
+    The rate is either a ratio between 0 and 1 (`0.25`) or a rate limit written
+    as `"<n>/s"` (`"10/s"`). Both `0` and `"0/s"` drop every span.
+    """
+
+    def __init__(self, rate: SampleRate):
+        self.rate = rate
+        self.ratio: Optional[float] = None
+        self.per_second: Optional[float] = None
+
+        text = str(rate).strip().lower()
+        try:
+            value = float(text[:-2] if text.endswith("/s") else text)
+        except ValueError:
+            raise ValueError(f"Invalid sample rate: {rate!r} (expected a ratio between 0 and 1 or '<n>/s')")
+
+        if text.endswith("/s"):
+            self.per_second = value
+            if self.per_second < 0:
+                raise ValueError(f"Invalid sample rate: {rate!r}")
+            # Token bucket holding up to one second worth of spans
+            self._capacity = max(1.0, self.per_second)
+            self._tokens = self._capacity
+            self._last_refill = time.monotonic()
+            self._lock = threading.Lock()
+        else:
+            self.ratio = value
+            if not 0.0 <= self.ratio <= 1.0:
+                raise ValueError(f"Invalid sample rate: {rate!r} (expected a ratio between 0 and 1 or '<n>/s')")
+            self._bound = round(self.ratio * (_TRACE_ID_MASK + 1))
+
+    def sample(self, trace_id: Optional[int] = None) -> bool:
+        """
+        Decide whether to keep a span.
+
+        Args:
+            trace_id: When given, ratio decisions are derived from the trace id (like
+                TraceIdRatioBased), so every process sampling the trace agrees.
+        """
+        if self.per_second is not None:
+            if not self.per_second:
+                # The bucket holds at least one token, which would keep a span per window
+                return False
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self.per_second)
+                self._last_refill = now
+                if self._tokens < 1.0:
+                    return False
+                self._tokens -= 1.0
+                return True
+
+        if trace_id is None:
+            return random.random() < self.ratio  # type: ignore
+        return (trace_id & _TRACE_ID_MASK) < self._bound
+
+    def __repr__(self) -> str:
+        return f"SamplingRule({self.rate!r})"
+
+
+def parse_sampling_rules(rules: Union[str, Mapping[str, SampleRate], None]) -> Dict[str, SamplingRule]:
+    """
+    Parse sampling rules keyed by `agent:<agent id>` or `kind:<span kind>`.
+
+    Rules are given as a mapping (`{"kind:llm": 0.1, "agent:42": "5/s"}`) or, for
+    environment variables, as a comma-separated string (`"kind:llm=0.1,agent:42=5/s"`).
+    """
+    if not rules:
+        return {}
+
+    if isinstance(rules, str):
+        pairs = []
+        for item in rules.split(","):
+            if not item.strip():
+                continue
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Invalid sampling rule: {item!r} (expected '<key>=<rate>')")
+            pairs.append((key, value))
+    else:
+        pairs = list(rules.items())
+
+    parsed = {}
+    for key, value in pairs:
+        key = str(key).strip()
+        scope, sep, name = key.partition(":")
+        if not sep or scope not in ("agent", "kind") or not name:
+            raise ValueError(f"Invalid sampling rule key: {key!r} (expected 'agent:<id>' or 'kind:<span kind>')")
+        parsed[key] = SamplingRule(value)
+    return parsed
+
+
+def span_kind_of(attributes: Optional[Mapping[str, Any]]) -> Optional[str]:
+    """Return the AALIYAH_SPAN_KIND of a span; spans from LLM instrumentors count as `llm`."""
+    if not attributes:
+        return None
+    kind = attributes.get(SpanAttributes.AALIYAH_SPAN_KIND)
+    if kind is None and SpanAttributes.LLM_SYSTEM in attributes:
+        return SpanKind.LLM
+    return kind
+
+
+class AaliyahSampler(Sampler):
+    """
+    Head sampler with per-agent and per-span-kind rules.
+
+    Spans whose parent was dropped are dropped, so sampled traces never contain
+    orphans. For every other span the most specific rule applies:
+
+    - a `kind:<span kind>` rule matching the span's AALIYAH_SPAN_KIND;
+    - for root spans, an `agent:<id>` rule matching the span's `agent.id`
+      attribute or the agent id the SDK was initialized with;
+    - for root spans, the default rate.
+
+    Child spans without a matching kind rule follow their parent.
+    """
+
+    def __init__(
+        self,
+        sample_rate: SampleRate = 1.0,
+        rules: Union[str, Mapping[str, SampleRate], None] = None,
+        agent_id: Optional[Any] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            sample_rate: Default rate for root spans, a ratio or `"<n>/s"`
+            rules: Rules keyed by `agent:<id>` or `kind:<span kind>`, see `parse_sampling_rules`
+            agent_id: Agent id used for spans that do not carry an `agent.id` attribute
+        """
+        self.default_rule = SamplingRule(sample_rate)
+        self.rules = parse_sampling_rules(rules)
+        self.agent_id = None if agent_id is None else str(agent_id)
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[OTelSpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[TraceState] = None,
+    ) -> SamplingResult:
+        parent = get_current_span(parent_context).get_span_context()
+        parent_trace_state = parent.trace_state if parent.is_valid else None
+
+        if parent.is_valid and not parent.trace_flags.sampled:
+            return SamplingResult(Decision.DROP, None, parent_trace_state)
+
+        kind_rule = self.rules.get(f"kind:{span_kind_of(attributes)}")
+        if kind_rule is not None:
+            # Root spans are decided per trace, child spans per span
+            keep = kind_rule.sample(None if parent.is_valid else trace_id)
+        elif parent.is_valid:
+            keep = True
+        else:
+            agent_id = (attributes or {}).get(AgentAttributes.AGENT_ID, self.agent_id)
+            keep = self.rules.get(f"agent:{agent_id}", self.default_rule).sample(trace_id)
+
+        if keep:
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes, parent_trace_state)
+        return SamplingResult(Decision.DROP, None, parent_trace_state)
+
+    def get_description(self) -> str:
+        rules = ",".join(f"{key}={rule.rate}" for key, rule in self.rules.items())
+        return f"AaliyahSampler{{rate={self.default_rule.rate},rules={{{rules}}}}}"
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """
+    Decides per trace, once the trace's root span ends, whether to export it.
+
+    Ended spans are held back until the root span of their trace ends. The trace
+    is then always kept if any span has an error status or is flagged with
+    AALIYAH_SAMPLE_KEEP, or if the root span ran for at least
+    `latency_threshold_millis`; other traces are kept with probability
+    `sample_rate`. Kept spans are passed to the wrapped processor, in the order
+    they ended.
+
+    At most `max_buffered_spans` spans are held; past that, the oldest trace is
+    decided early from the spans seen so far.
+    """
+
+    def __init__(
+        self,
+        span_processor: SpanProcessor,
+        sample_rate: float = 0.1,
+        latency_threshold_millis: float = 10000,
+        max_buffered_spans: int = 10000,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            span_processor: Processor receiving the spans of kept traces
+            sample_rate: Fraction of traces kept when no keep condition applies
+            latency_threshold_millis: Root span duration from which a trace is always kept
+            max_buffered_spans: Upper bound for spans waiting on their trace's decision
+        """
+        self.span_processor = span_processor
+        self.sample_rate = sample_rate
+        self.latency_threshold_millis = latency_threshold_millis
+        self.max_buffered_spans = max_buffered_spans
+
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        # Recent decisions, for spans that end after their trace's root span
+        self._decisions: "OrderedDict[int, bool]" = OrderedDict()
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self.kept_traces: Dict[str, int] = {"error": 0, "slow": 0, "flagged": 0, "sampled": 0}
+        self.dropped_traces = 0
+
+        register_self_metrics(
+            self,
+            gauges=(Meters.SDK_SAMPLING_BUFFERED_SPANS,),
+            counters=(Meters.SDK_SAMPLING_KEPT_TRACES, Meters.SDK_SAMPLING_DROPPED_TRACES),
+        )
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.span_processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if not span.context or not span.context.trace_flags.sampled:
+            return
+
+        trace_id = span.context.trace_id
+        is_root = span.parent is None or span.parent.is_remote
+        early: List[List[ReadableSpan]] = []
+
+        with self._lock:
+            decision = self._decisions.get(trace_id)
+            if decision is None:
+                spans = self._traces.setdefault(trace_id, [])
+                spans.append(span)
+                self._buffered += 1
+                if is_root:
+                    del self._traces[trace_id]
+                    self._buffered -= len(spans)
+                else:
+                    spans = None
+                while self._buffered > self.max_buffered_spans and self._traces:
+                    _, oldest = self._traces.popitem(last=False)
+                    self._buffered -= len(oldest)
+                    early.append(oldest)
+
+        if decision is not None:
+            if decision:
+                self.span_processor.on_end(span)
+            return
+
+        for oldest in early:
+            self._decide(oldest, root=None)
+        if spans is not None:
+            self._decide(spans, root=span)
+
+    def _decide(self, spans: List[ReadableSpan], root: Optional[ReadableSpan]) -> None:
+        reason = self._keep_reason(spans, root)
+        trace_id = spans[0].context.trace_id
+        with self._lock:
+            self._decisions[trace_id] = reason is not None
+            if len(self._decisions) > self.max_buffered_spans:
+                self._decisions.popitem(last=False)
+            if reason is None:
+                self.dropped_traces += 1
+            else:
+                self.kept_traces[reason] += 1
+
+        if reason is None:
+            return
+        for span in spans:
+            self.span_processor.on_end(span)
+
+    def _keep_reason(self, spans: List[ReadableSpan], root: Optional[ReadableSpan]) -> Optional[str]:
+        if any(span.status.status_code is StatusCode.ERROR for span in spans):
+            return "error"
+        if any(span.attributes and span.attributes.get(SpanAttributes.AALIYAH_SAMPLE_KEEP) for span in spans):
+            return "flagged"
+        if root is not None and root.start_time and root.end_time:
+            if (root.end_time - root.start_time) / 1e6 >= self.latency_threshold_millis:
+                return "slow"
+        if random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def flush_trace(self, trace_id: int) -> Future:
+        """Export the queued spans of a kept trace, see `AdaptiveBatchSpanProcessor.flush_trace`."""
+        flush_trace = getattr(self.span_processor, "flush_trace", None)
+        if flush_trace is not None:
+            return flush_trace(trace_id)
+        future: Future = Future()
+        future.set_result(self.span_processor.force_flush())
+        return future
+
+    def shutdown(self) -> None:
+        # Traces still waiting on their root span are decided with what has ended so far
+        with self._lock:
+            pending = list(self._traces.values())
+            self._traces.clear()
+            self._buffered = 0
+        for spans in pending:
+            self._decide(spans, root=None)
+        self.span_processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.span_processor.force_flush(timeout_millis)
+
+    def self_metrics(self) -> Dict[str, Any]:
+        return {
+            Meters.SDK_SAMPLING_BUFFERED_SPANS: self._buffered,
+            Meters.SDK_SAMPLING_KEPT_TRACES: sum(self.kept_traces.values()),
+            Meters.SDK_SAMPLING_DROPPED_TRACES: self.dropped_traces,
+        }
@@ -0,0 +1,80 @@
+"""
+SDK self-metrics for Aaliyah.
+
+Components of the export pipeline report their internal state, such as
+effective batch sizes, queue depths and drop counters, as OpenTelemetry
+metrics so the SDK's own behaviour is visible next to the agent's telemetry.
+"""
+
+import os
+import weakref
+from threading import Lock
+from typing import Dict, Iterable
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+_METER_NAME = "aaliyah.sdk"
+
+# Live components reporting self-metrics
+_sources: "weakref.WeakSet" = weakref.WeakSet()
+# Instruments already created, keyed by metric name
+_instruments: Dict[str, object] = {}
+_lock = Lock()
+
+
+def _observe(name: str):
+    def callback(options: CallbackOptions) -> Iterable[Observation]:
+        for source in list(_sources):
+            try:
+                values = source.self_metrics()
+            except Exception:
+                continue
+            if name not in values:
+                continue
+            attributes = {"component": type(source).__name__}
+            value = values[name]
+            if isinstance(value, dict):
+                # Per-lane breakdown
+                for lane, lane_value in value.items():
+                    yield Observation(lane_value, {**attributes, "lane": lane})
+            else:
+                yield Observation(value, attributes)
+
+    return callback
+
+
+def register_self_metrics(source, gauges: Iterable[str] = (), counters: Iterable[str] = ()) -> None:
+    """
+    Report a component's internal state as SDK self-metrics.
+
+    The component must implement `self_metrics() -> Dict[str, float]`; it is
+    polled whenever the meter provider collects. A value may also be a dict
+    keyed by lane name, which is reported with a `lane` attribute. Instruments
+    are created once per metric name, so components rebuilt at runtime (e.g.
+    after a fork) reuse them.
+
+    Args:
+        source: The component reporting metrics
+        gauges: Names of metrics that report a current value
+        counters: Names of metrics that report a monotonically increasing total
+    """
+    with _lock:
+        _sources.add(source)
+        meter = metrics.get_meter(_METER_NAME)
+        for name in gauges:
+            if name not in _instruments:
+                _instruments[name] = meter.create_observable_gauge(name, callbacks=[_observe(name)])
+        for name in counters:
+            if name not in _instruments:
+                _instruments[name] = meter.create_observable_counter(name, callbacks=[_observe(name)])
+
+
+def _reset_lock_after_fork() -> None:
+    """The lock may have been held by another thread when the process forked."""
+    global _lock
+    _lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_lock_after_fork)
@@ -0,0 +1,501 @@
+"""
+Out-of-process export sidecar for Aaliyah SDK.
+
+In sidecar mode the agent process does not encode or upload spans itself. The
+`SidecarSpanExporter` flattens finished spans into compact records and writes
+them to a local sidecar process over a Unix socket. The sidecar rebuilds the
+spans and runs the batching, protobuf encoding, compression and HTTP upload,
+so none of that work competes for the agent's GIL.
+
+The sidecar is started on demand with `python -m aliyah_sdk.sdk.sidecar` and
+exits once the process that launched it has exited and every client has
+disconnected. Forked workers of the launching process share the same sidecar.
+"""
+
+import argparse
+import marshal
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from threading import Event, Lock, Thread
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from aliyah_sdk.client.http.transport import TRACES, HttpTransport
+from aliyah_sdk.logging import logger
+
+_FRAME_HEADER = struct.Struct(">I")
+_MARSHAL_VERSION = 4
+
+# Message kinds exchanged over the socket
+_MSG_SPANS = "spans"
+_MSG_FLUSH = "flush"
+_MSG_FLUSHED = "flushed"
+_MSG_RESPONSE = "response"
+
+# Response headers forwarded to clients so backend control signals keep working
+_FORWARDED_HEADERS = ("X-Agent-Status", "X-Agent-Action")
+
+_JWT_ENV_VAR = "ALIYAH_SIDECAR_JWT"
+
+
+def default_socket_path() -> str:
+    """Socket path for a sidecar owned by the current process."""
+    return os.path.join(tempfile.gettempdir(), f"aliyah-sidecar-{os.getpid()}.sock")
+
+
+def _send_frame(sock: socket.socket, message: tuple) -> None:
+    payload = marshal.dumps(message, _MARSHAL_VERSION)
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> Optional[tuple]:
+    header = _recv_exactly(sock, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exactly(sock, _FRAME_HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return marshal.loads(payload)
+
+
+def _span_context_record(ctx) -> tuple:
+    return (ctx.trace_id, ctx.span_id, int(ctx.trace_flags), tuple(ctx.trace_state.items()), ctx.is_remote)
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> tuple:
+    """
+    Flatten spans into a marshal-friendly message.
+
+    Resources are shared by most spans, so their attributes are sent once per
+    message and referenced by index.
+
+    Args:
+        spans: The spans to encode
+
+    Returns:
+        A message tuple that can be passed to `marshal.dumps`
+    """
+    resource_index: Dict[int, int] = {}
+    resources: List[dict] = []
+    records = []
+
+    for span in spans:
+        resource = span.resource
+        index = resource_index.get(id(resource))
+        if index is None:
+            index = resource_index[id(resource)] = len(resources)
+            resources.append(dict(resource.attributes))
+
+        scope = span.instrumentation_scope
+        status = span.status
+        records.append(
+            (
+                span.name,
+                _span_context_record(span.context),
+                _span_context_record(span.parent) if span.parent else None,
+                span.kind.value,
+                span.start_time,
+                span.end_time,
+                dict(span.attributes or {}),
+                tuple((event.name, event.timestamp, dict(event.attributes or {})) for event in span.events),
+                tuple((_span_context_record(link.context), dict(link.attributes or {})) for link in span.links),
+                status.status_code.value,
+                status.description,
+                index,
+                (scope.name, scope.version, scope.schema_url) if scope else None,
+            )
+        )
+
+    return (_MSG_SPANS, tuple(resources), tuple(records))
+
+
+def decode_spans(message: tuple) -> List[ReadableSpan]:
+    """Rebuild `ReadableSpan` objects from a message produced by `encode_spans`."""
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import Event
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+    from opentelemetry.trace import Link, SpanContext, SpanKind, TraceFlags, TraceState
+    from opentelemetry.trace.status import Status, StatusCode
+
+    def to_context(record):
+        trace_id, span_id, flags, state, is_remote = record
+        return SpanContext(trace_id, span_id, is_remote, TraceFlags(flags), TraceState(list(state)))
+
+    _, resource_attrs, records = message
+    resources = [Resource(attrs) for attrs in resource_attrs]
+    spans = []
+    for (
+        name,
+        context,
+        parent,
+        kind,
+        start_time,
+        end_time,
+        attributes,
+        events,
+        links,
+        status_code,
+        status_description,
+        resource,
+        scope,
+    ) in records:
+        spans.append(
+            ReadableSpan(
+                name=name,
+                context=to_context(context),
+                parent=to_context(parent) if parent else None,
+                resource=resources[resource],
+                attributes=attributes,
+                events=[Event(event_name, event_attrs, timestamp) for event_name, timestamp, event_attrs in events],
+                links=[Link(to_context(link_ctx), link_attrs) for link_ctx, link_attrs in links],
+                kind=SpanKind(kind),
+                status=Status(StatusCode(status_code), status_description),
+                start_time=start_time,
+                end_time=end_time,
+                instrumentation_scope=InstrumentationScope(*scope) if scope else None,
+            )
+        )
+    return spans
+
+
+class SidecarSpanExporter(SpanExporter):
+    """
+    Span exporter that hands spans to the local export sidecar.
+
+    The sidecar is launched when this exporter is created and no sidecar is
+    listening yet. In that case the connection is made lazily from the export
+    thread, so `init()` never waits for the sidecar to start.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        socket_path: str,
+        jwt: Optional[str] = None,
+        max_queue_size: int = 2048,
+        export_flush_interval: int = 1000,
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize the sidecar exporter.
+
+        Args:
+            endpoint: OTLP traces endpoint the sidecar uploads to
+            socket_path: Path of the sidecar's Unix socket
+            jwt: API key sent to the backend by the sidecar
+            max_queue_size: Queue size of the sidecar's batch processor
+            export_flush_interval: Flush interval of the sidecar's batch processor (ms)
+            timeout: Socket timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = Lock()
+        self._flushed = Event()
+        self._shutdown = False
+
+        if not self._connect():
+            self._launch(jwt, max_queue_size, export_flush_interval)
+
+    def _launch(self, jwt: Optional[str], max_queue_size: int, export_flush_interval: int) -> None:
+        env = dict(os.environ)
+        if jwt:
+            env[_JWT_ENV_VAR] = jwt
+        command = [
+            sys.executable,
+            "-m",
+            "aliyah_sdk.sdk.sidecar",
+            "--socket",
+            self.socket_path,
+            "--endpoint",
+            self.endpoint,
+            "--parent-pid",
+            str(os.getpid()),
+            "--max-queue-size",
+            str(max_queue_size),
+            "--flush-interval",
+            str(export_flush_interval),
+        ]
+        try:
+            subprocess.Popen(
+                command,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+                close_fds=True,
+            )
+            logger.debug(f"[aaliyah.SidecarSpanExporter] Launched export sidecar on {self.socket_path}")
+        except OSError as e:
+            logger.error(f"[aaliyah.SidecarSpanExporter] Failed to launch export sidecar: {e}")
+
+    def _connect(self) -> bool:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+
+        self._sock = sock
+        Thread(target=self._read_replies, args=(sock,), daemon=True, name="aaliyah-sidecar-replies").start()
+        return True
+
+    def _ensure_connected(self, wait: float) -> bool:
+        deadline = time.monotonic() + wait
+        while self._sock is None:
+            if self._connect():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _read_replies(self, sock: socket.socket) -> None:
+        sock.settimeout(None)
+        while True:
+            try:
+                message = _recv_frame(sock)
+            except OSError:
+                message = None
+            if message is None:
+                return
+
+            if message[0] == _MSG_FLUSHED:
+                self._flushed.set()
+            elif message[0] == _MSG_RESPONSE:
+                _, status_code, headers = message
+                # Relayed to the trace response hooks, as if the OTLP exporter had received it
+                HttpTransport.notify_response(SimpleNamespace(status_code=status_code, headers=headers), TRACES)
+
+    def _send(self, message: tuple) -> bool:
+        with self._send_lock:
+            if not self._ensure_connected(wait=self.timeout):
+                return False
+            try:
+                _send_frame(self._sock, message)
+                return True
+            except OSError as e:
+                logger.debug(f"[aaliyah.SidecarSpanExporter] Lost connection to sidecar: {e}")
+                self._disconnect()
+                return False
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+
+        try:
+            message = encode_spans(spans)
+        except Exception as e:
+            logger.error(f"[aaliyah.SidecarSpanExporter] Failed to encode spans: {e}")
+            return SpanExportResult.FAILURE
+
+        if self._send(message):
+            return SpanExportResult.SUCCESS
+
+        logger.warning(f"[aaliyah.SidecarSpanExporter] Sidecar unavailable, dropped {len(spans)} span(s)")
+        return SpanExportResult.FAILURE
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Ask the sidecar to upload everything it has received and wait for it to finish."""
+        if self._sock is None:
+            return True
+        self._flushed.clear()
+        if not self._send((_MSG_FLUSH,)):
+            return False
+        return self._flushed.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        self._shutdown = True
+        with self._send_lock:
+            self._disconnect()
+
+
+class SidecarServer:
+    """Receives spans from agent processes and exports them to the backend."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        endpoint: str,
+        jwt: Optional[str] = None,
+        parent_pid: Optional[int] = None,
+        max_queue_size: int = 2048,
+        export_flush_interval: int = 1000,
+    ):
+        from opentelemetry.exporter.otlp.proto.http import Compression
+        from aliyah_sdk.sdk.exporters import ResilientOTLPSpanExporter
+        from aliyah_sdk.sdk.processors import AdaptiveBatchSpanProcessor
+
+        self.socket_path = socket_path
+        self.parent_pid = parent_pid
+        self._clients: List[socket.socket] = []
+        self._clients_lock = Lock()
+        self._send_lock = Lock()
+        self._stop_event = Event()
+
+        self.processor = AdaptiveBatchSpanProcessor(
+            ResilientOTLPSpanExporter(
+                endpoint=endpoint,
+                headers={"X-API-Key": jwt} if jwt else {},
+                compression=Compression.Gzip,
+                session=HttpTransport.create_session(TRACES),
+            ),
+            max_queue_size=max_queue_size,
+            schedule_delay_millis=export_flush_interval,
+        )
+        # Backend responses are relayed to the connected SDK processes
+        HttpTransport.add_response_hook(self._broadcast_response, channel=TRACES)
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        self._listener.listen()
+        self._listener.settimeout(1.0)
+
+    def _parent_alive(self) -> bool:
+        if self.parent_pid is None:
+            return True
+        try:
+            os.kill(self.parent_pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+    def _broadcast_response(self, response) -> None:
+        headers = {name: response.headers[name] for name in _FORWARDED_HEADERS if name in response.headers}
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            self._reply(client, (_MSG_RESPONSE, response.status_code, headers))
+
+    def _reply(self, client: socket.socket, message: tuple) -> None:
+        with self._send_lock:
+            try:
+                _send_frame(client, message)
+            except OSError:
+                pass
+
+    def _serve_client(self, client: socket.socket) -> None:
+        client.settimeout(None)
+        try:
+            while True:
+                message = _recv_frame(client)
+                if message is None:
+                    return
+                if message[0] == _MSG_SPANS:
+                    for span in decode_spans(message):
+                        self.processor.on_end(span)
+                elif message[0] == _MSG_FLUSH:
+                    self.processor.force_flush()
+                    self._reply(client, (_MSG_FLUSHED,))
+        except (OSError, ValueError, EOFError) as e:
+            logger.debug(f"[aaliyah.SidecarServer] Client connection error: {e}")
+        finally:
+            with self._clients_lock:
+                if client in self._clients:
+                    self._clients.remove(client)
+            client.close()
+
+    def serve_forever(self) -> None:
+        """Accept clients until the launching process is gone and every client has disconnected."""
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    client, _ = self._listener.accept()
+                except socket.timeout:
+                    with self._clients_lock:
+                        idle = not self._clients
+                    if idle and not self._parent_alive():
+                        break
+                    continue
+
+                with self._clients_lock:
+                    self._clients.append(client)
+                Thread(target=self._serve_client, args=(client,), daemon=True).start()
+        finally:
+            self.close()
+
+    def stop(self, *args) -> None:
+        self._stop_event.set()
+
+    def close(self) -> None:
+        self._listener.close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        HttpTransport.remove_response_hook(self._broadcast_response)
+        self.processor.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Aaliyah span export sidecar")
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    parser.add_argument("--endpoint", required=True, help="OTLP traces endpoint")
+    parser.add_argument("--parent-pid", type=int, default=None, help="Exit once this process is gone")
+    parser.add_argument("--max-queue-size", type=int, default=2048)
+    parser.add_argument("--flush-interval", type=int, default=1000, help="Export flush interval (ms)")
+    args = parser.parse_args(argv)
+
+    # Another sidecar already serves this socket (e.g. started by a sibling worker)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(args.socket)
+        return
+    except OSError:
+        pass
+    finally:
+        probe.close()
+
+    server = SidecarServer(
+        socket_path=args.socket,
+        endpoint=args.endpoint,
+        jwt=os.environ.get(_JWT_ENV_VAR),
+        parent_pid=args.parent_pid,
+        max_queue_size=args.max_queue_size,
+        export_flush_interval=args.flush_interval,
+    )
+    signal.signal(signal.SIGTERM, server.stop)
+    signal.signal(signal.SIGINT, server.stop)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
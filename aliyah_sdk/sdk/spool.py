@@ -0,0 +1,488 @@
+"""
+Disk-backed span spool for Aaliyah SDK.
+
+This module provides a bounded, append-only, segment-based on-disk queue and a
+span exporter that writes encoded batches to it and drains them to the backend
+from a background thread. Spans survive backend outages and process restarts
+without growing the in-memory export queue.
+"""
+
+import os
+import struct
+import tempfile
+import time
+import zlib
+from threading import Event, Lock, Thread
+from typing import List, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from aliyah_sdk.client.http.circuit_breaker import jittered_backoff
+from aliyah_sdk.client.http.transport import TRACES, HttpTransport
+from aliyah_sdk.logging import logger
+from aliyah_sdk.sdk.self_metrics import register_self_metrics
+from aliyah_sdk.semconv import Meters
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+# Each record is stored as <payload length><crc32 of payload><payload>
+_RECORD_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor"
+_LOCK_FILE = ".lock"
+
+DEFAULT_SPOOL_DIR = os.path.join(tempfile.gettempdir(), "aliyah-spool")
+
+
+class SpanSpool:
+    """
+    Bounded, append-only queue of opaque records stored in segment files.
+
+    Records are appended to the newest segment and consumed from the oldest one.
+    A segment is deleted as soon as every record in it has been acknowledged, and
+    the read position inside the oldest segment is persisted so a restarted process
+    resumes where the previous one stopped (at-least-once delivery).
+
+    Writes are flushed to the OS on every append but only fsync'ed every
+    `fsync_interval` seconds, so a burst of appends pays for a single fsync.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_SPOOL_DIR,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age_seconds: float = 24 * 60 * 60,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+    ):
+        """
+        Open (or create) a spool in the given directory.
+
+        Args:
+            directory: Directory holding the segment files
+            max_bytes: Maximum total size of all segments on disk
+            max_age_seconds: Segments older than this are discarded
+            segment_bytes: Size after which a new segment is started
+            fsync_interval: Minimum time in seconds between two fsync calls
+        """
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.segment_bytes = min(segment_bytes, max_bytes)
+        self.fsync_interval = fsync_interval
+
+        # Drop accounting: batches refused by `append` and segments discarded for space or age
+        self.dropped_records = 0
+        self.dropped_segments = 0
+        self.dropped_bytes = 0
+
+        self._lock = Lock()
+        self._lock_fd: Optional[int] = None
+        self.directory = self._acquire_directory(directory)
+
+        self._segments: List[int] = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX) and name[: -len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        self._sizes = {seq: os.path.getsize(self._segment_path(seq)) for seq in self._segments}
+        self._read_seq, self._read_offset = self._load_cursor()
+        self._writer = None
+        self._write_seq: Optional[int] = None
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        self._peeked: Optional[tuple] = None
+
+        with self._lock:
+            self._expire_locked()
+        if self._segments:
+            logger.debug(f"[aaliyah.SpanSpool] Replaying {len(self._segments)} spooled segment(s) from {self.directory}")
+
+    def _acquire_directory(self, directory: str) -> str:
+        """Take an exclusive lock on the spool directory, falling back to a per-process subdirectory."""
+        os.makedirs(directory, exist_ok=True)
+        if fcntl is None:
+            return directory
+
+        for candidate in (directory, os.path.join(directory, str(os.getpid()))):
+            os.makedirs(candidate, exist_ok=True)
+            fd = os.open(os.path.join(candidate, _LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue
+            self._lock_fd = fd
+            return candidate
+
+        return directory
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:020d}{_SEGMENT_SUFFIX}")
+
+    def _load_cursor(self) -> tuple:
+        try:
+            with open(os.path.join(self.directory, _CURSOR_FILE), "r") as f:
+                seq, offset = (int(part) for part in f.read().split())
+            if seq in self._sizes:
+                return seq, offset
+        except (OSError, ValueError):
+            pass
+        return (self._segments[0] if self._segments else 0), 0
+
+    def _save_cursor_locked(self) -> None:
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(f"{self._read_seq} {self._read_offset}")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"[aaliyah.SpanSpool] Failed to persist cursor: {e}")
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all segments on disk."""
+        return sum(self._sizes.values())
+
+    def is_empty(self) -> bool:
+        """Whether every spooled record has been acknowledged."""
+        with self._lock:
+            return self._peek_locked() is None
+
+    def append(self, payload: bytes) -> bool:
+        """
+        Append a record to the spool.
+
+        When the spool is full the oldest segments are discarded to make room.
+
+        Args:
+            payload: The record to store
+
+        Returns:
+            True if the record was stored, False if it was dropped
+        """
+        record_size = _RECORD_HEADER.size + len(payload)
+        with self._lock:
+            if record_size > self.max_bytes:
+                self._count_drop(record_size)
+                return False
+
+            while self.size_bytes + record_size > self.max_bytes and self._drop_oldest_locked():
+                pass
+            if self.size_bytes + record_size > self.max_bytes:
+                self._count_drop(record_size)
+                return False
+
+            writer = self._writer_locked(record_size)
+            writer.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            writer.write(payload)
+            writer.flush()
+            self._sizes[self._write_seq] += record_size
+            self._unsynced = True
+
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fsync_locked()
+            return True
+
+    def peek(self) -> Optional[bytes]:
+        """Return the oldest unacknowledged record without consuming it."""
+        with self._lock:
+            record = self._peek_locked()
+            if record is not None:
+                self._peeked = (self._read_seq, self._read_offset, _RECORD_HEADER.size + len(record))
+            return record
+
+    def ack(self) -> None:
+        """Acknowledge the record returned by the last `peek`, advancing the read position."""
+        with self._lock:
+            if self._peeked is None or self._peeked[:2] != (self._read_seq, self._read_offset):
+                return
+            self._read_offset += self._peeked[2]
+            self._peeked = None
+            if self._read_seq != self._write_seq and self._read_offset >= self._sizes.get(self._read_seq, 0):
+                self._remove_segment_locked(self._read_seq)
+            self._save_cursor_locked()
+
+    def sync(self) -> None:
+        """Force pending writes to disk."""
+        with self._lock:
+            self._fsync_locked()
+
+    def expire(self) -> None:
+        """Discard segments older than `max_age_seconds`."""
+        with self._lock:
+            self._expire_locked()
+
+    def close(self) -> None:
+        """Sync and close the spool. Unacknowledged records stay on disk for replay."""
+        with self._lock:
+            self._fsync_locked()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._write_seq = None
+            self._save_cursor_locked()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def _count_drop(self, size: int, segment: bool = False) -> None:
+        if segment:
+            self.dropped_segments += 1
+        else:
+            self.dropped_records += 1
+        self.dropped_bytes += size
+        logger.warning(f"[aaliyah.SpanSpool] Dropped {'segment' if segment else 'record'} ({size} bytes)")
+
+    def _writer_locked(self, record_size: int):
+        if self._writer is not None and self._sizes[self._write_seq] + record_size > self.segment_bytes:
+            self._fsync_locked()
+            self._writer.close()
+            self._writer = None
+
+        if self._writer is None:
+            seq = (self._segments[-1] + 1) if self._segments else 0
+            self._writer = open(self._segment_path(seq), "ab")
+            self._write_seq = seq
+            self._segments.append(seq)
+            self._sizes[seq] = 0
+            if len(self._segments) == 1:
+                self._read_seq, self._read_offset = seq, 0
+        return self._writer
+
+    def _fsync_locked(self) -> None:
+        if self._writer is not None and self._unsynced:
+            try:
+                os.fsync(self._writer.fileno())
+            except OSError as e:
+                logger.debug(f"[aaliyah.SpanSpool] fsync failed: {e}")
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+
+    def _peek_locked(self) -> Optional[bytes]:
+        while self._segments:
+            if self._read_seq not in self._sizes:
+                self._read_seq, self._read_offset = self._segments[0], 0
+
+            record = self._read_record_locked(self._read_seq, self._read_offset)
+            if record is not None:
+                return record
+
+            # Nothing more in this segment; only finished segments can be retired
+            if self._read_seq == self._write_seq or len(self._segments) == 1:
+                return None
+            self._remove_segment_locked(self._read_seq)
+        return None
+
+    def _read_record_locked(self, seq: int, offset: int) -> Optional[bytes]:
+        try:
+            with open(self._segment_path(seq), "rb") as f:
+                f.seek(offset)
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    return None
+                length, checksum = _RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+        except OSError:
+            return None
+
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            # Torn write from a crash; the rest of this segment is unusable
+            logger.warning(f"[aaliyah.SpanSpool] Corrupt record in segment {seq}, skipping remainder")
+            self._sizes[seq] = offset
+            return None
+        return payload
+
+    def _remove_segment_locked(self, seq: int) -> None:
+        if seq == self._write_seq and self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._write_seq = None
+        try:
+            os.remove(self._segment_path(seq))
+        except OSError:
+            pass
+        self._segments.remove(seq)
+        self._sizes.pop(seq, None)
+        if seq == self._read_seq:
+            self._read_seq = self._segments[0] if self._segments else 0
+            self._read_offset = 0
+
+    def _drop_oldest_locked(self) -> bool:
+        if not self._segments:
+            return False
+        seq = self._segments[0]
+        size = self._sizes.get(seq, 0)
+        if seq == self._read_seq:
+            size -= self._read_offset
+        self._remove_segment_locked(seq)
+        self._count_drop(size, segment=True)
+        return True
+
+    def _expire_locked(self) -> None:
+        cutoff = time.time() - self.max_age_seconds
+        for seq in list(self._segments):
+            if seq == self._write_seq:
+                break
+            try:
+                if os.path.getmtime(self._segment_path(seq)) >= cutoff:
+                    break
+            except OSError:
+                pass
+            logger.debug(f"[aaliyah.SpanSpool] Discarding expired segment {seq}")
+            self._drop_oldest_locked()
+
+
+class SpoolingSpanExporter(SpanExporter):
+    """
+    Span exporter that persists encoded batches to a `SpanSpool` before upload.
+
+    `export` only encodes the batch and appends it to the spool, so the batch
+    processor's queue drains at disk speed regardless of backend health. A daemon
+    thread uploads spooled batches through the wrapped OTLP exporter, backing off
+    with jitter while the backend is unavailable, no sooner than the traces circuit
+    allows, and draining at full speed once it recovers. Batches spooled while the
+    circuit is open are counted as deferred.
+    """
+
+    def __init__(
+        self,
+        span_exporter: SpanExporter,
+        spool: SpanSpool,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ):
+        """
+        Initialize the spooling exporter.
+
+        Args:
+            span_exporter: The OTLP exporter used to encode and upload batches
+            spool: The spool that batches are written to
+            retry_interval: Initial delay in seconds after a failed upload
+            max_retry_interval: Maximum delay in seconds between upload attempts
+        """
+        self.span_exporter = span_exporter
+        self.spool = spool
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        self.deferred_spans = 0
+        self.deferred_bytes = 0
+
+        self._wakeup = Event()
+        self._drained = Event()
+        # Held while a batch is appended and while the drain thread finds the spool empty,
+        # so _drained is never set with a batch just written
+        self._drain_lock = Lock()
+        self._stop_event = Event()
+        self._drain_thread = Thread(target=self._drain, daemon=True, name="aaliyah-spool-drain")
+        self._drain_thread.start()
+
+        register_self_metrics(
+            self, counters=(Meters.SDK_EXPORT_DEFERRED_SPANS, Meters.SDK_EXPORT_DEFERRED_BYTES)
+        )
+
+    @property
+    def _session(self):
+        """Expose the wrapped exporter's HTTP session for response monitoring."""
+        return getattr(self.span_exporter, "_session", None)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._stop_event.is_set():
+            return SpanExportResult.FAILURE
+
+        try:
+            payload = self.span_exporter._serialize_spans(spans)
+        except Exception as e:
+            logger.error(f"[aaliyah.SpoolingSpanExporter] Failed to encode spans: {e}")
+            return SpanExportResult.FAILURE
+
+        with self._drain_lock:
+            if not self.spool.append(payload):
+                return SpanExportResult.FAILURE
+            self._drained.clear()
+        if HttpTransport.get_breaker(TRACES).is_open():
+            self.deferred_spans += len(spans)
+            self.deferred_bytes += len(payload)
+
+        self._wakeup.set()
+        return SpanExportResult.SUCCESS
+
+    def _upload(self, payload: bytes) -> Optional[bool]:
+        """
+        Upload a single spooled batch.
+
+        Returns:
+            True if the batch was accepted, False if it was rejected and must be
+            dropped, None if the upload should be retried later
+        """
+        try:
+            response = self.span_exporter._export(payload)
+        except Exception as e:
+            logger.debug(f"[aaliyah.SpoolingSpanExporter] Upload failed: {e}")
+            return None
+
+        if response.ok:
+            return True
+        if self.span_exporter._retryable(response):
+            logger.debug(f"[aaliyah.SpoolingSpanExporter] Transient upload error: {response.status_code}")
+            return None
+
+        logger.error(
+            f"[aaliyah.SpoolingSpanExporter] Backend rejected spooled batch, dropping it: {response.status_code}"
+        )
+        return False
+
+    def _drain(self) -> None:
+        failures = 0
+        last_expire = time.monotonic()
+
+        while not self._stop_event.is_set():
+            if time.monotonic() - last_expire >= 60:
+                self.spool.expire()
+                last_expire = time.monotonic()
+
+            with self._drain_lock:
+                payload = self.spool.peek()
+                if payload is None:
+                    self._drained.set()
+            if payload is None:
+                self.spool.sync()
+                self._wakeup.wait(timeout=self.retry_interval)
+                self._wakeup.clear()
+                continue
+
+            result = self._upload(payload)
+            if result is None:
+                delay = jittered_backoff(failures, self.retry_interval, self.max_retry_interval)
+                self._stop_event.wait(max(delay, HttpTransport.get_breaker(TRACES).retry_after()))
+                failures += 1
+                continue
+
+            self.spool.ack()
+            failures = 0
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Wait until the spool has been drained to the backend."""
+        self._wakeup.set()
+        if self.spool.is_empty():
+            return True
+        return self._drained.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        """Stop draining and close the spool; undelivered batches are replayed on next start."""
+        self._stop_event.set()
+        self._wakeup.set()
+        self._drain_thread.join(timeout=10)
+        self.spool.close()
+        self.span_exporter.shutdown()
+
+    def self_metrics(self):
+        return {
+            Meters.SDK_EXPORT_DEFERRED_SPANS: self.deferred_spans,
+            Meters.SDK_EXPORT_DEFERRED_BYTES: self.deferred_bytes,
+        }
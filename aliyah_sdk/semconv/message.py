@@ -1,61 +1,110 @@
 """Semantic conventions for message-related attributes in AI systems."""
 
+import sys
+
+# Keys for indexes below these bounds are formatted once and then reused
+MAX_CACHED_INDEX = 64
+MAX_CACHED_SUBINDEX = 16
+
+
+class IndexedAttributeKey(str):
+    """An attribute key template with `{i}` (and optionally `{j}`) placeholders.
+
+    It is the template string itself, so it compares and hashes like one, but
+    `format(i=..., j=...)` returns a cached, interned key for the first
+    MAX_CACHED_INDEX / MAX_CACHED_SUBINDEX indexes. Handlers format keys per
+    message on every LLM call; with the cache they reuse the same key objects,
+    whose hashes are already computed, instead of building new strings.
+    """
+
+    def __new__(cls, template: str):
+        key = super().__new__(cls, template)
+        key._keys = {}
+        return key
+
+    def format(self, *args, i=None, j=None, **kwargs) -> str:
+        key = self._keys.get((i, j))
+        if key is not None:
+            return key
+
+        if i is not None:
+            kwargs["i"] = i
+        if j is not None:
+            kwargs["j"] = j
+        key = str.format(self, *args, **kwargs)
+        if (
+            not args
+            and len(kwargs) == (1 if j is None else 2)
+            and type(i) is int
+            and 0 <= i < MAX_CACHED_INDEX
+            and (j is None or (type(j) is int and 0 <= j < MAX_CACHED_SUBINDEX))
+        ):
+            key = self._keys[(i, j)] = sys.intern(key)
+        return key
+
+
 
 class MessageAttributes:
     """Semantic conventions for message-related attributes in AI systems."""
 
-    PROMPT_ROLE = "gen_ai.prompt.{i}.role"  # Role of the prompt message
-    PROMPT_CONTENT = "gen_ai.prompt.{i}.content"  # Content of the prompt message
-    PROMPT_TYPE = "gen_ai.prompt.{i}.type"  # Type of the prompt message
-    PROMPT_SPEAKER = "gen_ai.prompt.{i}.speaker"  # Speaker/agent name for the prompt message
+    PROMPT_ROLE = IndexedAttributeKey("gen_ai.prompt.{i}.role")  # Role of the prompt message
+    PROMPT_CONTENT = IndexedAttributeKey("gen_ai.prompt.{i}.content")  # Content of the prompt message
+    PROMPT_TYPE = IndexedAttributeKey("gen_ai.prompt.{i}.type")  # Type of the prompt message
+    PROMPT_SPEAKER = IndexedAttributeKey("gen_ai.prompt.{i}.speaker")  # Speaker/agent name for the prompt message
+
+    # Conversation delta capture: a span records only the prompt messages added since an earlier
+    # span of the same conversation, which it points to
+    CONVERSATION_ID = "gen_ai.conversation.id"  # Identifier shared by the spans of one conversation
+    CONVERSATION_OFFSET = "gen_ai.conversation.offset"  # Index of the first prompt message recorded on this span
+    CONVERSATION_PREVIOUS_SPAN_ID = "gen_ai.conversation.previous_span_id"  # Span holding the messages before the offset
 
     # Indexed function calls (with {i} for interpolation)
-    TOOL_CALL_ID = "gen_ai.request.tools.{i}.id"  # Unique identifier for the function call at index {i}
-    TOOL_CALL_TYPE = "gen_ai.request.tools.{i}.type"  # Type of the function call at index {i}
-    TOOL_CALL_NAME = "gen_ai.request.tools.{i}.name"  # Name of the function call at index {i}
-    TOOL_CALL_DESCRIPTION = "gen_ai.request.tools.{i}.description"  # Description of the function call at index {i}
-    TOOL_CALL_ARGUMENTS = "gen_ai.request.tools.{i}.arguments"  # Arguments for function call at index {i}
+    TOOL_CALL_ID = IndexedAttributeKey("gen_ai.request.tools.{i}.id")  # Unique identifier for the function call at index {i}
+    TOOL_CALL_TYPE = IndexedAttributeKey("gen_ai.request.tools.{i}.type")  # Type of the function call at index {i}
+    TOOL_CALL_NAME = IndexedAttributeKey("gen_ai.request.tools.{i}.name")  # Name of the function call at index {i}
+    TOOL_CALL_DESCRIPTION = IndexedAttributeKey("gen_ai.request.tools.{i}.description")  # Description of the function call at index {i}
+    TOOL_CALL_ARGUMENTS = IndexedAttributeKey("gen_ai.request.tools.{i}.arguments")  # Arguments for function call at index {i}
 
     # Indexed completions (with {i} for interpolation)
-    COMPLETION_ID = "gen_ai.completion.{i}.id"  # Unique identifier for the completion
-    COMPLETION_TYPE = "gen_ai.completion.{i}.type"  # Type of the completion at index {i}
-    COMPLETION_ROLE = "gen_ai.completion.{i}.role"  # Role of the completion message at index {i}
-    COMPLETION_CONTENT = "gen_ai.completion.{i}.content"  # Content of the completion message at index {i}
-    COMPLETION_FINISH_REASON = "gen_ai.completion.{i}.finish_reason"  # Finish reason for completion at index {i}
-    COMPLETION_SPEAKER = "gen_ai.completion.{i}.speaker"  # Speaker/agent name for the completion message
+    COMPLETION_ID = IndexedAttributeKey("gen_ai.completion.{i}.id")  # Unique identifier for the completion
+    COMPLETION_TYPE = IndexedAttributeKey("gen_ai.completion.{i}.type")  # Type of the completion at index {i}
+    COMPLETION_ROLE = IndexedAttributeKey("gen_ai.completion.{i}.role")  # Role of the completion message at index {i}
+    COMPLETION_CONTENT = IndexedAttributeKey("gen_ai.completion.{i}.content")  # Content of the completion message at index {i}
+    COMPLETION_FINISH_REASON = IndexedAttributeKey("gen_ai.completion.{i}.finish_reason")  # Finish reason for completion at index {i}
+    COMPLETION_SPEAKER = IndexedAttributeKey("gen_ai.completion.{i}.speaker")  # Speaker/agent name for the completion message
 
     # Indexed tool calls (with {i}/{j} for nested interpolation)
-    COMPLETION_TOOL_CALL_ID = "gen_ai.completion.{i}.tool_calls.{j}.id"  # ID of tool call {j} in completion {i}
-    COMPLETION_TOOL_CALL_TYPE = "gen_ai.completion.{i}.tool_calls.{j}.type"  # Type of tool call {j} in completion {i}
-    COMPLETION_TOOL_CALL_STATUS = (
+    COMPLETION_TOOL_CALL_ID = IndexedAttributeKey("gen_ai.completion.{i}.tool_calls.{j}.id")  # ID of tool call {j} in completion {i}
+    COMPLETION_TOOL_CALL_TYPE = IndexedAttributeKey("gen_ai.completion.{i}.tool_calls.{j}.type")  # Type of tool call {j} in completion {i}
+    COMPLETION_TOOL_CALL_STATUS = IndexedAttributeKey(
         "gen_ai.completion.{i}.tool_calls.{j}.status"  # Status of tool call {j} in completion {i}
     )
-    COMPLETION_TOOL_CALL_NAME = (
+    COMPLETION_TOOL_CALL_NAME = IndexedAttributeKey(
         "gen_ai.completion.{i}.tool_calls.{j}.name"  # Name of the tool called in tool call {j} in completion {i}
     )
-    COMPLETION_TOOL_CALL_DESCRIPTION = (
+    COMPLETION_TOOL_CALL_DESCRIPTION = IndexedAttributeKey(
         "gen_ai.completion.{i}.tool_calls.{j}.description"  # Description of the tool call {j} in completion {i}
     )
-    COMPLETION_TOOL_CALL_STATUS = (
+    COMPLETION_TOOL_CALL_STATUS = IndexedAttributeKey(
         "gen_ai.completion.{i}.tool_calls.{j}.status"  # Status of the tool call {j} in completion {i}
     )
-    COMPLETION_TOOL_CALL_ARGUMENTS = (
+    COMPLETION_TOOL_CALL_ARGUMENTS = IndexedAttributeKey(
         "gen_ai.completion.{i}.tool_calls.{j}.arguments"  # Arguments for tool call {j} in completion {i}
     )
 
     # Indexed annotations of the internal tools (with {i}/{j} for nested interpolation)
-    COMPLETION_ANNOTATION_START_INDEX = (
+    COMPLETION_ANNOTATION_START_INDEX = IndexedAttributeKey(
         "gen_ai.completion.{i}.annotations.{j}.start_index"  # Start index of the URL annotation {j} in completion {i}
     )
-    COMPLETION_ANNOTATION_END_INDEX = (
+    COMPLETION_ANNOTATION_END_INDEX = IndexedAttributeKey(
         "gen_ai.completion.{i}.annotations.{j}.end_index"  # End index of the URL annotation {j} in completion {i}
     )
-    COMPLETION_ANNOTATION_TITLE = (
+    COMPLETION_ANNOTATION_TITLE = IndexedAttributeKey(
         "gen_ai.completion.{i}.annotations.{j}.title"  # Title of the URL annotation {j} in completion {i}
     )
-    COMPLETION_ANNOTATION_TYPE = (
+    COMPLETION_ANNOTATION_TYPE = IndexedAttributeKey(
         "gen_ai.completion.{i}.annotations.{j}.type"  # Type of the URL annotation {j} in completion {i}
     )
-    COMPLETION_ANNOTATION_URL = (
+    COMPLETION_ANNOTATION_URL = IndexedAttributeKey(
         "gen_ai.completion.{i}.annotations.{j}.url"  # URL link of the URL annotation {j} in completion {i}
     )
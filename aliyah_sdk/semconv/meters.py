@@ -7,6 +7,11 @@ class Meters:
     LLM_TOKEN_USAGE = "gen_ai.client.token.usage"
     LLM_OPERATION_DURATION = "gen_ai.client.operation.duration"
 
+    # Streaming latency metrics, recorded for every provider
+    LLM_TIME_TO_FIRST_TOKEN = "gen_ai.client.time_to_first_token"
+    LLM_TIME_PER_OUTPUT_TOKEN = "gen_ai.client.time_per_output_token"
+    LLM_GENERATION_TIME = "gen_ai.client.generation_time"
+
     # OpenAI specific metrics
     LLM_COMPLETIONS_EXCEPTIONS = "gen_ai.openai.chat_completions.exceptions"
     LLM_STREAMING_TIME_TO_FIRST_TOKEN = "gen_ai.openai.chat_completions.streaming_time_to_first_token"
@@ -22,3 +27,31 @@ class Meters:
     AGENT_RUNS = "gen_ai.agent.runs"
     AGENT_TURNS = "gen_ai.agent.turns"
     AGENT_EXECUTION_TIME = "gen_ai.agent.execution_time"
+
+    # Decorated generator metrics
+    STREAM_TIME_TO_FIRST_ITEM = "aaliyah.stream.time_to_first_item"
+    STREAM_INTER_ITEM_LATENCY = "aaliyah.stream.inter_item_latency"
+    STREAM_ITEMS = "aaliyah.stream.items"
+
+    # SDK self-metrics
+    SDK_EXPORT_BATCH_SIZE = "aaliyah.sdk.export.batch_size"
+    SDK_EXPORT_SCHEDULE_DELAY = "aaliyah.sdk.export.schedule_delay"
+    SDK_EXPORT_LATENCY = "aaliyah.sdk.export.latency"
+    SDK_EXPORT_QUEUE_SIZE = "aaliyah.sdk.export.queue_size"
+    SDK_EXPORT_DROPPED_SPANS = "aaliyah.sdk.export.dropped_spans"
+    SDK_EXPORT_FAILED_SPANS = "aaliyah.sdk.export.failed_spans"
+    SDK_EXPORT_DEFERRED_SPANS = "aaliyah.sdk.export.deferred_spans"
+    SDK_EXPORT_DEFERRED_BYTES = "aaliyah.sdk.export.deferred_bytes"
+    SDK_EGRESS_CIRCUIT_STATE = "aaliyah.sdk.egress.circuit_state"
+    SDK_EGRESS_REJECTED_REQUESTS = "aaliyah.sdk.egress.rejected_requests"
+    SDK_EGRESS_REJECTED_BYTES = "aaliyah.sdk.egress.rejected_bytes"
+    SDK_EGRESS_FAILED_REQUESTS = "aaliyah.sdk.egress.failed_requests"
+    SDK_EGRESS_FAILED_BYTES = "aaliyah.sdk.egress.failed_bytes"
+    SDK_SAMPLING_BUFFERED_SPANS = "aaliyah.sdk.sampling.buffered_spans"
+    SDK_SAMPLING_KEPT_TRACES = "aaliyah.sdk.sampling.kept_traces"
+    SDK_SAMPLING_DROPPED_TRACES = "aaliyah.sdk.sampling.dropped_traces"
+    SDK_OFFLOAD_PENDING_BYTES = "aaliyah.sdk.offload.pending_bytes"
+    SDK_OFFLOAD_UPLOADED_OBJECTS = "aaliyah.sdk.offload.uploaded_objects"
+    SDK_OFFLOAD_UPLOADED_BYTES = "aaliyah.sdk.offload.uploaded_bytes"
+    SDK_OFFLOAD_DEDUPLICATED_BYTES = "aaliyah.sdk.offload.deduplicated_bytes"
+    SDK_OFFLOAD_FAILED_UPLOADS = "aaliyah.sdk.offload.failed_uploads"
@@ -86,6 +86,14 @@ class SpanAttributes:
     AALIYAH_ENTITY_INPUT = "aaliyah.entity.input"
     AALIYAH_SPAN_KIND = "aaliyah.span.kind"
     AALIYAH_ENTITY_NAME = "aaliyah.entity.name"
+    AALIYAH_SAMPLE_KEEP = "aaliyah.sample.keep"  # Set to True to keep the span's trace under tail sampling
+
+    # Decorated generator attributes, durations in seconds
+    AALIYAH_STREAM_ITEM_COUNT = "aaliyah.stream.item_count"
+    AALIYAH_STREAM_TIME_TO_FIRST_ITEM = "aaliyah.stream.time_to_first_item"
+    AALIYAH_STREAM_INTER_ITEM_LATENCY_MEAN = "aaliyah.stream.inter_item_latency.mean"
+    AALIYAH_STREAM_INTER_ITEM_LATENCY_MAX = "aaliyah.stream.inter_item_latency.max"
+    AALIYAH_STREAM_COMPLETED = "aaliyah.stream.completed"  # False when closed before exhaustion
 
     # Operation attributes
     OPERATION_NAME = "operation.name"
@@ -4,6 +4,8 @@ Session management for Aliyah SDK.
 Provides manual session control for grouping related operations and workflows.
 """
 
+import asyncio
+from concurrent.futures import Future
 from typing import Optional, Any, Dict, List, Union
 
 from aliyah_sdk.logging import logger
@@ -156,15 +158,32 @@ def _flush_span_processors() -> None:
         logger.warning(f"Failed to force flush span processor: {e}")
 
 
-def end_session(session: Session, **kwargs) -> None:
+def _completed_future(result: bool) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+def end_session(session: Session, wait: bool = True, **kwargs) -> Optional[Future]:
     """
     End a previously started session and finalize the trace.
 
     This properly closes the session span and ensures all trace data is flushed
     to the Aliyah platform.
 
+    With `wait=False` the call returns immediately: only this session's queued
+    spans are exported, in the background, and the returned future resolves to
+    True once they were sent (False if an export failed). Use this in request
+    handlers so response latency does not include the export round-trip.
+
+    In sidecar export mode `wait=True` also waits for the sidecar to upload the
+    spans, while the `wait=False` future resolves once the spans were handed to
+    the sidecar.
+
     Args:
         session: The Session object returned by start_session()
+        wait: Block until the span pipeline is flushed (default). When False,
+              return a future for the session's flush instead.
         **kwargs: Optional attributes to set on the session before ending.
                  Common attributes:
                  - end_state: "success", "error", "cancelled"
@@ -182,6 +201,10 @@ def end_session(session: Session, **kwargs) -> None:
         except Exception as e:
             aliyah_sdk.end_session(session, end_state="error", end_reason=str(e))
         ```
+
+    Returns:
+        None when `wait` is True, otherwise a Future resolving to whether the
+        session's spans were exported.
     """
     global _current_session
 
@@ -190,11 +213,13 @@ def end_session(session: Session, **kwargs) -> None:
 
     if not TracingCore.get_instance().initialized:
         logger.debug("Ignoring end_session call - TracingCore not initialized")
-        return
+        return None if wait else _completed_future(False)
 
     if not hasattr(session, "span") or not hasattr(session, "token"):
         logger.warning("Invalid session object provided to end_session")
-        return
+        return None if wait else _completed_future(False)
+
+    flush_future = None
 
     # Clear client active session reference if this is the active session
     try:
@@ -209,10 +234,14 @@ def end_session(session: Session, **kwargs) -> None:
         if session.span is not None and kwargs:
             _set_span_attributes(session.span, kwargs)
         
-        # Finalize the span with proper cleanup
+        # Finalize the span with proper cleanup, then flush once
         if session.span is not None:
-            _finalize_span(session.span, session.token)
-            _flush_span_processors()
+            _finalize_span(session.span, session.token, flush=False)
+            if wait:
+                _flush_span_processors()
+            else:
+                trace_id = session.span.get_span_context().trace_id
+                flush_future = TracingCore.get_instance().flush_trace(trace_id)
 
         # Clear global session reference if this is the current session
         if _current_session is session:
@@ -229,6 +258,28 @@ def end_session(session: Session, **kwargs) -> None:
         except:
             pass
 
+    if wait:
+        return None
+    return flush_future or _completed_future(False)
+
+
+async def end_session_async(session: Session, **kwargs) -> bool:
+    """
+    End a session from async code without blocking the event loop on the export.
+
+    Accepts the same attributes as end_session() and returns whether the
+    session's spans were exported.
+
+    Example:
+        ```python
+        async def handle(request):
+            session = aliyah_sdk.start_session(tags=["api"])
+            ...
+            await aliyah_sdk.end_session_async(session, end_state="success")
+        ```
+    """
+    return await asyncio.wrap_future(end_session(session, wait=False, **kwargs))
+
 
 def get_current_session() -> Optional[Session]:
     """
@@ -244,5 +295,6 @@ __all__ = [
     "Session",
     "start_session", 
     "end_session",
+    "end_session_async",
     "get_current_session"
 ]
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Measure the per-LLM-call cost of building and applying span attributes.
+
+A chat call is modelled the way the provider handlers see it: a conversation
+of `--messages` messages written as `gen_ai.prompt.{i}.*`, a set of tool
+definitions and a response with tool calls extracted through indexed
+attribute maps, and the result applied to a recording SDK span. The previous
+implementation (plain template strings formatted per key, the mapping
+re-formatted into a new dict on every extraction, and one `set_attribute`
+call per key) is reproduced here as the baseline.
+
+    python benchmarks/attributes.py --messages 40 --number 2000
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, Optional
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from aliyah_sdk.helpers import safe_serialize
+from aliyah_sdk.instrumentation.common.attributes import _extract_attributes_from_mapping_with_index
+from aliyah_sdk.instrumentation.common.wrappers import _update_span
+from aliyah_sdk.semconv import MessageAttributes
+
+TOOL_ATTRIBUTES = {
+    MessageAttributes.TOOL_CALL_TYPE: "type",
+    MessageAttributes.TOOL_CALL_NAME: "name",
+    MessageAttributes.TOOL_CALL_DESCRIPTION: "description",
+    MessageAttributes.TOOL_CALL_ARGUMENTS: "parameters",
+}
+
+TOOL_CALL_ATTRIBUTES = {
+    MessageAttributes.COMPLETION_TOOL_CALL_ID: "id",
+    MessageAttributes.COMPLETION_TOOL_CALL_NAME: "name",
+    MessageAttributes.COMPLETION_TOOL_CALL_ARGUMENTS: "arguments",
+    MessageAttributes.COMPLETION_TOOL_CALL_STATUS: "status",
+}
+
+
+# --- Baseline: the previous implementation -----------------------------------
+
+
+def _legacy_extract(span_data: Any, attribute_mapping: Dict[str, str]) -> Dict[str, Any]:
+    attributes = {}
+    for target_attr, source_attr in attribute_mapping.items():
+        if hasattr(span_data, source_attr):
+            value = getattr(span_data, source_attr)
+        elif isinstance(span_data, dict) and source_attr in span_data:
+            value = span_data[source_attr]
+        else:
+            continue
+        if value is None or (isinstance(value, (list, dict, str)) and not value):
+            continue
+        elif isinstance(value, (dict, list, object)) and not isinstance(value, (str, int, float, bool)):
+            value = safe_serialize(value)
+        attributes[target_attr] = value
+    return attributes
+
+
+def _legacy_extract_with_index(span_data: Any, attribute_mapping, i: int, j: Optional[int] = None):
+    format_kwargs = {"i": i}
+    if j is not None:
+        format_kwargs["j"] = j
+    mapping = {}
+    for target_attr, source_attr in attribute_mapping.items():
+        mapping[target_attr.format(**format_kwargs)] = source_attr
+    return _legacy_extract(span_data, mapping)
+
+
+def _legacy_update_span(span, attributes) -> None:
+    for key, value in attributes.items():
+        span.set_attribute(key, value)
+
+
+# Plain template strings, as the semantic conventions used to define them
+LEGACY_PROMPT_ROLE = str(MessageAttributes.PROMPT_ROLE)
+LEGACY_PROMPT_CONTENT = str(MessageAttributes.PROMPT_CONTENT)
+LEGACY_PROMPT_TYPE = str(MessageAttributes.PROMPT_TYPE)
+LEGACY_TOOL_ATTRIBUTES = {str(k): v for k, v in TOOL_ATTRIBUTES.items()}
+LEGACY_TOOL_CALL_ATTRIBUTES = {str(k): v for k, v in TOOL_CALL_ATTRIBUTES.items()}
+
+
+# --- One LLM call ------------------------------------------------------------
+
+
+def _request(messages: int, tools: int, tool_calls: int) -> Dict[str, Any]:
+    return {
+        "messages": [
+            {"role": "user" if i % 2 else "assistant", "content": f"message {i} " * 10} for i in range(messages)
+        ],
+        "tools": [
+            {
+                "type": "function",
+                "name": f"tool_{i}",
+                "description": "Looks things up. " * 4,
+                "parameters": {"type": "object", "properties": {"query": {"type": "string"}}},
+            }
+            for i in range(tools)
+        ],
+        "tool_calls": [
+            {"id": f"call_{i}", "name": f"tool_{i}", "arguments": '{"query": "weather"}', "status": "completed"}
+            for i in range(tool_calls)
+        ],
+    }
+
+
+def _legacy_call(span, request) -> None:
+    attributes = {}
+    for i, message in enumerate(request["messages"]):
+        attributes[LEGACY_PROMPT_ROLE.format(i=i)] = message["role"]
+        attributes[LEGACY_PROMPT_CONTENT.format(i=i)] = message["content"]
+        attributes[LEGACY_PROMPT_TYPE.format(i=i)] = "text"
+    for i, tool in enumerate(request["tools"]):
+        attributes.update(_legacy_extract_with_index(tool, LEGACY_TOOL_ATTRIBUTES, i))
+    _legacy_update_span(span, attributes)
+
+    attributes = {}
+    for j, tool_call in enumerate(request["tool_calls"]):
+        attributes.update(_legacy_extract_with_index(tool_call, LEGACY_TOOL_CALL_ATTRIBUTES, 0, j))
+    _legacy_update_span(span, attributes)
+
+
+def _call(span, request) -> None:
+    attributes = {}
+    for i, message in enumerate(request["messages"]):
+        attributes[MessageAttributes.PROMPT_ROLE.format(i=i)] = message["role"]
+        attributes[MessageAttributes.PROMPT_CONTENT.format(i=i)] = message["content"]
+        attributes[MessageAttributes.PROMPT_TYPE.format(i=i)] = "text"
+    for i, tool in enumerate(request["tools"]):
+        attributes.update(_extract_attributes_from_mapping_with_index(tool, TOOL_ATTRIBUTES, i))
+    _update_span(span, attributes)
+
+    attributes = {}
+    for j, tool_call in enumerate(request["tool_calls"]):
+        attributes.update(_extract_attributes_from_mapping_with_index(tool_call, TOOL_CALL_ATTRIBUTES, 0, j))
+    _update_span(span, attributes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=40, help="Conversation length")
+    parser.add_argument("--tools", type=int, default=10, help="Tool definitions per request")
+    parser.add_argument("--tool-calls", type=int, default=3, help="Tool calls per response")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    tracer = TracerProvider().get_tracer("benchmark")
+    request = _request(args.messages, args.tools, args.tool_calls)
+
+    def run(call):
+        def one_call():
+            span = tracer.start_span("llm")
+            call(span, request)
+            span.end()
+
+        return min(timeit.repeat(one_call, number=args.number, repeat=5)) / args.number * 1e6
+
+    # Both variants must record the same attributes
+    legacy_span, span = tracer.start_span("legacy"), tracer.start_span("engine")
+    _legacy_call(legacy_span, request)
+    _call(span, request)
+    assert dict(legacy_span.attributes) == dict(span.attributes)
+
+    legacy_us = run(_legacy_call)
+    engine_us = run(_call)
+    label = f"{args.messages} messages, {args.tools} tools, {args.tool_calls} tool calls"
+    print(f"{label:<40} before {legacy_us:8.1f} us  after {engine_us:8.1f} us  speedup {legacy_us / engine_us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
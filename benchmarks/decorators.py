@@ -0,0 +1,143 @@
+"""
+Measure the per-call overhead that `@agent`, `@task` and `@workflow` add.
+
+Each decorated function does no work of its own, so the difference to the
+undecorated function is the SDK's cost: classifying the call, creating the
+span, recording input and output, and ending the span. The cost of a bare
+span through the same tracer pipeline is measured too; the budget applies to
+what the decorator adds on top of it, and the benchmark exits non-zero when
+the sync decorator exceeds it, so it can gate CI.
+
+    python benchmarks/decorators.py --number 20000 --budget 60 [--deferred]
+"""
+
+import argparse
+import asyncio
+import logging
+import timeit
+
+import aliyah_sdk
+from aliyah_sdk.sdk.core import TracingCore
+from aliyah_sdk.sdk.decorators import agent, task, workflow
+
+
+def _plain(x):
+    return x
+
+
+async def _plain_async(x):
+    return x
+
+
+def _plain_generator(x):
+    yield x
+
+
+def _build():
+    """Decorate fresh copies of the plain functions with each entity decorator."""
+    cases = {}
+    for label, decorator in (("@agent", agent), ("@task", task), ("@workflow", workflow)):
+        cases[label] = (
+            decorator(name="bench")(lambda x: x),
+            decorator(name="bench")(_copy_async()),
+            decorator(name="bench")(_copy_generator()),
+        )
+    return cases
+
+
+def _copy_async():
+    async def fn(x):
+        return x
+
+    return fn
+
+
+def _copy_generator():
+    def fn(x):
+        yield x
+
+    return fn
+
+
+def _per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(lambda: fn(1), number=number, repeat=5)) / number * 1e6
+
+
+def _bare_span_us(number: int) -> float:
+    """Per-call cost of a span with the same attributes, started and ended directly on the tracer."""
+    tracer = TracingCore.get_instance().get_tracer()
+
+    def call():
+        with tracer.start_as_current_span("bench.task", attributes={"kind": "task", "name": "bench"}) as span:
+            span.set_attribute("input", '{"args": [1], "kwargs": {}}')
+            span.set_attribute("output", "1")
+
+    return min(timeit.repeat(call, number=number, repeat=5)) / number * 1e6
+
+
+def _per_call_async_us(fn, number: int) -> float:
+    async def run():
+        for _ in range(number):
+            await fn(1)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return min(timeit.repeat(lambda: loop.run_until_complete(run()), number=1, repeat=5)) / number * 1e6
+    finally:
+        loop.close()
+
+
+def _per_call_generator_us(fn, number: int) -> float:
+    return min(timeit.repeat(lambda: list(fn(1)), number=number, repeat=5)) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--budget", type=float, default=60.0, help="Sync decorator cost per call above a bare span, in us")
+    parser.add_argument(
+        "--deferred", action="store_true", help="Serialize inputs and outputs in the export worker"
+    )
+    args = parser.parse_args()
+
+    aliyah_sdk.init(
+        api_key="aliyah_benchmark",
+        endpoint="http://127.0.0.1:9",
+        exporter_endpoint="http://127.0.0.1:9/v1/traces",
+        auto_start_session=False,
+        instrument_llm_calls=False,
+        max_queue_size=1024,
+        deferred_serialization=args.deferred,
+    )
+    # The endpoint does not exist; keep failed exports out of the output
+    logging.getLogger("opentelemetry").setLevel(logging.CRITICAL)
+    logging.getLogger("aaliyah").setLevel(logging.CRITICAL)
+
+    plain = (
+        _per_call_us(_plain, args.number),
+        _per_call_async_us(_plain_async, args.number),
+        _per_call_generator_us(_plain_generator, args.number),
+    )
+    bare_span = _bare_span_us(args.number)
+    print(f"{'bare span':<10} cost per call: {bare_span:6.1f} us")
+
+    failed = False
+    for label, (sync_fn, async_fn, generator_fn) in _build().items():
+        overheads = (
+            _per_call_us(sync_fn, args.number) - plain[0],
+            _per_call_async_us(async_fn, args.number) - plain[1],
+            _per_call_generator_us(generator_fn, args.number) - plain[2],
+        )
+        decorator_cost = overheads[0] - bare_span
+        status = "ok" if decorator_cost <= args.budget else "OVER BUDGET"
+        failed = failed or decorator_cost > args.budget
+        print(
+            f"{label:<10} overhead per call: sync {overheads[0]:6.1f} us  async {overheads[1]:6.1f} us  "
+            f"generator {overheads[2]:6.1f} us  (sync above bare span {decorator_cost:5.1f} us: {status}, "
+            f"budget {args.budget:.0f} us)"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
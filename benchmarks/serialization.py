@@ -0,0 +1,186 @@
+"""
+Compare the serialization engine with the encoder it replaced.
+
+The payloads mimic what decorated Karo and CrewAI calls hand to
+`safe_serialize`: Pydantic input/output schemas with chat history, task
+dicts with tool lists, and tool results with nested models, UUIDs and
+timestamps. The previous implementation (model_to_dict followed by
+json.dumps with a Python-level JSONEncoder.default, and filter_unjsonable
+calling json.dumps per leaf) is reproduced here as the baseline.
+
+    python benchmarks/serialization.py --number 2000
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from aliyah_sdk.helpers import serialization
+
+
+# --- Baseline: the previous implementation -----------------------------------
+
+
+class _LegacyEncoder(json.JSONEncoder):
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if isinstance(obj, Decimal):
+            return str(obj)
+        if isinstance(obj, set):
+            return list(obj)
+        if hasattr(obj, "to_json"):
+            return obj.to_json()
+        if isinstance(obj, Enum):
+            return obj.value
+        return str(obj)
+
+
+def _legacy_safe_serialize(obj: Any) -> Any:
+    if isinstance(obj, str):
+        return obj
+    if hasattr(obj, "model_dump") or hasattr(obj, "dict") or hasattr(obj, "parse"):
+        obj = serialization.model_to_dict(obj)
+    try:
+        return json.dumps(obj, cls=_LegacyEncoder)
+    except (TypeError, ValueError):
+        return str(obj)
+
+
+def _legacy_is_jsonable(x):
+    try:
+        json.dumps(x)
+        return True
+    except (TypeError, OverflowError):
+        return False
+
+
+def _legacy_filter_unjsonable(d: dict) -> dict:
+    def filter_dict(obj):
+        if isinstance(obj, dict):
+            return {
+                k: (
+                    filter_dict(v)
+                    if isinstance(v, (dict, list)) or _legacy_is_jsonable(v)
+                    else str(v) if isinstance(v, uuid.UUID) else ""
+                )
+                for k, v in obj.items()
+            }
+        elif isinstance(obj, list):
+            return [
+                (
+                    filter_dict(x)
+                    if isinstance(x, (dict, list)) or _legacy_is_jsonable(x)
+                    else str(x) if isinstance(x, uuid.UUID) else ""
+                )
+                for x in obj
+            ]
+        return obj if _legacy_is_jsonable(obj) or isinstance(obj, uuid.UUID) else ""
+
+    return filter_dict(d)
+
+
+# --- Payloads ----------------------------------------------------------------
+
+
+class Role(str, Enum):
+    USER = "user"
+    ASSISTANT = "assistant"
+
+
+class ChatMessage(BaseModel):
+    role: Role
+    content: str
+    created_at: datetime
+
+
+class AgentInput(BaseModel):
+    """Shaped like a Karo BaseAgent input schema."""
+
+    chat_message: str
+    session_id: uuid.UUID
+    history: List[ChatMessage]
+    metadata: Dict[str, Any] = {}
+
+
+class ToolCall(BaseModel):
+    tool_name: str
+    arguments: Dict[str, Any]
+    result: Optional[str] = None
+    cost: Decimal = Decimal("0")
+
+
+class AgentOutput(BaseModel):
+    response_message: str
+    tool_calls: List[ToolCall]
+    usage: Dict[str, int]
+
+
+def _now() -> datetime:
+    return datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _payloads() -> Dict[str, Any]:
+    history = [
+        ChatMessage(role=Role.USER if i % 2 else Role.ASSISTANT, content=f"message {i} " * 20, created_at=_now())
+        for i in range(20)
+    ]
+    karo_input = AgentInput(
+        chat_message="Summarise the attached quarterly report.",
+        session_id=uuid.UUID(int=42),
+        history=history,
+        metadata={"tags": ["finance", "q3"], "priority": 2},
+    )
+    karo_output = AgentOutput(
+        response_message="Revenue grew 12% quarter over quarter. " * 10,
+        tool_calls=[
+            ToolCall(tool_name="pdf_reader", arguments={"path": "/tmp/report.pdf", "pages": [1, 2, 3]}, result="ok" * 50),
+            ToolCall(tool_name="calculator", arguments={"expression": "1.12 * 4"}, result="4.48", cost=Decimal("0.002")),
+        ],
+        usage={"prompt_tokens": 1523, "completion_tokens": 311, "total_tokens": 1834},
+    )
+    crewai_task = {
+        "args": (),
+        "kwargs": {
+            "description": "Research the latest developments in retrieval augmented generation. " * 5,
+            "expected_output": "A bullet list of five findings with sources.",
+            "agent": {"role": "Senior Researcher", "goal": "Find accurate sources", "allow_delegation": False},
+            "tools": [{"name": f"tool_{i}", "description": "Searches the web " * 5, "args_schema": {"q": "str"}} for i in range(8)],
+            "context": [{"id": uuid.UUID(int=i), "output": "finding " * 30, "finished_at": _now()} for i in range(5)],
+            "tags": {"research", "rag"},
+        },
+    }
+    return {"karo agent input": karo_input, "karo agent output": karo_output, "crewai task kwargs": crewai_task}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no'}")
+    rows = []
+    for name, payload in _payloads().items():
+        rows.append((f"safe_serialize: {name}", lambda p=payload: _legacy_safe_serialize(p), lambda p=payload: serialization.safe_serialize(p)))
+
+    nested = json.loads(serialization.safe_serialize(_payloads()["crewai task kwargs"]))
+    nested["session"] = uuid.UUID(int=7)
+    rows.append(("filter_unjsonable: crewai task", lambda: _legacy_filter_unjsonable(nested), lambda: serialization.filter_unjsonable(nested)))
+
+    for label, legacy, engine in rows:
+        legacy_us = min(timeit.repeat(legacy, number=args.number, repeat=3)) / args.number * 1e6
+        engine_us = min(timeit.repeat(engine, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{label:<40} before {legacy_us:8.1f} us  after {engine_us:8.1f} us  speedup {legacy_us / engine_us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
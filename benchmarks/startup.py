@@ -0,0 +1,68 @@
+"""
+Measure the SDK's startup cost: `import aliyah_sdk` and `aliyah_sdk.init()`.
+
+Each sample runs in a fresh interpreter so module caches do not hide import
+work. Exits non-zero when the median exceeds the budget, so it can gate CI.
+
+    python benchmarks/startup.py --runs 10 --import-budget 400 --init-budget 50
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_SAMPLE = r"""
+import json, time
+start = time.perf_counter()
+import aliyah_sdk
+imported = time.perf_counter()
+aliyah_sdk.init(
+    api_key="aliyah_benchmark",
+    endpoint="http://127.0.0.1:9",
+    exporter_endpoint="http://127.0.0.1:9/v1/traces",
+    auto_start_session=False,
+    instrument_llm_calls={instrument},
+    resource_cache_ttl={cache_ttl},
+)
+initialized = time.perf_counter()
+print("STARTUP " + json.dumps({{"import": imported - start, "init": initialized - imported}}), flush=True)
+"""
+
+
+def _sample(instrument: bool, cache_ttl: int) -> dict:
+    code = _SAMPLE.format(instrument=instrument, cache_ttl=cache_ttl)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    # init() and exit handlers may log to stdout; pick out the measurement line
+    line = next(line for line in result.stdout.splitlines() if line.startswith("STARTUP "))
+    return json.loads(line[len("STARTUP "):])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--import-budget", type=float, default=400.0, help="Median import time budget in ms")
+    parser.add_argument("--init-budget", type=float, default=50.0, help="Median init() time budget in ms")
+    parser.add_argument("--instrument", action="store_true", help="Also activate LLM instrumentation")
+    parser.add_argument("--no-cache", action="store_true", help="Detect host attributes on every run")
+    args = parser.parse_args()
+
+    cache_ttl = 0 if args.no_cache else 86400
+    # Warm the host info cache and the filesystem cache
+    _sample(args.instrument, cache_ttl)
+    samples = [_sample(args.instrument, cache_ttl) for _ in range(args.runs)]
+
+    failed = False
+    for name, budget in (("import", args.import_budget), ("init", args.init_budget)):
+        times = sorted(sample[name] * 1000 for sample in samples)
+        median = statistics.median(times)
+        status = "ok" if median <= budget else "OVER BUDGET"
+        failed = failed or median > budget
+        print(f"{name:>6}: median {median:7.1f} ms  min {times[0]:7.1f} ms  max {times[-1]:7.1f} ms  "
+              f"budget {budget:.0f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
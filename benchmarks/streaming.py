@@ -0,0 +1,78 @@
+"""
+Measure the per-chunk cost of instrumenting a streamed LLM response.
+
+A response of `--tokens` chunks, one token each, is consumed through the
+stream wrappers' handling and recorded on a recording SDK span. The previous
+handling is reproduced as the baseline: the Anthropic text stream counted
+words with `split()` and set the token count on the span for every chunk, and
+the Gemini stream grew the completion text with `+=`.
+
+    python benchmarks/streaming.py --tokens 20000
+"""
+
+import argparse
+import timeit
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from aliyah_sdk.instrumentation.common.streaming import StreamAccumulator
+from aliyah_sdk.semconv import MessageAttributes, SpanAttributes
+
+
+def _chunks(tokens: int):
+    return [f" token{i}" for i in range(tokens)]
+
+
+# --- Baseline: the previous handling -----------------------------------------
+
+
+def _legacy_anthropic(span, chunks) -> None:
+    token_count = 0
+    for text in chunks:
+        token_count += len(text.split())
+        span.set_attribute(SpanAttributes.LLM_USAGE_STREAMING_TOKENS, token_count)
+    span.end()
+
+
+def _legacy_gemini(span, chunks) -> None:
+    full_text = ""
+    for text in chunks:
+        full_text += text
+    span.set_attribute(MessageAttributes.COMPLETION_CONTENT.format(i=0), full_text)
+    span.set_attribute(MessageAttributes.COMPLETION_ROLE.format(i=0), "assistant")
+    span.end()
+
+
+def _accumulated(span, chunks) -> None:
+    accumulator = StreamAccumulator(span)
+    for text in chunks:
+        accumulator.add(text)
+    accumulator.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=20000, help="Chunks in the streamed response")
+    parser.add_argument("--number", type=int, default=20, help="Streams per measurement")
+    args = parser.parse_args()
+
+    tracer = TracerProvider().get_tracer("benchmark")
+    chunks = _chunks(args.tokens)
+
+    def per_chunk_us(consume) -> float:
+        def one_stream():
+            consume(tracer.start_span("stream"), chunks)
+
+        return min(timeit.repeat(one_stream, number=args.number, repeat=5)) / args.number / args.tokens * 1e6
+
+    after = per_chunk_us(_accumulated)
+    for label, legacy in (("anthropic text stream", _legacy_anthropic), ("gemini stream", _legacy_gemini)):
+        before = per_chunk_us(legacy)
+        print(
+            f"{label:<22} {args.tokens} chunks  before {before:6.3f} us/chunk  after {after:6.3f} us/chunk  "
+            f"speedup {before / after:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()